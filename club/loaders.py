@@ -0,0 +1,95 @@
+from django.db.models import Max, Count
+from .models import Club
+from image_url.imaging import rendered_variant_name
+from image_url.serializers import VARIANT_CARD
+from users.models import CustomUser
+from team.models import Team
+from coach.models import Coach
+from core.conditional import make_validator
+from .serializers import (
+                    ClubDetailSerializer,
+                    CoachSerializer,
+                    TeamSerializer,
+                    UserWithTeamInfoSerializer
+)
+
+
+# 클럽 상세정보 로더
+# 클럽 / 코치 / 팀 / 유저를 각각 한 번의 쿼리로 불러오고, 중첩 serializer 가 읽는 연관 객체(팀, 이미지)는
+# select_related 로 JOIN 해서 가져온다. 클럽 인원수와 상관없이 항상 4번의 쿼리로 응답 데이터를 만든다.
+def load_club_detail(pk):
+    """
+    클럽 상세정보 응답 데이터를 만들어서 반환 (클럽이 없으면 Club.DoesNotExist 발생)
+    """
+    club = ClubDetailSerializer.setup_eager_loading(Club.objects).get(pk=pk)
+
+    # 코치 -> 유저 -> 팀 / 이미지 까지 한 번에 JOIN (serializer 선언에서 계산, core.serializers.EagerLoadingMixin 참고)
+    coaches = CoachSerializer.setup_eager_loading(Coach.objects.filter(club=club))
+
+    teams = TeamSerializer.setup_eager_loading(Team.objects.filter(club=club))
+
+    # 코치로 등록된 유저는 서브쿼리로 제외 (코치 목록을 다시 조회하지 않음)
+    coaches_users_ids = Coach.objects.filter(club=club).values('user')
+    users = UserWithTeamInfoSerializer.setup_eager_loading(
+        CustomUser.objects.filter(club=club).exclude(id__in=coaches_users_ids))
+
+    return {
+        'club': ClubDetailSerializer(club).data,
+        'coaches': CoachSerializer(coaches, many=True).data,
+        'teams': TeamSerializer(teams, many=True).data,
+        'users': UserWithTeamInfoSerializer(users, many=True).data
+    }
+
+
+
+def club_detail_validator(pk):
+    """
+    클럽 상세 응답의 ETag validator (클럽이 없으면 None)
+    클럽 + 코치 + 팀 + 유저 (와 각각의 이미지, 팀) 의 최대 updated_at 과 행 수를 집계 쿼리로만 계산
+    """
+    club = Club.objects.filter(pk=pk).values('updated_at', 'image_url__updated_at').first()
+    if club is None:
+        return None
+
+    coaches = Coach.objects.filter(club=pk).aggregate(
+        Max('updated_at'), Max('user__updated_at'), Max('user__team__updated_at'),
+        Max('user__image_url__updated_at'), Count('id'))
+    teams = Team.objects.filter(club=pk).aggregate(
+        Max('updated_at'), Max('image_url__updated_at'), Count('id'))
+    users = CustomUser.objects.filter(club=pk).aggregate(
+        Max('updated_at'), Max('team__updated_at'), Max('image_url__updated_at'), Count('id'))
+
+    return make_validator([*club.values(), *coaches.values(), *teams.values(), *users.values()])
+
+
+# 클럽 목록 읽기 전용 로더
+# 모델 객체를 만들지 않고 .values() 로 image_url 을 JOIN 해서 필요한 컬럼만 가져온 뒤
+# ClubListSerializer 와 같은 모양의 dict 로 변환한다.
+CLUB_LIST_COLUMNS = ('id', 'name', 'address', 'image_url_id', 'image_url__image_url', 'image_url__rendered_variants')
+
+
+def club_list_queryset():
+    """
+    클럽 목록(삭제되지 않은 클럽) values 쿼리셋
+    """
+    return Club.objects.values(*CLUB_LIST_COLUMNS)
+
+
+def club_list_rows(rows):
+    """
+    values 행 목록을 ClubListSerializer 출력 형태로 변환
+    """
+    return [
+        {
+            'id': row['id'],
+            'name': row['name'],
+            'address': row['address'],
+            'image_url': {'image_url': club_list_image(row)} if row['image_url_id'] is not None else None,
+        }
+        for row in rows
+    ]
+
+
+def club_list_image(row):
+    # ClubListSerializer 와 같은 크기의 파생본 URL (ImageUrl.variant_url 과 같은 규칙)
+    return rendered_variant_name(row['image_url__image_url'], row['image_url__rendered_variants'], VARIANT_CARD, 'webp')
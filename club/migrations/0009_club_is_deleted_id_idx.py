@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-18 18:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('club', '0008_alter_club_id'),
+        ('image_url', '0013_alter_imageurl_id'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='club',
+            index=models.Index(fields=['is_deleted', 'id'], name='club_is_deleted_id_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-18 19:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('club', '0009_club_is_deleted_id_idx'),
+        ('image_url', '0017_imageurl_image_url_updated_at_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='club',
+            index=models.Index(fields=['updated_at', 'id'], name='club_updated_at_id_idx'),
+        ),
+    ]
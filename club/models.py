@@ -15,3 +15,9 @@ class Club(TimeStampedModel, SoftDeleteModel):
 
     class Meta:
         db_table = 'club'
+        indexes = [
+            # 클럽 목록 커서 페이지네이션용 (is_deleted, id) 복합 인덱스
+            models.Index(fields=['is_deleted', 'id'], name='club_is_deleted_id_idx'),
+            # 변경분 동기화 키셋 스캔용 (core.sync)
+            models.Index(fields=['updated_at', 'id'], name='club_updated_at_id_idx'),
+        ]
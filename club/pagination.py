@@ -0,0 +1,12 @@
+from rest_framework.pagination import CursorPagination
+
+
+# 클럽 목록 커서 페이지네이션
+# 삭제되지 않은 클럽(is_deleted=False)을 id 순서로 잘라서 내려준다.
+# WHERE is_deleted = false AND id > {커서} ORDER BY id 형태의 쿼리가 되어서
+# (is_deleted, id) 복합 인덱스만 타고 페이지를 찾기 때문에 클럽 수가 늘어나도 응답 속도가 일정하다.
+class ClubCursorPagination(CursorPagination):
+    page_size = 50
+    page_size_query_param = 'page_size' # ?pageSize=100 (CamelCaseMiddleWare 가 page_size 로 변환)
+    max_page_size = 200
+    ordering = ('id',) # is_deleted 는 필터(동등 조건)로 고정되므로 커서 키는 id 만 사용
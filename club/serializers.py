@@ -3,14 +3,15 @@ from .models import Club
 from users.models import CustomUser
 from coach.models import Coach
 from team.models import Team
-from image_url.serializers import ImageUrlSerializer
+from image_url.serializers import ImageUrlSerializer, VARIANT_AVATAR, VARIANT_CARD, VARIANT_DETAIL
+from core.serializers import EagerLoadingMixin
 
 
 
 
 # 전체 클럽 목록 조회 serializer
-class ClubListSerializer(serializers.ModelSerializer):
-    image_url = ImageUrlSerializer(read_only=True)  # ImageUrl 모델에 대한 시리얼라이저를 사용
+class ClubListSerializer(EagerLoadingMixin, serializers.ModelSerializer):
+    image_url = ImageUrlSerializer(read_only=True, variant=VARIANT_CARD)  # ImageUrl 모델에 대한 시리얼라이저를 사용
 
     class Meta:
         model = Club
@@ -23,8 +24,8 @@ class ClubListSerializer(serializers.ModelSerializer):
 
 # 클럽 상세정보를 불러오기 위한 Nested Serializer (Nested Serializer : 중첩된 관계를 가진 모델 간의 상호 작용을 지원하는 기능)
 
-class ClubDetailSerializer(serializers.ModelSerializer):
-    image_url = ImageUrlSerializer(read_only=True)
+class ClubDetailSerializer(EagerLoadingMixin, serializers.ModelSerializer):
+    image_url = ImageUrlSerializer(read_only=True, variant=VARIANT_DETAIL)
  
     class Meta:
         model = Club
@@ -32,8 +33,8 @@ class ClubDetailSerializer(serializers.ModelSerializer):
     
         
 
-class UserWithTeamInfoSerializer(serializers.ModelSerializer):
-    image_url = ImageUrlSerializer(read_only=True)
+class UserWithTeamInfoSerializer(EagerLoadingMixin, serializers.ModelSerializer):
+    image_url = ImageUrlSerializer(read_only=True, variant=VARIANT_AVATAR)
     team = serializers.SerializerMethodField()  # 사용자의 팀 정보를 커스텀하게 가져오기 위해 사용
 
     class Meta:
@@ -52,7 +53,7 @@ class UserWithTeamInfoSerializer(serializers.ModelSerializer):
         return None
 
 
-class CoachSerializer(serializers.ModelSerializer):
+class CoachSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     club = serializers.PrimaryKeyRelatedField(read_only=True)  # 소속된 클럽의 ID
     user = UserWithTeamInfoSerializer(read_only=True)  # 코치가 되는 유저 정보
 
@@ -62,8 +63,8 @@ class CoachSerializer(serializers.ModelSerializer):
 
 
 
-class TeamSerializer(serializers.ModelSerializer):
-    image_url = ImageUrlSerializer(read_only=True)
+class TeamSerializer(EagerLoadingMixin, serializers.ModelSerializer):
+    image_url = ImageUrlSerializer(read_only=True, variant=VARIANT_CARD)
     
     class Meta:
         model = Team
@@ -1,3 +1,116 @@
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+from .models import Club
+from .loaders import load_club_detail
+from users.models import CustomUser
+from team.models import Team
+from coach.models import Coach
+from image_url.models import ImageUrl
 
-# Create your tests here.
+
+def make_club(members=10, teams=2, coaches=1):
+    """
+    테스트용 클럽 생성 (팀 / 코치 / 멤버 포함, 모든 행에 이미지 연결)
+    """
+    club = Club.objects.create(name='테스트클럽', address='서울',
+                               image_url=ImageUrl.objects.create(image_url='https://example.com/club.png'))
+    team_list = [
+        Team.objects.create(name=f'팀{i}', club=club,
+                            image_url=ImageUrl.objects.create(image_url=f'https://example.com/team{i}.png'))
+        for i in range(teams)
+    ]
+    users = []
+    for i in range(members + coaches):
+        users.append(CustomUser.objects.create(
+            phone=f'010{club.id:04d}{i:04d}', username=f'유저{i}', gender='male', birth=1990,
+            club=club, team=team_list[i % teams] if team_list else None,
+            image_url=ImageUrl.objects.create(image_url=f'https://example.com/user{i}.png'),
+        ))
+    for user in users[:coaches]:
+        Coach.objects.create(club=club, user=user)
+    return club
+
+
+class ClubDetailViewTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_response_payload(self):
+        club = make_club(members=3, teams=2, coaches=1)
+        response = self.client.get(reverse('club-detail', args=[club.pk]))
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['club']['name'], '테스트클럽')
+        self.assertEqual(data['club']['imageUrl'], {'imageUrl': 'https://example.com/club.png'})
+        self.assertEqual(len(data['coaches']), 1)
+        self.assertEqual(data['coaches'][0]['club'], club.pk)
+        self.assertEqual(data['coaches'][0]['user']['team']['name'], '팀0')
+        self.assertEqual(len(data['teams']), 2)
+        # 코치로 등록된 유저는 users 목록에서 제외
+        self.assertEqual(len(data['users']), 3)
+        self.assertNotIn(data['coaches'][0]['user']['id'], [user['id'] for user in data['users']])
+
+    def test_query_budget_is_constant(self):
+        # 클럽 크기와 상관없이 클럽 / 코치 / 팀 / 유저 4번의 쿼리만 실행되어야 한다.
+        for members in (5, 60):
+            club = make_club(members=members, teams=4, coaches=3)
+            with self.assertNumQueries(4):
+                data = load_club_detail(club.pk)
+            self.assertEqual(len(data['users']), members)
+
+    def test_endpoint_query_budget_is_constant(self):
+        # 캐시가 비어있을 때: ETag validator 집계 4번 + 상세정보 4번
+        for members in (5, 60):
+            club = make_club(members=members, teams=4, coaches=3)
+            with self.assertNumQueries(8):
+                response = self.client.get(reverse('club-detail', args=[club.pk]))
+            self.assertEqual(len(response.json()['users']), members)
+
+    def test_missing_club(self):
+        response = self.client.get(reverse('club-detail', args=[999]))
+        self.assertEqual(response.status_code, 404)
+
+
+class ClubListViewTest(TestCase):
+
+    def setUp(self):
+        def image(i):
+            rendered = [[256, 'webp']] if i % 4 == 1 else []
+            return ImageUrl.objects.create(image_url=f'https://example.com/{i}.png',
+                                           has_variants=bool(rendered), rendered_variants=rendered)
+
+        self.clubs = [
+            Club.objects.create(name=f'클럽{i}', address='서울', image_url=image(i) if i % 2 else None)
+            for i in range(7)
+        ]
+        Club.objects.filter(pk=self.clubs[3].pk).update(is_deleted=True)
+
+    def test_cursor_pages_cover_every_club_once(self):
+        url = reverse('club-list') + '?pageSize=2'
+        ids = []
+        while url:
+            with self.assertNumQueries(1):
+                response = self.client.get(url)
+            body = response.json()
+            self.assertLessEqual(len(body['data']), 2)
+            ids += [club['id'] for club in body['data']]
+            url = body['next']
+
+        expected = [club.pk for club in self.clubs if club.pk != self.clubs[3].pk]
+        self.assertEqual(ids, expected)
+
+    def test_invalid_cursor_is_404(self):
+        response = self.client.get(reverse('club-list') + '?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, 404)
+
+    def test_rows_match_serializer_output(self):
+        from djangorestframework_camel_case.util import camelize
+        from .serializers import ClubListSerializer
+
+        data = self.client.get(reverse('club-list')).json()['data']
+        expected = ClubListSerializer(Club.objects.filter(is_deleted=False).order_by('id'), many=True).data
+        self.assertEqual(data, camelize(expected))
+        self.assertEqual(data[1]['imageUrl'], {'imageUrl': 'https://example.com/1_256.webp'})
@@ -2,17 +2,12 @@ from django.shortcuts import render
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.exceptions import APIException
 from .models import Club
-from users.models import CustomUser
-from team.models import Team
-from coach.models import Coach
-from .serializers import (
-                    ClubListSerializer,
-                    ClubDetailSerializer,
-                    CoachSerializer,
-                    TeamSerializer,
-                    UserWithTeamInfoSerializer
-)
+from .loaders import load_club_detail, club_detail_validator, club_list_queryset, club_list_rows
+from .pagination import ClubCursorPagination
+from core.cache import cached_data
+from core.conditional import conditional_response
 
 
 # 클럽 목록 조회 API (회원가입 전용)
@@ -22,15 +17,20 @@ class ClubListView(APIView):
     """
     def get(self, request):
         try:
-            # is_deleted=False를 사용하여 삭제되지 않은 클럽만 조회
-            clubs = Club.objects.filter(is_deleted=False)
-            serializer = ClubListSerializer(clubs, many=True)
+            # 기본 매니저가 삭제되지 않은 클럽만 조회 (커서 페이지 단위로 잘라서 조회)
+            paginator = ClubCursorPagination()
+            rows = paginator.paginate_queryset(club_list_queryset(), request, view=self)
             # 성공 시 성공 메세지와 함께 데이터 반환
             return Response({
                 'code': '200',
                 "message": "클럽 목록 조회 성공",
-                "data": serializer.data
+                "data": club_list_rows(rows),
+                "next": paginator.get_next_link(),
+                "previous": paginator.get_previous_link()
             }, status=status.HTTP_200_OK)
+        except APIException:
+            # 잘못된 / 만료된 커서(NotFound) 등은 DRF 응답 그대로 (404)
+            raise
         except Exception:
             # 예외 발생 시 단순한 에러 메세지 반환
             return Response({
@@ -48,37 +48,24 @@ class ClubDetailView(APIView):
     클럽 상세 정보 조회하는 API
     """
     def get(self, request, pk):
-        try:
-            club = Club.objects.get(pk=pk)
-            club_serializer = ClubDetailSerializer(club)
+        # 클럽 / 소속 코치, 팀, 유저가 바뀌면 시그널로 캐시가 무효화된다 (core.signals 참고)
+        def build_validator(tag):
+            tag(f'club:{pk}', f'club-members:{pk}')
+            return club_detail_validator(pk)
 
-            # 클럽에 속한 코치 정보 가져오기
-            coaches = Coach.objects.filter(club=club)
-            coach_serializer = CoachSerializer(coaches, many=True)
-            
-            # 클럽에 속한 팀 정보 가져오기
-            teams = Team.objects.filter(club=club)
-            team_serializer = TeamSerializer(teams, many=True)
-            
-            
-            # 클럽에 속한 코치들의 유저 ID 목록 가져오기
-            # values_list => 특정 필드의 값을 리스트 형태로 가져올 때 사용
-            # flat=True => 하나의 필드를 불러올 때 True 값을 줘서 튜플형태가 아닌 단일 값으로 가져온다
-            coaches_users_ids = coaches.values_list('user', flat=True) 
-            
+        # 클라이언트가 가진 데이터가 최신이면 (If-None-Match) serializer 없이 304 응답
+        validator = cached_data(f'club:{pk}:validator', build_validator)
+        return conditional_response(request, validator, lambda: self.get_detail(pk))
+
+    def get_detail(self, pk):
+        try:
+            # 클럽 정보와 함께 코치, 팀, 유저 정보 포함하여 응답 (클럽 크기와 상관없이 고정된 쿼리 수)
+            def build(tag):
+                tag(f'club:{pk}', f'club-members:{pk}')
+                return load_club_detail(pk)
 
-            # 클럽에 속한 유저 정보 가져오기 (코치로 등록된 유저 제외)
-            users = CustomUser.objects.filter(club=club).exclude(id__in=coaches_users_ids) # exclude 함수는 조건에 해당하는 객체는 제외시켜준다.
-            user_serializer = UserWithTeamInfoSerializer(users, many=True)
+            response_data = cached_data(f'club:{pk}', build)
 
-            # 클럽 정보와 함께 코치, 팀, 유저 정보 포함하여 응답
-            response_data = {
-                'club': club_serializer.data,
-                'coaches': coach_serializer.data,
-                'teams': team_serializer.data,
-                'users': user_serializer.data
-            }
-            
             return Response(response_data)
         except Club.DoesNotExist:
             return Response({'error': '해당클럽이 존재하지 않습니다.'}, status=404)
\ No newline at end of file
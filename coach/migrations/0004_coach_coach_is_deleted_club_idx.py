@@ -0,0 +1,20 @@
+# Generated by Django 5.0.14 on 2026-10-18 19:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('club', '0009_club_is_deleted_id_idx'),
+        ('coach', '0003_alter_coach_id'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='coach',
+            index=models.Index(fields=['is_deleted', 'club'], name='coach_is_deleted_club_idx'),
+        ),
+    ]
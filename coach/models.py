@@ -12,4 +12,8 @@ class Coach(TimeStampedModel, SoftDeleteModel):
         return self.id
 
     class Meta:
-        db_table = 'coach'
\ No newline at end of file
+        db_table = 'coach'
+        indexes = [
+            # 삭제되지 않은 클럽 소속 코치 조회용 복합 인덱스
+            models.Index(fields=['is_deleted', 'club'], name='coach_is_deleted_club_idx'),
+        ]
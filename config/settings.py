@@ -2,6 +2,7 @@
 from pathlib import Path
 from datetime import timedelta
 import os
+import tempfile
 from dotenv import load_dotenv
 
 
@@ -21,6 +22,13 @@ AWS_ACCESS_KEY_ID = os.environ.get('AWS_ACCESS_KEY_ID')
 AWS_SECRET_ACCESS_KEY = os.environ.get('AWS_SECRET_ACCESS_KEY')
 AWS_STORAGE_BUCKET_NAME = os.environ.get('AWS_STORAGE_BUCKET_NAME')
 AWS_S3_CUSTOM_DOMAIN = f'{AWS_STORAGE_BUCKET_NAME}.s3.amazonaws.com'
+AWS_S3_REGION_NAME = os.environ.get('AWS_S3_REGION_NAME')
+AWS_S3_ENDPOINT_URL = os.environ.get('AWS_S3_ENDPOINT_URL') # S3 호환 서버 주소 (설정하면 path 방식 주소 사용)
+# 공용 S3 클라이언트 (image_url.utils.get_s3_client)
+AWS_S3_MAX_POOL_CONNECTIONS = int(os.environ.get('AWS_S3_MAX_POOL_CONNECTIONS', 20)) # 업로드 워커 수보다 크게
+AWS_S3_MULTIPART_THRESHOLD = 16 * 1024 * 1024 # 이 크기 이상이면 멀티파트 업로드
+AWS_S3_MULTIPART_CHUNKSIZE = 8 * 1024 * 1024
+AWS_S3_MAX_CONCURRENCY = 4 # 파일 하나당 동시에 올리는 파트 수
 DEFAULT_FILE_STORAGE = 'storages.backends.s3boto3.S3Boto3Storage'
 
 
@@ -65,15 +73,17 @@ SYSTEM_APPS = [
 INSTALLED_APPS = CUSTOM_APPS + SYSTEM_APPS
 
 MIDDLEWARE = [
+    'core.middleware.PerformanceMiddleware', # 요청별 SQL / serializer / 렌더러 시간 측정 (전체 시간에 다른 미들웨어도 포함되도록 가장 앞)
     'corsheaders.middleware.CorsMiddleware', # <- 가능한 높게 위치시켜야 한다.
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware', # 읽기 요청의 읽기 쿼리를 복제본으로 (세션 / 인증 조회 포함)
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'djangorestframework_camel_case.middleware.CamelCaseMiddleWare',
+    'core.camel_case.CamelCaseMiddleWare', # 쿼리스트링 키 snake_case 변환 (djangorestframework_camel_case 와 같은 결과, 키 변환 캐시)
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -107,6 +117,50 @@ DATABASES = {
     }
 }
 
+# 읽기 전용 복제본 (core.db_router)
+# DATABASE_REPLICA_1_NAME, DATABASE_REPLICA_2_NAME ... 을 설정하면 replica1, replica2 ... 별칭으로 추가된다.
+# 복제본마다 DATABASE_REPLICA_<n>_ENGINE / HOST / PORT / USER / PASSWORD 로 접속 정보를 지정한다 (없으면 default 와 같은 값).
+# 복제 지연은 primary 에 `python manage.py replica_heartbeat` 가 기록하는 heartbeat 로 확인하므로 같이 실행해야 한다.
+DATABASE_REPLICA_SETTINGS = ('ENGINE', 'NAME', 'HOST', 'PORT', 'USER', 'PASSWORD')
+DATABASE_REPLICAS = []
+_index = 1
+while os.environ.get(f'DATABASE_REPLICA_{_index}_NAME'):
+    DATABASES[f'replica{_index}'] = {
+        **DATABASES['default'],
+        **{_key: os.environ[f'DATABASE_REPLICA_{_index}_{_key}'] for _key in DATABASE_REPLICA_SETTINGS
+           if os.environ.get(f'DATABASE_REPLICA_{_index}_{_key}')},
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica{_index}')
+    _index += 1
+DATABASE_ROUTERS = ['core.db_router.PrimaryReplicaRouter']
+DATABASE_REPLICA_MAX_LAG = float(os.environ.get('DATABASE_REPLICA_MAX_LAG', 5)) # 이보다 밀린 복제본은 쓰지 않음(초)
+DATABASE_REPLICA_LAG_CHECK_INTERVAL = 1 # 복제 지연 확인 주기(초), 워커 프로세스마다 따로 확인
+
+
+# Cache
+# 로컬 / 테스트 환경에서는 장고 로컬 메모리 캐시를 사용하고,
+# 서버 환경에서는 REDIS_URL 환경변수를 설정해서 여러 워커가 같은 캐시를 공유하도록 한다.
+
+REDIS_URL = os.environ.get('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# 클럽 / 팀 / 유저 상세 응답 캐시 유지 시간(초) (데이터 변경 시에는 시그널로 바로 무효화됨)
+RESPONSE_CACHE_TIMEOUT = int(os.environ.get('RESPONSE_CACHE_TIMEOUT', 300))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -160,15 +214,15 @@ AUTH_USER_MODEL = 'users.CustomUser'
 # jwt
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.StatelessJWTAuthentication', # 토큰 클레임으로 인증 (요청마다 users 테이블 조회 안 함)
     ),
      'DEFAULT_PARSER_CLASSES': (
-        'djangorestframework_camel_case.parser.CamelCaseFormParser',
-        'djangorestframework_camel_case.parser.CamelCaseMultiPartParser',
-        'djangorestframework_camel_case.parser.CamelCaseJSONParser', # 카멜 케이스 변환 파서
+        'core.camel_case.CamelCaseFormParser',
+        'core.camel_case.CamelCaseMultiPartParser',
+        'core.camel_case.CamelCaseJSONParser', # 카멜 케이스 변환 파서 (orjson 으로 파싱, 키 변환 캐시)
     ),
     'DEFAULT_RENDERER_CLASSES': (
-        'djangorestframework_camel_case.render.CamelCaseJSONRenderer', # 최상위로 올려야 카멜케이스로 변경 가능
+        'core.camel_case.CamelCaseJSONRenderer', # 최상위로 올려야 카멜케이스로 변경 가능 (djangorestframework_camel_case 와 같은 출력, orjson 으로 렌더링)
         'djangorestframework_camel_case.render.CamelCaseBrowsableAPIRenderer', # 최상위로 올려야 카멜케이스 변경 가능
         'rest_framework.renderers.JSONRenderer',
         'rest_framework.renderers.BrowsableAPIRenderer',
@@ -181,12 +235,71 @@ SIMPLE_JWT = {
     'REFRESH_TOKEN_LIFETIME': timedelta(days=14),
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
-    'TOKEN_USER_CLASS': 'users.CustomUser',
+    'TOKEN_USER_CLASS': 'users.authentication.ClaimsUser',
     'ALGORITHM': 'HS256',
     "AUTH_HEADER_TYPES": ("Bearer",),
     "AUTH_HEADER_NAME": "HTTP_AUTHORIZATION",
 }
 
+# ClaimsUser.get_full_user() 로 불러온 유저 모델을 프로세스 메모리에 유지하는 시간(초) (0 이면 매번 DB 조회)
+JWT_USER_CACHE_TTL = int(os.environ.get('JWT_USER_CACHE_TTL', 30))
+JWT_USER_CACHE_SIZE = 1024
+
+# 리프레시 토큰 블랙리스트 메모리 인덱스 (users.blacklist)
+BLACKLIST_INDEX_SYNC_SECONDS = int(os.environ.get('BLACKLIST_INDEX_SYNC_SECONDS', 5)) # 다른 워커의 블랙리스트를 가져오는 주기(초)
+BLACKLIST_INDEX_CAPACITY = 100_000
+BLACKLIST_INDEX_SYNC_OVERLAP_SECONDS = int(os.environ.get('BLACKLIST_INDEX_SYNC_OVERLAP_SECONDS', 300)) # 늦게 커밋된 블랙리스트를 다시 확인하는 범위(초)
+
+# 이미지 업로드 파이프라인 (image_url.uploads)
+# 요청에서는 파일을 스풀 디렉토리에 저장만 하고, 저장소 업로드는 백그라운드 스레드 풀에서 처리
+IMAGE_STORAGE_BACKEND = os.environ.get('IMAGE_STORAGE_BACKEND', 'image_url.storage.S3Storage')
+IMAGE_LOCAL_STORAGE_DIR = BASE_DIR / 'media' / 'images' # LocalDirectoryStorage 사용 시 저장 위치
+IMAGE_LOCAL_STORAGE_URL = '/media/images/'
+IMAGE_UPLOAD_SPOOL_DIR = os.environ.get('IMAGE_UPLOAD_SPOOL_DIR', os.path.join(tempfile.gettempdir(), 'image-upload-spool'))
+IMAGE_UPLOAD_WORKERS = int(os.environ.get('IMAGE_UPLOAD_WORKERS', 4))
+IMAGE_UPLOAD_RETRIES = 3 # 실패 시 재시도 횟수
+IMAGE_UPLOAD_RETRY_DELAY = 0.5 # 재시도 대기 시간(초), 시도마다 2배
+IMAGE_UPLOAD_EAGER = False # True 이면 트랜잭션 커밋 시점에 요청 스레드에서 바로 업로드 (테스트용)
+# 업로드 요청 처리 (image_url.upload_handlers.StreamingImageUploadHandler)
+IMAGE_UPLOAD_MAX_SIZE = 25 * 1024 * 1024 # 파일 하나의 최대 크기 (bytes)
+IMAGE_UPLOAD_MEMORY_LIMIT = 1024 * 1024 # 요청 하나가 메모리에 들고 있는 파일 데이터 상한, 넘으면 스풀 디렉토리에 기록
+# 저장소 직접 업로드 (presigned PUT, S3Storage 전용)
+IMAGE_DIRECT_UPLOAD_EXPIRES = 600 # presigned URL 유효 시간(초)
+IMAGE_DIRECT_UPLOAD_MAX_SIZE = 20 * 1024 * 1024 # bytes
+# 이미지 파생본 (image_url.imaging) - 비워두면 파생본을 만들지 않음
+IMAGE_VARIANT_SIZES = (64, 256, 1024) # 긴 변 기준 px
+IMAGE_VARIANT_FORMATS = ('webp', 'jpeg')
+IMAGE_VARIANT_QUALITY = 80
+IMAGE_VARIANT_PROCESSES = int(os.environ.get('IMAGE_VARIANT_PROCESSES', 2)) # 렌더링 프로세스 수 (0 이면 업로드 스레드에서 렌더링)
+
+# 요청별 성능 측정 (core.performance)
+PERFORMANCE_INSTRUMENTATION = os.environ.get('PERFORMANCE_INSTRUMENTATION', 'True') == 'True'
+# 응답에 Server-Timing 헤더 추가 (DB 시간 / 쿼리 수가 클라이언트에 보이므로 기본값은 DEBUG 일 때만)
+PERFORMANCE_SERVER_TIMING = os.environ.get('PERFORMANCE_SERVER_TIMING', str(DEBUG)) == 'True'
+PERFORMANCE_SLOW_REQUEST_MS = int(os.environ.get('PERFORMANCE_SLOW_REQUEST_MS', 500)) # 넘으면 WARNING 로그에 느린 SQL 을 같이 남김
+PERFORMANCE_SLOW_QUERY_COUNT = 5 # 느린 요청 로그에 남기는 SQL 수
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        # INFO 로 두면 모든 요청의 측정 결과를, WARNING 이면 느린 요청만 남긴다
+        'core.performance': {
+            'handlers': ['console'],
+            'level': os.environ.get('PERFORMANCE_LOG_LEVEL', 'WARNING'),
+            'propagate': False,
+        },
+    },
+}
+
+# 변경분 동기화 API (core.sync)
+SYNC_PAGE_SIZE = 500 # 한 번에 내려주는 행 수 (모든 테이블 합계)
+SYNC_MAX_PAGE_SIZE = 2000
+SYNC_SAFETY_WINDOW = 2 # 지금 시각에서 이 시간(초) 이전에 수정된 행까지만 내려준다 (커밋 전 트랜잭션의 행 누락 방지)
+
 
 CORS_ORIGIN_ALLOW_ALL = True # <- 모든 호스트 허용
 CORS_ALLOW_CREDENTIALS = True
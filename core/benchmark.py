@@ -0,0 +1,117 @@
+import time
+from contextlib import contextmanager
+from django.db import connections
+from django.test.utils import CaptureQueriesContext, setup_databases, teardown_databases
+
+
+# 벤치마크 공통 도구 (manage.py bench_* 명령어에서 사용)
+
+
+@contextmanager
+def benchmark_database(verbosity=0):
+    """
+    벤치마크 전용 임시 테스트 DB 를 만들고, 끝나면 삭제 (개발 DB 에 데이터를 남기지 않음)
+    """
+    old_config = setup_databases(verbosity, interactive=False)
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity)
+
+
+def percentile(values, pct):
+    """
+    정렬된 값 목록의 백분위 값
+    """
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+class capture_queries:
+    """
+    여러 DB 별칭의 쿼리를 함께 기록하는 CaptureQueriesContext (기본값은 모든 별칭)
+    복제본 라우팅(core.db_router)이 켜져 있으면 GET 요청의 읽기는 replicaN 으로 가므로 default 만 세면 쿼리 수가 적게 나온다
+    """
+
+    def __init__(self, using=None):
+        aliases = [using] if isinstance(using, str) else list(using or connections)
+        self.contexts = {alias: CaptureQueriesContext(connections[alias]) for alias in aliases}
+
+    def __enter__(self):
+        for context in self.contexts.values():
+            context.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        for context in reversed(self.contexts.values()):
+            context.__exit__(*exc_info)
+
+    def __len__(self):
+        return sum(len(context) for context in self.contexts.values())
+
+    @property
+    def counts(self):
+        return {alias: len(context) for alias, context in self.contexts.items()}
+
+    @property
+    def captured_queries(self):
+        return [query for context in self.contexts.values() for query in context.captured_queries]
+
+
+def run_timed(fn, iterations, warmup=10, using=None):
+    """
+    fn() 을 iterations 번 실행해서 처리량 / 지연시간 / 쿼리 수를 측정
+    using: 쿼리를 셀 DB 별칭 (하나 또는 목록, 기본값은 복제본을 포함한 모든 별칭)
+    """
+    for _ in range(warmup):
+        fn()
+
+    timings = []
+    with capture_queries(using) as queries:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            t0 = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - t0)
+        elapsed = time.perf_counter() - started
+
+    timings.sort()
+    return {
+        'iterations': iterations,
+        'per_second': iterations / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(timings, 50) * 1000,
+        'p99_ms': percentile(timings, 99) * 1000,
+        'queries': len(queries) / iterations,
+    }
+
+
+def format_result(name, result):
+    """
+    측정 결과 한 줄 출력 형식
+    """
+    return (f"{name:<36} {result['per_second']:>10.1f}/s  "
+            f"p50 {result['p50_ms']:>8.3f}ms  p99 {result['p99_ms']:>8.3f}ms  "
+            f"queries {result['queries']:.2f}")
+
+
+def check_budgets(results, baselines, latency_tolerance=1.0, latency_slack_ms=5.0):
+    """
+    측정 결과를 기준값과 비교해서 예산을 넘은 항목의 메세지 목록을 반환 (기준값이 없는 항목은 건너뜀)
+    results / baselines: {이름: {'queries': 요청당 최대 쿼리 수, 'p99_ms': ...}}
+    - 쿼리 수는 기준값보다 하나라도 많으면 초과 (N+1 은 데이터가 커질수록 쿼리 수가 늘어나므로 바로 드러남)
+    - p99 는 기준값 * (1 + latency_tolerance) 와 기준값 + latency_slack_ms 중 큰 값을 넘으면 초과
+      (실행 환경에 따라 흔들리므로 여유를 둔다, 1ms 안팎의 빠른 응답은 비율만으로는 잡음에 걸림)
+    """
+    violations = []
+    for name, result in results.items():
+        baseline = baselines.get(name)
+        if baseline is None:
+            continue
+        if result['queries'] > baseline['queries']:
+            violations.append(f"{name}: 쿼리 {result['queries']}개 (예산 {baseline['queries']}개)")
+        limit = max(baseline['p99_ms'] * (1 + latency_tolerance), baseline['p99_ms'] + latency_slack_ms)
+        if result['p99_ms'] > limit:
+            violations.append(f"{name}: p99 {result['p99_ms']:.2f}ms (기준 {baseline['p99_ms']:.2f}ms, 허용 {limit:.2f}ms)")
+    return violations
@@ -0,0 +1,114 @@
+import time
+from django.conf import settings
+from django.core.cache import cache
+from .db_router import use_primary
+
+
+# 태그 버전 기반 응답 캐시
+#
+# 캐시 항목은 'response:{리소스 키}' (예: response:club:1) 에 저장되고, 항목을 만들 때 읽은 태그들의 버전을 함께 저장한다.
+# 태그 버전은 'tag:{태그}' 키에 들어있는 정수이며, 데이터가 바뀌면 invalidate() 로 버전을 올린다.
+# 항목을 읽을 때 저장된 버전과 현재 버전이 하나라도 다르면 캐시 미스로 처리하므로
+# 항목을 하나하나 찾아서 지울 필요 없이 태그 하나만 올리면 그 태그를 가진 모든 항목이 무효화된다.
+# (locmem / redis / memcached 등 장고 캐시 백엔드라면 어디서든 동작)
+
+RESPONSE_CACHE_TIMEOUT = getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300)
+
+
+def _tag_key(tag):
+    return f'tag:{tag}'
+
+
+def _entry_key(key):
+    return f'response:{key}'
+
+
+def _new_version():
+    # 태그 키가 캐시에서 밀려나도 예전 버전과 겹치지 않도록 시간 기반 값으로 시작
+    return time.time_ns()
+
+
+def get_tag_versions(tags):
+    """
+    태그들의 현재 버전을 {태그: 버전} 으로 반환 (없는 태그는 새 버전으로 생성)
+    """
+    keys = {_tag_key(tag): tag for tag in tags}
+    found = cache.get_many(list(keys))
+    for key in keys:
+        if key not in found:
+            cache.add(key, _new_version(), None)
+            found[key] = cache.get(key)
+    return {keys[key]: version for key, version in found.items()}
+
+
+def invalidate(*tags):
+    """
+    태그 버전을 올려서 해당 태그가 붙은 캐시 항목을 모두 무효화
+    """
+    for tag in set(tags):
+        try:
+            cache.incr(_tag_key(tag))
+        except ValueError:
+            # 아직 버전이 없는 태그 (이 태그로 저장된 항목도 없음)
+            cache.set(_tag_key(tag), _new_version(), None)
+
+
+def get_cached_data(key):
+    """
+    저장된 태그 버전이 모두 최신일 때만 캐시된 데이터를 반환 (아니면 None)
+    """
+    entry = cache.get(_entry_key(key))
+    if entry is None:
+        return None
+
+    versions = entry['tags']
+    current = cache.get_many([_tag_key(tag) for tag in versions])
+    for tag, version in versions.items():
+        if current.get(_tag_key(tag)) != version:
+            return None
+    return entry['data']
+
+
+def versioned_data(key, tags, build, timeout=None):
+    """
+    태그 버전을 키에 넣어서 저장하는 캐시 (의존하는 태그를 데이터를 읽기 전에 알 때 사용)
+
+    'response:{key}:{버전}.{버전}...' 에 저장하므로 태그가 무효화되면 키가 바뀌어서 바로 미스가 되고, 항목 안에 버전을 따로 저장하지 않는다.
+    태그 버전을 build() 전에 읽으므로 build 도중 무효화가 일어나면 예전 버전의 키에 저장되어 다시 쓰이지 않는다.
+    """
+    tags = [tag for tag in tags if tag is not None]
+    versions = get_tag_versions(tags)
+    entry_key = _entry_key(f'{key}:' + '.'.join(str(versions[tag]) for tag in tags))
+    data = cache.get(entry_key)
+    if data is not None:
+        return data
+
+    with use_primary():
+        data = build()
+    if data is not None:
+        cache.set(entry_key, data, RESPONSE_CACHE_TIMEOUT if timeout is None else timeout)
+    return data
+
+
+def cached_data(key, build, timeout=None):
+    """
+    캐시된 데이터가 있으면 반환하고, 없으면 build(tag) 로 만들어서 저장 후 반환
+
+    build 는 데이터를 읽기 전에 tag('club:1', ...) 를 호출해서 의존하는 태그를 등록한다.
+    태그 버전은 tag() 호출 시점에 읽으므로, 데이터를 만드는 도중 무효화가 일어나면 저장된 항목은 다음 조회 때 미스가 된다.
+    build 는 항상 primary DB 에서 읽는다 (복제본에서 읽으면 무효화 직후의 새 태그 버전으로 지연된 데이터가 저장될 수 있음).
+    """
+    data = get_cached_data(key)
+    if data is not None:
+        return data
+
+    versions = {}
+
+    def tag(*tags):
+        versions.update(get_tag_versions([t for t in tags if t is not None]))
+
+    with use_primary():
+        data = build(tag)
+    cache.set(_entry_key(key), {'tags': versions, 'data': data},
+              RESPONSE_CACHE_TIMEOUT if timeout is None else timeout)
+    return data
@@ -0,0 +1,208 @@
+import json
+import math
+import re
+from functools import lru_cache
+import orjson
+from django.conf import settings
+from django.core.files import File
+from django.http import QueryDict
+from django.utils.datastructures import MultiValueDict
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+from djangorestframework_camel_case import util
+from djangorestframework_camel_case.settings import api_settings as camel_settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+
+# djangorestframework_camel_case 와 같은 결과를 내는 빠른 camelCase 변환 / JSON 렌더러 / 파서
+#
+# 라이브러리는 요청 / 응답의 키마다 정규식 치환을 다시 실행한다. 응답 키는 serializer 필드 이름이라 종류가 몇십 개뿐이므로
+# 키 변환 결과를 lru_cache 에 저장해 두고 재사용하고, 렌더링은 orjson 으로 한다.
+# 출력은 라이브러리 + DRF JSONRenderer 조합과 바이트 단위로 같아야 하므로
+#   - orjson 과 표준 json 의 출력이 다른 float (지수 표기 / NaN / Infinity) 가 있으면 표준 json 으로 렌더링하고
+#   - orjson 이 처리하지 못하는 값(64비트를 넘는 정수, 문자열이 아닌 키 등)도 표준 json 으로 렌더링한다
+#   - JSON_CAMEL_CASE 의 ignore_fields / ignore_keys 를 쓰거나 DRF JSON 설정이 기본값이 아니면 라이브러리 구현을 그대로 쓴다
+
+KEY_CACHE_SIZE = 4096
+
+# orjson 은 64비트를 넘는 정수를 float 으로 읽으므로, 19자리 이상 숫자가 있는 요청은 표준 json 으로 파싱
+_LONG_NUMBER_RE = re.compile(rb'\d{19}')
+
+_ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+
+def _options():
+    return camel_settings.JSON_UNDERSCOREIZE
+
+
+def _uses_ignore_options():
+    options = _options()
+    return bool(options.get('ignore_fields') or options.get('ignore_keys'))
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def camelize_key(key):
+    return util.camelize_re.sub(util.underscore_to_camel, key)
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def underscoreize_key(key):
+    return util.camel_to_underscore(key, **_options())
+
+
+def _is_unsafe_float(value):
+    # orjson 과 표준 json 의 출력이 다른 float
+    return not math.isfinite(value) or 'e' in repr(value)
+
+
+def _camelize(data, state):
+    if isinstance(data, Promise):
+        data = force_str(data)
+    if isinstance(data, dict):
+        result = {}
+        for key, value in data.items():
+            if isinstance(key, Promise):
+                key = force_str(key)
+            if isinstance(key, str) and '_' in key:
+                key = camelize_key(key)
+            result[key] = _camelize(value, state)
+        return result
+    if isinstance(data, (str, int)) or data is None:
+        return data
+    if isinstance(data, float):
+        if _is_unsafe_float(data):
+            state['unsafe'] = True
+        return data
+    if isinstance(data, (list, tuple)) or util.is_iterable(data):
+        return [_camelize(item, state) for item in data]
+    return data
+
+
+def camelize(data):
+    """
+    djangorestframework_camel_case.util.camelize 와 같은 결과 (dict 는 일반 dict 로 반환)
+    """
+    if _uses_ignore_options():
+        return util.camelize(data, **_options())
+    return _camelize(data, {})
+
+
+def _underscoreize(data):
+    if isinstance(data, dict):
+        if type(data) == MultiValueDict:
+            new_data = MultiValueDict()
+            for key, value in data.items():
+                new_data.setlist(underscoreize_key(key), data.getlist(key))
+            return new_data
+        new_dict = {}
+        for key, value in (data.lists() if isinstance(data, QueryDict) else data.items()):
+            new_key = underscoreize_key(key) if isinstance(key, str) else key
+            new_dict[new_key] = _underscoreize(value)
+        if isinstance(data, QueryDict):
+            new_query = QueryDict(mutable=True)
+            for key, value in new_dict.items():
+                new_query.setlist(key, value)
+            return new_query
+        return new_dict
+    if isinstance(data, (str, File)):
+        return data
+    if util.is_iterable(data):
+        return [_underscoreize(item) for item in data]
+    return data
+
+
+def underscoreize(data):
+    """
+    djangorestframework_camel_case.util.underscoreize 와 같은 결과
+    """
+    if _uses_ignore_options():
+        return util.underscoreize(data, **_options())
+    return _underscoreize(data)
+
+
+class CamelCaseJSONRenderer(JSONRenderer):
+    """
+    djangorestframework_camel_case.render.CamelCaseJSONRenderer 와 같은 바이트를 출력하는 렌더러
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if _uses_ignore_options():
+            return super().render(util.camelize(data, **_options()), accepted_media_type, renderer_context)
+
+        state = {}
+        data = _camelize(data, state)
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if state or indent is not None or not self._default_json_settings():
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            rendered = orjson.dumps(data, default=self._default, option=_ORJSON_OPTIONS)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # JSONRenderer 와 같이 U+2028 / U+2029 는 이스케이프
+        return rendered.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+    def _default_json_settings(self):
+        # UNICODE_JSON / COMPACT_JSON / STRICT_JSON 이 기본값이고 인코더를 바꾸지 않았을 때만 orjson 과 출력이 같다
+        return not self.ensure_ascii and self.compact and self.strict and self.encoder_class is encoders.JSONEncoder
+
+    def _default(self, obj):
+        # orjson 이 직접 처리하지 않는 값은 DRF JSONEncoder 로 변환 (결과가 orjson 과 표준 json 에서 다르게 나오면 포기)
+        value = self.encoder_class().default(obj)
+        if isinstance(value, float) and _is_unsafe_float(value):
+            raise TypeError('float representation differs from json.dumps')
+        return value
+
+
+class CamelCaseJSONParser(JSONParser):
+    """
+    djangorestframework_camel_case.parser.CamelCaseJSONParser 와 같은 결과를 내는 파서 (orjson 으로 파싱)
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        body = stream.read()
+        try:
+            if encoding.lower().replace('-', '') == 'utf8' and not _LONG_NUMBER_RE.search(body):
+                try:
+                    return underscoreize(orjson.loads(body))
+                except orjson.JSONDecodeError:
+                    # NaN / 1e400 / 짝이 없는 surrogate 등은 표준 json 으로 다시 파싱 (오류 메세지도 표준 json 과 같게)
+                    pass
+            return underscoreize(json.loads(body.decode(encoding)))
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+
+class CamelCaseFormParser(FormParser):
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return underscoreize(super().parse(stream, media_type, parser_context))
+
+
+class CamelCaseMultiPartParser(MultiPartParser):
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        result = super().parse(stream, media_type, parser_context)
+        result.data = underscoreize(result.data)
+        result.files = underscoreize(result.files)
+        return result
+
+
+class CamelCaseMiddleWare:
+    """
+    쿼리스트링 키를 snake_case 로 바꾸는 미들웨어 (djangorestframework_camel_case.middleware.CamelCaseMiddleWare 대체)
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.GET = underscoreize(request.GET)
+        return self.get_response(request)
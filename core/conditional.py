@@ -0,0 +1,36 @@
+import hashlib
+from django.utils.cache import get_conditional_response
+
+
+# 조건부 GET (ETag) 지원
+#
+# 응답을 구성하는 행들의 최대 updated_at 과 행 수를 모아서 validator 를 만든다.
+# 클라이언트가 If-None-Match 헤더로 같은 값을 보내면 serializer 를 실행하지 않고 바로 304 Not Modified 를 응답한다.
+# Last-Modified 는 보내지 않는다: 최대 updated_at 은 멤버가 빠지거나(이동 / 삭제) 1초 안에 두 번 수정되면 그대로라서
+# If-Modified-Since 만 보내는 클라이언트가 오래된 데이터로 304 를 받게 된다.
+
+
+def make_validator(stamps):
+    """
+    응답을 구성하는 값 목록(최대 updated_at, 행 수 등)으로 {'etag'} 를 생성
+    """
+    # 행이 삭제되면 최대 updated_at 은 그대로일 수 있으므로 행 수도 ETag 에 포함
+    digest = hashlib.md5(repr(list(stamps)).encode()).hexdigest()
+    return {'etag': f'"{digest}"'}
+
+
+def conditional_response(request, validator, get_response):
+    """
+    validator 가 요청 헤더와 일치하면 304 응답을, 아니면 get_response() 결과에 ETag 헤더를 붙여서 반환
+    """
+    if validator is None:
+        return get_response()
+
+    response = get_conditional_response(request, etag=validator['etag'], last_modified=None)
+    if response is None:
+        response = get_response()
+        if response.status_code != 200:
+            return response
+
+    response['ETag'] = validator['etag']
+    return response
@@ -0,0 +1,129 @@
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.utils import timezone
+
+
+# 읽기 전용 복제본 라우터
+#
+# ReplicaRoutingMiddleware 가 읽기 요청(GET / HEAD / OPTIONS)을 read_from_replicas() 로 감싸면
+# 그 요청에서 실행되는 읽기 쿼리는 settings.DATABASE_REPLICAS 중 하나로 보내고, 나머지는 모두 primary(default) 로 보낸다.
+#   - 요청 도중 쓰기가 한 번이라도 일어나면 그 요청의 이후 읽기는 primary 로 고정 (방금 쓴 데이터를 읽을 수 있도록)
+#   - default 에서 트랜잭션(atomic) 안이면 primary 에서 읽는다
+#   - 복제 지연이 DATABASE_REPLICA_MAX_LAG 초를 넘는 복제본은 쓰지 않고, 모두 밀려 있으면 primary 에서 읽는다
+#     (지연은 primary 에 replica_heartbeat 명령이 기록하는 heartbeat 행을 복제본에서 읽어서 계산)
+# 요청 밖(관리 명령, 업로드 워커 스레드 등)의 쿼리는 항상 primary 로 간다.
+
+
+class RoutingState:
+
+    def __init__(self, replicas_allowed):
+        self.replicas_allowed = replicas_allowed
+        self.pinned = False
+
+
+_routing_state = ContextVar('db_routing_state', default=None)
+
+
+@contextmanager
+def read_from_replicas():
+    """
+    블록 안의 읽기 쿼리를 복제본으로 보낸다 (쓰기가 일어나면 블록이 끝날 때까지 primary 로 고정)
+    """
+    token = _routing_state.set(RoutingState(replicas_allowed=True))
+    try:
+        yield
+    finally:
+        _routing_state.reset(token)
+
+
+@contextmanager
+def use_primary():
+    """
+    블록 안의 모든 쿼리를 primary 로 보낸다
+    """
+    token = _routing_state.set(RoutingState(replicas_allowed=False))
+    try:
+        yield
+    finally:
+        _routing_state.reset(token)
+
+
+def replica_lag(alias):
+    """
+    복제본의 지연 시간(초) - 복제본에 heartbeat 행이 없으면 None
+    """
+    from .models import ReplicationHeartbeat
+
+    beat_at = (ReplicationHeartbeat.objects.using(alias)
+               .filter(pk=ReplicationHeartbeat.SINGLETON_ID)
+               .values_list('beat_at', flat=True).first())
+    if beat_at is None:
+        return None
+    return max((timezone.now() - beat_at).total_seconds(), 0.0)
+
+
+class ReplicaHealth:
+    """
+    복제본별 지연 확인 결과를 DATABASE_REPLICA_LAG_CHECK_INTERVAL 초 동안 프로세스 메모리에 유지
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._checked = {}
+
+    def is_healthy(self, alias):
+        now = time.monotonic()
+        with self._lock:
+            checked = self._checked.get(alias)
+        if checked is not None and now - checked[0] < settings.DATABASE_REPLICA_LAG_CHECK_INTERVAL:
+            return checked[1]
+
+        try:
+            lag = replica_lag(alias)
+        except DatabaseError:
+            # 복제본에 연결할 수 없으면 primary 에서 읽는다
+            lag = None
+        healthy = lag is not None and lag <= settings.DATABASE_REPLICA_MAX_LAG
+        with self._lock:
+            self._checked[alias] = (now, healthy)
+        return healthy
+
+
+replica_health = ReplicaHealth()
+
+
+class PrimaryReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        state = _routing_state.get()
+        if state is None or not state.replicas_allowed or state.pinned:
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+
+        replicas = [alias for alias in settings.DATABASE_REPLICAS if replica_health.is_healthy(alias)]
+        if not replicas:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        state = _routing_state.get()
+        if state is not None:
+            state.pinned = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # 복제본은 primary 와 같은 데이터이므로 어느 쪽에서 읽은 객체끼리도 연결 가능
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
@@ -0,0 +1,177 @@
+import io
+import json
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+from club.models import Club
+from core.benchmark import benchmark_database, capture_queries, check_budgets, percentile
+from core.management.commands.seed_data import SEED_PASSWORD
+from team.models import Team
+from users.blacklist import blacklist_index
+from users.models import CustomUser
+
+
+DEFAULT_BASELINE = settings.BASE_DIR / 'benchmarks' / 'endpoints.json'
+
+
+class Endpoint:
+
+    def __init__(self, name, request, status=200, cold=False, hashes=False):
+        self.name = name
+        self.request = request  # 요청을 보내고 응답을 반환하는 함수
+        self.status = status
+        self.cold = cold  # True 이면 요청마다 응답 캐시를 비우고 측정 (DB 에서 다시 만드는 경로)
+        self.hashes = hashes  # 비밀번호 해시를 계산하는 엔드포인트 (반복 횟수를 줄임)
+
+
+class Command(BaseCommand):
+    help = ('API 엔드포인트 벤치마크 (임시 테스트 DB 에 seed_data 로 만든 데이터 크기별로 실행): '
+            'p50 / p99 지연시간, 요청당 쿼리 수, 응답 크기를 기준값(--baseline)과 비교해서 예산을 넘으면 실패')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='10,100', help='클럽당 멤버 수 (쉼표로 구분, 크기마다 따로 측정)')
+        parser.add_argument('--clubs', type=int, default=20)
+        parser.add_argument('--iterations', type=int, default=100)
+        parser.add_argument('--hash-iterations', type=int, default=5,
+                            help='회원가입 / 로그인 반복 횟수 (비밀번호 해시 때문에 느림)')
+        parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help='기준값 JSON 파일')
+        parser.add_argument('--latency-tolerance', type=float, default=1.0,
+                            help='p99 허용 비율 (1.0 이면 기준값의 2배까지 허용)')
+        parser.add_argument('--latency-slack', type=float, default=5.0,
+                            help='p99 최소 허용 여유 (ms, 기준값 + 이 값까지는 항상 허용)')
+        parser.add_argument('--update-baseline', action='store_true', help='비교하지 않고 이번 결과를 기준값으로 저장')
+
+    def handle(self, *args, **options):
+        self.options = options
+        results = {}
+        for size in [int(size) for size in options['sizes'].split(',')]:
+            self.stdout.write(f'클럽 {options["clubs"]}개 x 멤버 {size}명')
+            with benchmark_database():
+                cache.clear()
+                blacklist_index.reset()
+                call_command('seed_data', clubs=options['clubs'], members=size, teams=5, coaches=3,
+                             competitions=10, stdout=io.StringIO())
+                self.signups = 0
+                for endpoint in self.endpoints():
+                    result = self.measure(endpoint)
+                    results[f'{endpoint.name}@{size}'] = result
+                    self.stdout.write(f"  {endpoint.name:<22} p50 {result['p50_ms']:>8.2f}ms  p99 {result['p99_ms']:>8.2f}ms  "
+                                      f"queries {result['queries']:>3}  bytes {result['bytes']:>9,}")
+            cache.clear()
+
+        if options['update_baseline']:
+            self.save_baseline(results)
+            return
+        self.compare(results)
+
+    def endpoints(self):
+        club = Club.objects.order_by('id').first()
+        team = Team.objects.filter(club=club).order_by('id').first()
+        member = CustomUser.objects.filter(team=team, image_url__isnull=False).order_by('id').first()
+
+        client = Client()
+        response = client.post(reverse('login'), {'phone': member.phone, 'password': SEED_PASSWORD},
+                               content_type='application/json')
+        if response.status_code != 200:
+            raise CommandError(f'로그인 실패: {response.status_code} {response.content[:200]!r}')
+        access = response.json()['access']
+
+        def get(name, *args):
+            url = reverse(name, args=args)
+            return lambda: client.get(url)
+
+        def post(name, data=None):
+            url = reverse(name)
+            return lambda: client.post(url, data or {}, content_type='application/json')
+
+        endpoints = [
+            Endpoint('signup', self.signup, status=201, hashes=True),
+            Endpoint('signin', post('login', {'phone': member.phone, 'password': SEED_PASSWORD}), hashes=True),
+            # 로그인 응답의 refresh 쿠키를 client 가 가지고 있음
+            Endpoint('refresh', post('token_refresh')),
+            Endpoint('verify', post('token_verify', {'token': access})),
+            Endpoint('club-list', get('club-list')),
+            Endpoint('image-detail', get('image-detail', member.image_url_id)),
+            Endpoint('sync', get('sync')),
+        ]
+        for name, pk in (('club-detail', club.pk), ('team-detail', team.pk), ('user-detail', member.pk)):
+            endpoints.append(Endpoint(name, get(name, pk), cold=True))
+            endpoints.append(Endpoint(f'{name}:warm', get(name, pk)))
+        endpoints.append(Endpoint('logout', post('logout')))
+        return endpoints
+
+    def signup(self):
+        # 매번 새 전화번호로 가입 (seed_data 의 099 번호와 겹치지 않게 098 사용)
+        self.signups += 1
+        return Client().post(reverse('signup'), {
+            'phone': f'098{self.signups:08d}', 'password': 'benchmark-password',
+            'username': '벤치마크', 'birth': 1990, 'gender': 'male',
+        }, content_type='application/json')
+
+    def measure(self, endpoint):
+        """
+        {'p50_ms', 'p99_ms', 'queries' (요청당 최대), 'bytes' (마지막 응답 크기)}
+        """
+        iterations = self.options['hash_iterations'] if endpoint.hashes else self.options['iterations']
+        for _ in range(1 if endpoint.hashes else 5):
+            self.check_status(endpoint, endpoint.request())
+
+        timings, queries, size = [], 0, 0
+        for _ in range(iterations):
+            if endpoint.cold:
+                cache.clear()
+            # 복제본으로 라우팅된 읽기도 포함해서 센다
+            with capture_queries() as captured:
+                started = time.perf_counter()
+                response = endpoint.request()
+                timings.append(time.perf_counter() - started)
+            self.check_status(endpoint, response)
+            queries = max(queries, len(captured))
+            size = len(response.content)
+
+        timings.sort()
+        return {
+            'p50_ms': round(percentile(timings, 50) * 1000, 3),
+            'p99_ms': round(percentile(timings, 99) * 1000, 3),
+            'queries': queries,
+            'bytes': size,
+        }
+
+    def check_status(self, endpoint, response):
+        if response.status_code != endpoint.status:
+            raise CommandError(f'{endpoint.name}: 응답 코드 {response.status_code} (예상 {endpoint.status}) '
+                               f'{response.content[:200]!r}')
+
+    def save_baseline(self, results):
+        path = self.options['baseline']
+        try:
+            with open(path) as file:
+                baselines = json.load(file)
+        except FileNotFoundError:
+            baselines = {}
+        # 이번에 측정한 항목만 갱신 (다른 크기의 기준값은 유지)
+        baselines.update({name: {'queries': result['queries'], 'p99_ms': result['p99_ms']}
+                          for name, result in results.items()})
+        with open(path, 'w') as file:
+            json.dump(dict(sorted(baselines.items())), file, indent=2, ensure_ascii=False)
+            file.write('\n')
+        self.stdout.write(f'기준값 {len(results)}개 저장: {path}')
+
+    def compare(self, results):
+        try:
+            with open(self.options['baseline']) as file:
+                baselines = json.load(file)
+        except FileNotFoundError:
+            raise CommandError(f'기준값 파일이 없습니다: {self.options["baseline"]} (--update-baseline 으로 생성)')
+
+        missing = sorted(set(results) - set(baselines))
+        if missing:
+            self.stdout.write(f'기준값이 없는 항목 (비교 생략): {", ".join(missing)}')
+        violations = check_budgets(results, baselines, self.options['latency_tolerance'], self.options['latency_slack'])
+        if violations:
+            raise CommandError('예산 초과:\n' + '\n'.join(violations))
+        self.stdout.write(f'모든 항목이 예산 안 ({len(results) - len(missing)}개 비교)')
@@ -0,0 +1,56 @@
+import io
+from django.core.management.base import BaseCommand, CommandError
+from djangorestframework_camel_case.parser import CamelCaseJSONParser as LibraryJSONParser
+from djangorestframework_camel_case.render import CamelCaseJSONRenderer as LibraryJSONRenderer
+from club.loaders import load_club_detail
+from club.models import Club
+from coach.models import Coach
+from core.benchmark import benchmark_database, run_timed, format_result
+from core.camel_case import CamelCaseJSONParser, CamelCaseJSONRenderer
+from image_url.models import ImageUrl
+from team.models import Team
+from users.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = 'camelCase JSON 렌더러 / 파서 벤치마크 (임시 테스트 DB 의 클럽 상세 응답으로 측정): 라이브러리 구현과 비교'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--members', type=int, default=300, help='클럽 멤버 수')
+        parser.add_argument('--iterations', type=int, default=500)
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            data = load_club_detail(self.make_club(options['members']).pk)
+
+        old, new = LibraryJSONRenderer(), CamelCaseJSONRenderer()
+        rendered = old.render(data)
+        if new.render(data) != rendered:
+            raise CommandError('렌더링 결과가 라이브러리 구현과 다릅니다.')
+
+        self.stdout.write(f'클럽 상세 응답 렌더링 ({len(rendered):,} bytes)')
+        for name, renderer in (('djangorestframework_camel_case (기존)', old), ('core.camel_case', new)):
+            self.stdout.write(format_result(name, run_timed(lambda: renderer.render(data), options['iterations'])))
+
+        # 요청 파싱은 응답 JSON 을 그대로 다시 읽어서 비교
+        self.stdout.write('같은 JSON 파싱 (camelCase -> snake_case)')
+        for name, parser in (('djangorestframework_camel_case (기존)', LibraryJSONParser()),
+                             ('core.camel_case', CamelCaseJSONParser())):
+            self.stdout.write(format_result(name, run_timed(lambda: parser.parse(io.BytesIO(rendered)),
+                                                            options['iterations'])))
+
+    def make_club(self, members):
+        club = Club.objects.create(name='벤치마크클럽', address='서울',
+                                   image_url=ImageUrl.objects.create(image_url='https://example.com/club.png'))
+        teams = [Team.objects.create(name=f'팀{i}', club=club,
+                                     image_url=ImageUrl.objects.create(image_url=f'https://example.com/team{i}.png'))
+                 for i in range(10)]
+        images = ImageUrl.objects.bulk_create(
+            [ImageUrl(image_url=f'https://example.com/user{i}.png') for i in range(members)])
+        users = CustomUser.objects.bulk_create([
+            CustomUser(phone=f'010{i:08d}', username=f'유저{i}', gender='male', birth=1990,
+                       club=club, team=teams[i % len(teams)], image_url=images[i])
+            for i in range(members)
+        ])
+        Coach.objects.bulk_create([Coach(club=club, user=user) for user in users[:5]])
+        return club
@@ -0,0 +1,23 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, close_old_connections
+from django.utils import timezone
+from core.models import ReplicationHeartbeat
+
+
+class Command(BaseCommand):
+    help = '복제 지연 확인용 heartbeat 를 primary 에 주기적으로 기록 (core.db_router)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=1.0, help='기록 주기(초)')
+        parser.add_argument('--once', action='store_true', help='한 번만 기록하고 종료')
+
+    def handle(self, *args, **options):
+        while True:
+            ReplicationHeartbeat.objects.using(DEFAULT_DB_ALIAS).update_or_create(
+                pk=ReplicationHeartbeat.SINGLETON_ID, defaults={'beat_at': timezone.now()})
+            if options['once']:
+                break
+            time.sleep(options['interval'])
+            # 오래 실행되는 프로세스이므로 끊긴 연결은 다시 연결
+            close_old_connections()
@@ -0,0 +1,189 @@
+import random
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from club.models import Club
+from coach.models import Coach
+from competition.models import Competition
+from image_url.models import ImageUrl
+from matchtype.models import MatchType
+from team.models import Team
+from tier.models import Tier
+from users.models import CustomUser
+
+
+SURNAMES = '김이박최정강조윤장임한오서신권황안송류홍'
+GIVEN_NAMES = ['민준', '서연', '도윤', '지우', '하준', '서윤', '예준', '하은', '시우', '지민',
+               '주원', '수아', '지호', '지유', '준서', '채원', '건우', '윤서', '현우', '다은']
+REGIONS = ['서울', '부산', '대구', '인천', '광주', '대전', '울산', '수원', '성남', '고양', '용인', '창원', '청주', '전주']
+MATCH_TYPES = [('male', 'single'), ('male', 'double'), ('female', 'single'), ('female', 'double'), ('mixed', 'double')]
+TIER_NAMES = ['입문', '초급', '중급', '상급', '선수']
+COMPETITION_STATUSES = ['before', 'during', 'after']
+
+SEED_PASSWORD = 'seed-password'  # 생성한 유저 모두의 비밀번호 (bench_endpoints 로그인에서 사용)
+SEED_PHONE_PREFIX = '099'  # 실제 번호와 겹치지 않도록 생성한 유저의 전화번호는 099 로 시작
+SEED_IMAGE_HOST = 'https://seed.example.com'
+
+
+class Command(BaseCommand):
+    help = ('부하 / 규모 테스트용 데이터 생성 (클럽, 팀, 코치, 티어 / 매치타입이 있는 유저, 이미지, 대회) - '
+            '같은 --seed 면 같은 데이터, bulk_create 를 chunk 단위로 실행')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clubs', type=int, default=100)
+        parser.add_argument('--teams', type=int, default=5, help='클럽당 팀 수')
+        parser.add_argument('--members', type=int, default=100, help='클럽당 유저 수 (코치 포함)')
+        parser.add_argument('--coaches', type=int, default=2, help='클럽당 코치 수')
+        parser.add_argument('--competitions', type=int, default=50)
+        parser.add_argument('--image-ratio', type=float, default=0.8, help='프로필 이미지가 있는 유저 비율')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--chunk-size', type=int, default=2000, help='INSERT 한 번에 넣는 행 수')
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.random = random.Random(options['seed'])
+        self.chunk_size = options['chunk_size']
+        self.counts = {}
+        started = time.perf_counter()
+
+        # 비밀번호 해시는 한 번만 계산해서 모든 유저가 같이 사용 (PBKDF2 를 행마다 계산하면 수백만 행을 만들 수 없음)
+        self.password = make_password(SEED_PASSWORD)
+        self.tiers = self.seed_tiers()
+        clubs = self.seed_clubs()
+        teams = self.seed_teams(clubs)
+        self.seed_users(clubs, teams)
+        self.seed_competitions()
+
+        elapsed = time.perf_counter() - started
+        total = sum(self.counts.values())
+        for label, count in self.counts.items():
+            self.stdout.write(f'{label:<12} {count:>10,}')
+        self.stdout.write(f'총 {total:,}행 ({elapsed:.1f}초, {total / elapsed if elapsed else 0:,.0f} rows/s)')
+
+    def insert(self, objects):
+        """
+        객체 목록을 chunk 단위로 INSERT 하고 (삽입 순서대로) id 목록을 반환
+        """
+        ids = []
+        for start in range(0, len(objects), self.chunk_size):
+            chunk = objects[start:start + self.chunk_size]
+            model = type(chunk[0])
+            with transaction.atomic():
+                model._base_manager.bulk_create(chunk)
+                if chunk[0].pk is None:
+                    # INSERT 결과로 id 를 돌려받지 못하는 DB (MySQL) 는 방금 넣은 행의 id 를 다시 읽는다
+                    # (생성 중에 다른 곳에서 같은 테이블에 INSERT 하지 않는다고 가정)
+                    last = model._base_manager.order_by('-id').values_list('id', flat=True)[:len(chunk)]
+                    for obj, pk in zip(chunk, reversed(list(last))):
+                        obj.pk = pk
+            ids += [obj.pk for obj in chunk]
+            label = model._meta.db_table
+            self.counts[label] = self.counts.get(label, 0) + len(chunk)
+        return ids
+
+    def images(self, kind, count):
+        # 이미지 행 (저장소 객체 없이 URL 만 생성, 90% 는 현재 설정의 파생본이 있는 것으로)
+        rendered = [[size, format] for size in settings.IMAGE_VARIANT_SIZES for format in settings.IMAGE_VARIANT_FORMATS]
+        images = []
+        for _ in range(count):
+            variants = rendered if self.random.random() < 0.9 else []
+            images.append(ImageUrl(image_url=f'{SEED_IMAGE_HOST}/{kind}/{self.random.getrandbits(64):016x}.jpg',
+                                   extension='jpg', size=self.random.randint(20_000, 2_000_000),
+                                   has_variants=bool(variants), rendered_variants=variants))
+        return self.insert(images)
+
+    def seed_tiers(self):
+        """
+        매치타입 / 티어 (이미 있으면 그대로 사용) - {성별: [티어 id, ...]}
+        """
+        if not MatchType.objects.exists():
+            match_types = self.insert([MatchType(gender=gender, type=type) for gender, type in MATCH_TYPES])
+            self.insert([Tier(name=name, level=level, match_type_id=match_type)
+                         for match_type in match_types for level, name in enumerate(TIER_NAMES, start=1)])
+
+        tiers = {'male': [], 'female': []}
+        for pk, gender in Tier.objects.order_by('id').values_list('id', 'match_type__gender'):
+            for key in tiers:
+                if gender in (key, 'mixed'):
+                    tiers[key].append(pk)
+        return tiers
+
+    def seed_clubs(self):
+        count = self.options['clubs']
+        images = self.images('club', count)
+        return self.insert([
+            Club(name=f'{self.random.choice(REGIONS)} 테니스클럽 {i + 1}'[:30],
+                 address=f'{self.random.choice(REGIONS)}시 {self.random.randint(1, 300)}번길',
+                 phone=f'02-{self.random.randint(1000, 9999)}-{self.random.randint(1000, 9999)}',
+                 description='생성된 테스트 클럽', image_url_id=image)
+            for i, image in enumerate(images)
+        ])
+
+    def seed_teams(self, clubs):
+        """
+        {클럽 id: [팀 id, ...]}
+        """
+        per_club = self.options['teams']
+        images = iter(self.images('team', len(clubs) * per_club))
+        teams = [(club, Team(name=f'{i + 1}팀', description='생성된 테스트 팀', club_id=club, image_url_id=next(images)))
+                 for club in clubs for i in range(per_club)]
+        ids = self.insert([team for _, team in teams])
+
+        by_club = {club: [] for club in clubs}
+        for (club, _), pk in zip(teams, ids):
+            by_club[club].append(pk)
+        return by_club
+
+    def seed_users(self, clubs, teams):
+        # 유저는 수가 많으므로 chunk 크기만큼 모아서 (이미지 -> 유저 -> 코치 순서로) INSERT
+        sequence = CustomUser.all_objects.filter(phone__startswith=SEED_PHONE_PREFIX).count()
+        pending = []
+        for club in clubs:
+            for i in range(self.options['members']):
+                pending.append((club, i < self.options['coaches'], self.make_user(sequence, club, teams[club])))
+                sequence += 1
+                if len(pending) >= self.chunk_size:
+                    self.flush_users(pending)
+                    pending = []
+        if pending:
+            self.flush_users(pending)
+
+    def make_user(self, sequence, club, teams):
+        gender = self.random.choice(('male', 'female'))
+        return CustomUser(
+            phone=f'{SEED_PHONE_PREFIX}{sequence:08d}', password=self.password,
+            username=f'{self.random.choice(SURNAMES)}{self.random.choice(GIVEN_NAMES)}',
+            gender=gender, birth=self.random.randint(1950, 2010), club_id=club,
+            team_id=self.random.choice(teams) if teams and self.random.random() < 0.8 else None,
+            tier_id=self.random.choice(self.tiers[gender]) if self.tiers[gender] else None,
+        )
+
+    def flush_users(self, pending):
+        with_images = [user for _, _, user in pending if self.random.random() < self.options['image_ratio']]
+        for user, image in zip(with_images, self.images('user', len(with_images))):
+            user.image_url_id = image
+        self.insert([user for _, _, user in pending])
+        coaches = [Coach(club_id=club, user_id=user.pk) for club, is_coach, user in pending if is_coach]
+        if coaches:
+            self.insert(coaches)
+
+    def seed_competitions(self):
+        count = self.options['competitions']
+        images = self.images('competition', count)
+        now = timezone.now()
+        competitions = []
+        for i, image in enumerate(images):
+            start = now + timedelta(days=self.random.randint(-365, 180))
+            competitions.append(Competition(
+                name=f'{self.random.choice(REGIONS)} 오픈 {i + 1}'[:30],
+                status=self.random.choice(COMPETITION_STATUSES),
+                start_date=start, end_date=start + timedelta(days=self.random.randint(1, 3)),
+                round=self.random.choice((16, 32, 64)),
+                address=f'{self.random.choice(REGIONS)} 테니스장', location=self.random.choice(REGIONS),
+                fee=self.random.choice((30000, 40000, 50000)), image_url_id=image,
+            ))
+        self.insert(competitions)
@@ -0,0 +1,71 @@
+import logging
+from contextlib import ExitStack
+from django.conf import settings
+from django.db import connections
+from .db_router import read_from_replicas
+from .performance import RequestMetrics, current_metrics, logger, start_metrics, stop_metrics
+
+
+class ReplicaRoutingMiddleware:
+    """
+    읽기 요청(GET / HEAD / OPTIONS)의 읽기 쿼리를 복제본으로 보내는 미들웨어 (core.db_router 참고)
+    """
+
+    SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.method not in self.SAFE_METHODS:
+            return self.get_response(request)
+        with read_from_replicas():
+            return self.get_response(request)
+
+
+class PerformanceMiddleware:
+    """
+    요청별 SQL 수 / DB 시간 / serializer 시간 / 렌더러 시간 / 전체 시간을 Server-Timing 헤더와 로그로 남기는 미들웨어
+    (core.performance 참고, 전체 시간에 다른 미들웨어도 포함되도록 가장 앞에 둔다)
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.PERFORMANCE_INSTRUMENTATION:
+            return self.get_response(request)
+
+        metrics = RequestMetrics(slow_query_count=settings.PERFORMANCE_SLOW_QUERY_COUNT)
+        token = start_metrics(metrics)
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(metrics.record_query))
+                response = self.get_response(request)
+        finally:
+            stop_metrics(token)
+        metrics.finish()
+
+        if settings.PERFORMANCE_SERVER_TIMING:
+            response['Server-Timing'] = metrics.server_timing()
+        slow = metrics.total_time * 1000 >= settings.PERFORMANCE_SLOW_REQUEST_MS
+        logger.log(logging.WARNING if slow else logging.INFO, metrics.as_log(request, response, slow))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # 뷰 실행 시간 (SQL 시간을 뺀 나머지를 serializer 시간으로 기록)
+        metrics = current_metrics()
+        if metrics is not None:
+            metrics.view_started()
+        return None
+
+    def process_template_response(self, request, response):
+        # DRF Response 는 뷰가 끝난 뒤 render() 되므로 렌더링 직전 / 직후 시점을 기록
+        metrics = current_metrics()
+        if metrics is not None:
+            metrics.view_finished()
+            metrics.render_started()
+            response.add_post_render_callback(metrics.render_finished)
+        return response
+
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.14 on 2026-10-18 19:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReplicationHeartbeat',
+            fields=[
+                ('id', models.PositiveSmallIntegerField(default=1, primary_key=True, serialize=False)),
+                ('beat_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'replication_heartbeat',
+            },
+        ),
+    ]
@@ -1,4 +1,6 @@
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
+from .signals import soft_delete_changed
 
 
 class TimeStampedModel(models.Model): # 테이블에 생성시간 , 수정시간 기능을 넣어주기 위한 공통 모델
@@ -10,12 +12,85 @@ class TimeStampedModel(models.Model): # 테이블에 생성시간 , 수정시간
 
 
 
+class SoftDeleteQuerySet(models.QuerySet):
+    """
+    soft delete / 복구를 UPDATE 한 번으로 처리하는 쿼리셋
+    (행마다 save() 를 부르지 않으므로 post_save 대신 soft_delete_changed 시그널로 캐시를 무효화한다)
+    """
+
+    def delete(self):
+        count = self._set_deleted(True)
+        return count, {self.model._meta.label: count}
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+    def restore(self):
+        """
+        삭제된 행을 복구 (삭제된 행은 기본 매니저에서 보이지 않으므로 all_objects 로 호출)
+        """
+        return self._set_deleted(False)
+
+    restore.alters_data = True
+
+    def hard_delete(self):
+        # DB 에서 실제로 삭제
+        return super().delete()
+
+    hard_delete.alters_data = True
+    hard_delete.queryset_only = True
+
+    def _set_deleted(self, is_deleted):
+        queryset = self.filter(is_deleted=not is_deleted)
+        fields = {'is_deleted': is_deleted}
+        # .update() 는 auto_now 를 적용하지 않으므로 updated_at 을 직접 넣는다 (conditional GET 의 validator 가 바뀌도록)
+        if any(field.name == 'updated_at' for field in self.model._meta.concrete_fields):
+            fields['updated_at'] = timezone.now()
+
+        if not soft_delete_changed.has_listeners(self.model):
+            return queryset.update(**fields)
+
+        # 받는 쪽이 바뀐 행을 알 수 있도록 UPDATE 할 행을 잠그고 pk 를 먼저 읽어 둔다
+        with transaction.atomic(using=self.db, savepoint=False):
+            pks = list(queryset.select_for_update().values_list('pk', flat=True))
+            if not pks:
+                return 0
+            count = queryset.update(**fields)
+        soft_delete_changed.send(sender=self.model, pks=pks, is_deleted=is_deleted)
+        return count
+
+
+class SoftDeleteManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
+    # 삭제된 행을 숨기는 기본 매니저 (삭제된 행까지 보려면 all_objects 사용)
+
+    def get_queryset(self):
+        return super().get_queryset().filter(is_deleted=False)
+
+
 class SoftDeleteModel(models.Model): # soft delete 모델 (레코드를 실제로 데이터베이스에서 삭제하지 않고, 삭제된 것으로 표시하여 나중에 복구할 수 있는 기능을 구현할 수 있음)
     is_deleted = models.BooleanField(default=False) # 대회 생성했다가 삭제, 경기기록 삭제, 유저 탈퇴, admin 부분에서 삭제기능 진행 (soft delete)
 
+    objects = SoftDeleteManager() # 기본 매니저: 삭제되지 않은 행만 조회
+    all_objects = SoftDeleteQuerySet.as_manager() # 삭제된 행 포함 (관리자 화면, 복구 등)
+
     def delete(self, *args, **kwargs):
         self.is_deleted = True
         self.save()
 
+    def restore(self):
+        self.is_deleted = False
+        self.save()
+
+    class Meta:
+        abstract = True
+
+
+class ReplicationHeartbeat(models.Model):
+    # 복제 지연 확인용 heartbeat (replica_heartbeat 명령이 primary 에 주기적으로 기록, core.db_router 가 복제본에서 읽음)
+    SINGLETON_ID = 1
+
+    id = models.PositiveSmallIntegerField(primary_key=True, default=SINGLETON_ID)
+    beat_at = models.DateTimeField()
+
     class Meta:
-        abstract = True
\ No newline at end of file
+        db_table = 'replication_heartbeat'
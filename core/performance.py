@@ -0,0 +1,121 @@
+import heapq
+import json
+import logging
+import time
+from contextvars import ContextVar
+
+
+# 요청별 성능 측정 (core.middleware.PerformanceMiddleware 에서 사용)
+#
+# 요청 하나에서 실행된 SQL 수 / DB 시간, serializer(.data) 시간, 렌더러 시간, 전체 시간을 모아서
+# Server-Timing 헤더와 로그 한 줄(JSON)로 남긴다.
+#   - SQL 은 요청 동안 모든 DB 연결에 execute_wrapper 를 걸어서 측정 (요청 스레드의 쿼리만 집계됨)
+#   - serializer 시간은 뷰 실행 시간(process_view 부터 process_template_response 까지)에서 그동안의 SQL 시간을 뺀 값
+#     (DRF 를 패치하지 않고 뷰 단위로 측정하므로 캐시 조회 / 권한 확인 등 뷰 안의 다른 파이썬 작업도 포함된다)
+#   - 렌더러 시간은 DRF Response 의 render() 시작(process_template_response) 부터 끝(post render callback) 까지
+
+logger = logging.getLogger('core.performance')
+
+SQL_MAX_LENGTH = 1000
+
+
+class RequestMetrics:
+
+    def __init__(self, slow_query_count=5):
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.render_time = 0.0
+        self.total_time = 0.0
+        self._view_started = None
+        self._view_db_time = 0.0
+        self._render_started = None
+        self._slow_query_count = slow_query_count
+        self._slowest = [] # (시간, 순번, sql) 최소 힙 - 가장 느린 쿼리 slow_query_count 개만 유지
+
+    def record_query(self, execute, sql, params, many, context):
+        # connection.execute_wrapper 로 등록되는 함수
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.query_count += 1
+            self.db_time += duration
+            entry = (duration, self.query_count, sql[:SQL_MAX_LENGTH])
+            if len(self._slowest) < self._slow_query_count:
+                heapq.heappush(self._slowest, entry)
+            elif self._slowest and duration > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, entry)
+
+    def view_started(self):
+        self._view_started = time.perf_counter()
+        self._view_db_time = self.db_time
+
+    def view_finished(self):
+        if self._view_started is not None:
+            elapsed = time.perf_counter() - self._view_started
+            self.serializer_time += max(elapsed - (self.db_time - self._view_db_time), 0.0)
+            self._view_started = None
+
+    def render_started(self):
+        self._render_started = time.perf_counter()
+
+    def render_finished(self, response):
+        if self._render_started is not None:
+            self.render_time += time.perf_counter() - self._render_started
+            self._render_started = None
+        return response
+
+    def finish(self):
+        self.total_time = time.perf_counter() - self.started
+
+    def slowest_queries(self):
+        """
+        가장 느린 SQL 목록 [{'ms', 'sql'}, ...] (느린 순서)
+        """
+        return [{'ms': _ms(duration), 'sql': sql} for duration, _, sql in sorted(self._slowest, reverse=True)]
+
+    def server_timing(self):
+        return ', '.join([
+            f'db;dur={_ms(self.db_time)};desc="{self.query_count} queries"',
+            f'serialize;dur={_ms(self.serializer_time)}',
+            f'render;dur={_ms(self.render_time)}',
+            f'total;dur={_ms(self.total_time)}',
+        ])
+
+    def as_log(self, request, response, slow):
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'total_ms': _ms(self.total_time),
+            'db_ms': _ms(self.db_time),
+            'queries': self.query_count,
+            'serializer_ms': _ms(self.serializer_time),
+            'render_ms': _ms(self.render_time),
+        }
+        if slow:
+            record['slow_queries'] = self.slowest_queries()
+        return json.dumps(record, ensure_ascii=False)
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 2)
+
+
+_current_metrics = ContextVar('request_metrics', default=None)
+
+
+def current_metrics():
+    return _current_metrics.get()
+
+
+def start_metrics(metrics):
+    return _current_metrics.set(metrics)
+
+
+def stop_metrics(token):
+    _current_metrics.reset(token)
+
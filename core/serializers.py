@@ -0,0 +1,95 @@
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.relations import RelatedField
+
+
+class EagerLoadingMixin:
+    """
+    ModelSerializer 에 선언된 중첩 serializer / 관계 필드 / SerializerMethodField 를 보고
+    필요한 select_related / prefetch_related 를 자동으로 적용하는 mixin
+
+        users = UserWithTeamInfoSerializer.setup_eager_loading(CustomUser.objects.filter(club=club))
+
+    - 정방향 FK / OneToOne 은 select_related, 역방향 FK / ManyToMany 는 prefetch_related (그 아래 관계도 prefetch)
+    - 중첩 serializer 는 그 안의 필드까지 따라 들어간다 (예: CoachSerializer -> user, user__team, user__image_url)
+    - SerializerMethodField 는 필드 이름과 같은 관계가 모델에 있으면 그 관계를 불러온다 (get_team -> team)
+    - pk 만 쓰는 PrimaryKeyRelatedField 는 <필드>_id 컬럼을 읽으므로 JOIN 하지 않는다
+    """
+
+    @classmethod
+    def eager_loading_lookups(cls):
+        """
+        (select_related 목록, prefetch_related 목록) - serializer 클래스마다 한 번만 계산
+        """
+        lookups = cls.__dict__.get('_eager_loading_lookups')
+        if lookups is None:
+            select_related, prefetch_related = {}, {}
+            _collect_lookups(cls(), cls.Meta.model, '', False, select_related, prefetch_related)
+            lookups = tuple(select_related), tuple(prefetch_related)
+            cls._eager_loading_lookups = lookups
+        return lookups
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        select_related, prefetch_related = cls.eager_loading_lookups()
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset
+
+
+def _collect_lookups(serializer, model, prefix, prefetching, select_related, prefetch_related):
+    # serializer 의 읽기 필드를 따라가면서 관계 조회 이름을 select_related / prefetch_related 에 모은다 (dict 를 순서 있는 set 으로 사용)
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        nested = field.child if isinstance(field, serializers.ListSerializer) else field
+
+        if isinstance(field, serializers.SerializerMethodField):
+            source_attrs = [field.field_name]
+        elif field.source == '*':
+            continue
+        else:
+            source_attrs = field.source.split('.')
+
+        current_model, path, many = model, prefix, prefetching
+        for index, attr in enumerate(source_attrs):
+            model_field = _relation_field(current_model, attr)
+            if model_field is None:
+                break
+            is_last = index == len(source_attrs) - 1
+            if is_last and isinstance(field, RelatedField) and field.use_pk_only_optimization():
+                # 마지막 관계의 pk 만 쓰면 FK 컬럼만 읽으면 된다
+                break
+
+            path = f'{path}__{attr}' if path else attr
+            many = many or model_field.one_to_many or model_field.many_to_many
+            (prefetch_related if many else select_related)[path] = None
+            current_model = model_field.related_model
+        else:
+            # 관계를 끝까지 따라간 중첩 serializer 는 그 안의 필드도 확인
+            if isinstance(nested, serializers.Serializer):
+                _collect_lookups(nested, current_model, path, many, select_related, prefetch_related)
+
+
+def _relation_field(model, attr):
+    # 모델 속성 이름에 해당하는 관계 필드 (역방향 관계는 team_set 같은 접근자 이름으로 찾는다, 관계가 아니면 None)
+    try:
+        field = model._meta.get_field(attr)
+    except FieldDoesNotExist:
+        field = None
+    if field is not None and field.auto_created and not field.concrete:
+        field = field if field.get_accessor_name() == attr else None
+    if field is None:
+        field = next((related for related in model._meta.related_objects if related.get_accessor_name() == attr), None)
+    if field is None or not field.is_relation or field.related_model is None:
+        return None
+    return field
+
+
+class SyncQuerySerializer(serializers.Serializer):
+    # ?token=...&pageSize=500 (CamelCaseMiddleWare 가 page_size 로 변환)
+    token = serializers.CharField(required=False, allow_blank=True)
+    page_size = serializers.IntegerField(required=False, min_value=1, max_value=settings.SYNC_MAX_PAGE_SIZE)
@@ -0,0 +1,164 @@
+from django.apps import apps
+from django.db.models.signals import ModelSignal, pre_save, post_save, post_delete
+from .cache import invalidate
+
+
+# 응답 캐시 무효화 시그널
+#
+# 캐시 태그 규칙
+#   club:{id}          클럽 자체 정보 (클럽 상세, 클럽을 포함하는 유저 상세)
+#   club-members:{id}  클럽 상세에 포함되는 코치 / 팀 / 유저 목록
+#   team:{id}          팀 자체 정보 (팀 상세, 팀을 포함하는 유저 상세)
+#   team-members:{id}  팀 상세에 포함되는 유저 목록
+#   user:{id}          유저 상세
+#
+# 한 건씩 하는 soft delete 는 save() 를 거치기 때문에 post_save 에서 같이 처리되고,
+# SoftDeleteQuerySet.delete() / restore() 의 일괄 변경은 soft_delete_changed 시그널로 처리된다.
+
+# SoftDeleteQuerySet 이 일괄 soft delete / 복구 후에 보내는 시그널 (sender=모델, pks=바뀐 행의 pk 목록, is_deleted)
+soft_delete_changed = ModelSignal(use_caching=True)
+
+BULK_BATCH_SIZE = 1000
+
+
+def _previous_values(sender, instance, fields):
+    # 저장 전 값 (클럽 / 팀 이동 시 이전 클럽 / 팀의 캐시도 무효화하기 위해 사용)
+    if instance.pk is None:
+        return {}
+    return sender._base_manager.filter(pk=instance.pk).values(*fields).first() or {}
+
+
+def remember_team_membership(sender, instance, raw=False, **kwargs):
+    if not raw:
+        instance._cache_previous = _previous_values(sender, instance, ['club_id', 'team_id'])
+
+
+def remember_club(sender, instance, raw=False, **kwargs):
+    if not raw:
+        instance._cache_previous = _previous_values(sender, instance, ['club_id'])
+
+
+def user_tags(user_id, club_id, team_id):
+    """
+    유저 한 명이 바뀌었을 때 무효화해야 하는 태그 목록
+    """
+    Coach = apps.get_model('coach', 'Coach')
+    tags = [f'user:{user_id}']
+    if club_id is not None:
+        tags.append(f'club-members:{club_id}')
+    if team_id is not None:
+        tags.append(f'team-members:{team_id}')
+    # 코치로 등록된 클럽의 상세정보에도 유저 정보가 들어간다
+    for coach_club_id in Coach._base_manager.filter(user_id=user_id).values_list('club_id', flat=True):
+        tags.append(f'club-members:{coach_club_id}')
+    return tags
+
+
+def invalidate_user(sender, instance, **kwargs):
+    previous = getattr(instance, '_cache_previous', {})
+    tags = user_tags(instance.pk, instance.club_id, instance.team_id)
+    if previous.get('club_id') is not None:
+        tags.append(f'club-members:{previous["club_id"]}')
+    if previous.get('team_id') is not None:
+        tags.append(f'team-members:{previous["team_id"]}')
+    invalidate(*tags)
+
+
+def invalidate_club(sender, instance, **kwargs):
+    invalidate(f'club:{instance.pk}')
+
+
+def invalidate_team(sender, instance, **kwargs):
+    tags = [f'team:{instance.pk}', f'club-members:{instance.club_id}']
+    previous = getattr(instance, '_cache_previous', {})
+    if previous.get('club_id') is not None:
+        tags.append(f'club-members:{previous["club_id"]}')
+    invalidate(*tags)
+
+
+def invalidate_coach(sender, instance, **kwargs):
+    tags = [f'club-members:{instance.club_id}']
+    previous = getattr(instance, '_cache_previous', {})
+    if previous.get('club_id') is not None:
+        tags.append(f'club-members:{previous["club_id"]}')
+    invalidate(*tags)
+
+
+def invalidate_image(sender, instance, created=False, **kwargs):
+    # 새로 만든 이미지는 아직 아무도 사용하지 않으므로 무효화할 캐시가 없다
+    if created:
+        return
+
+    # 이미지를 사용하는 클럽 / 팀 / 유저를 찾아서 해당 캐시를 무효화
+    Club = apps.get_model('club', 'Club')
+    Team = apps.get_model('team', 'Team')
+    CustomUser = apps.get_model('users', 'CustomUser')
+
+    tags = [f'club:{pk}' for pk in Club._base_manager.filter(image_url=instance.pk).values_list('id', flat=True)]
+    for pk, club_id in Team._base_manager.filter(image_url=instance.pk).values_list('id', 'club_id'):
+        tags += [f'team:{pk}', f'club-members:{club_id}']
+    for pk, club_id, team_id in CustomUser._base_manager.filter(image_url=instance.pk).values_list('id', 'club_id', 'team_id'):
+        tags += user_tags(pk, club_id, team_id)
+    invalidate(*tags)
+
+
+def _batches(pks):
+    # IN (...) 파라미터 수가 너무 커지지 않도록 나눠서 조회
+    for start in range(0, len(pks), BULK_BATCH_SIZE):
+        yield pks[start:start + BULK_BATCH_SIZE]
+
+
+def invalidate_users_bulk(sender, pks, **kwargs):
+    Coach = apps.get_model('coach', 'Coach')
+    tags = []
+    for batch in _batches(pks):
+        for pk, club_id, team_id in sender._base_manager.filter(pk__in=batch).values_list('id', 'club_id', 'team_id'):
+            tags.append(f'user:{pk}')
+            if club_id is not None:
+                tags.append(f'club-members:{club_id}')
+            if team_id is not None:
+                tags.append(f'team-members:{team_id}')
+        coach_club_ids = Coach._base_manager.filter(user_id__in=batch).values_list('club_id', flat=True).distinct()
+        tags += [f'club-members:{club_id}' for club_id in coach_club_ids]
+    invalidate(*tags)
+
+
+def invalidate_clubs_bulk(sender, pks, **kwargs):
+    invalidate(*[f'club:{pk}' for pk in pks])
+
+
+def invalidate_teams_bulk(sender, pks, **kwargs):
+    tags = [f'team:{pk}' for pk in pks]
+    for batch in _batches(pks):
+        club_ids = sender._base_manager.filter(pk__in=batch).values_list('club_id', flat=True).distinct()
+        tags += [f'club-members:{club_id}' for club_id in club_ids]
+    invalidate(*tags)
+
+
+def invalidate_coaches_bulk(sender, pks, **kwargs):
+    tags = []
+    for batch in _batches(pks):
+        club_ids = sender._base_manager.filter(pk__in=batch).values_list('club_id', flat=True).distinct()
+        tags += [f'club-members:{club_id}' for club_id in club_ids]
+    invalidate(*tags)
+
+
+def connect_signals():
+    """
+    CoreConfig.ready() 에서 호출
+    """
+    pre_save.connect(remember_team_membership, sender='users.CustomUser', dispatch_uid='cache_remember_user')
+    pre_save.connect(remember_club, sender='team.Team', dispatch_uid='cache_remember_team')
+    pre_save.connect(remember_club, sender='coach.Coach', dispatch_uid='cache_remember_coach')
+
+    for name, signal in (('save', post_save), ('delete', post_delete)):
+        signal.connect(invalidate_user, sender='users.CustomUser', dispatch_uid=f'cache_user_{name}')
+        signal.connect(invalidate_club, sender='club.Club', dispatch_uid=f'cache_club_{name}')
+        signal.connect(invalidate_team, sender='team.Team', dispatch_uid=f'cache_team_{name}')
+        signal.connect(invalidate_coach, sender='coach.Coach', dispatch_uid=f'cache_coach_{name}')
+        signal.connect(invalidate_image, sender='image_url.ImageUrl', dispatch_uid=f'cache_image_{name}')
+
+    soft_delete_changed.connect(invalidate_users_bulk, sender='users.CustomUser', dispatch_uid='cache_user_bulk')
+    soft_delete_changed.connect(invalidate_clubs_bulk, sender='club.Club', dispatch_uid='cache_club_bulk')
+    soft_delete_changed.connect(invalidate_teams_bulk, sender='team.Team', dispatch_uid='cache_team_bulk')
+    soft_delete_changed.connect(invalidate_coaches_bulk, sender='coach.Coach', dispatch_uid='cache_coach_bulk')
@@ -0,0 +1,126 @@
+from datetime import datetime, timedelta
+from django.apps import apps
+from django.conf import settings
+from django.core import signing
+from django.db.models import Q
+from django.utils import timezone
+
+
+# 변경분 동기화 (앱 실행 시 "마지막 동기화 이후 바뀐 행만" 받기)
+#
+# 테이블마다 (updated_at, id) 순서로 키셋 스캔을 하고, 마지막으로 내려준 행의 (updated_at, id) 를 커서로 저장한다.
+# 커서들은 서명된 sync 토큰 하나에 담아서 내려주고, 클라이언트는 다음 동기화 때 그 토큰을 그대로 보낸다.
+#   - soft delete 된 행은 tombstone(deleted 에 id 만) 으로 내려준다 (처음 동기화할 때는 생략)
+#   - 한 페이지에 모든 테이블을 합쳐 page_size 행까지 내려주고, 남은 행이 있으면 has_more 로 알려준다
+#   - 지금 시각에서 SYNC_SAFETY_WINDOW 초 이전에 수정된 행까지만 내려준다.
+#     updated_at 은 커밋 전에 정해지므로, 아직 커밋되지 않은 트랜잭션의 행이 커서 뒤로 밀려서 누락되는 것을 막기 위함
+#     (이 시간보다 오래 걸리는 트랜잭션의 행은 누락될 수 있음)
+
+SYNC_TOKEN_SALT = 'core.sync'
+SYNC_TOKEN_VERSION = 1
+
+SYNC_TABLES = {
+    # 테이블 이름: (모델, {응답 컬럼 이름: values() 조회 이름}) - id / updatedAt 컬럼은 항상 앞에 붙는다
+    'clubs': ('club.Club', {
+        'name': 'name', 'address': 'address', 'phone': 'phone', 'description': 'description',
+        'imageId': 'image_url_id',
+    }),
+    'teams': ('team.Team', {
+        'name': 'name', 'description': 'description', 'clubId': 'club_id', 'imageId': 'image_url_id',
+    }),
+    'tiers': ('tier.Tier', {
+        'name': 'name', 'level': 'level', 'matchTypeId': 'match_type_id',
+    }),
+    'users': ('users.CustomUser', {
+        'username': 'username', 'gender': 'gender', 'birth': 'birth',
+        'clubId': 'club_id', 'teamId': 'team_id', 'tierId': 'tier_id', 'imageId': 'image_url_id',
+    }),
+    # 이미지는 soft delete 가 없고, 업로드가 끝나면 URL 이 바뀌므로 따로 동기화한다
+    'images': ('image_url.ImageUrl', {
+        'imageUrl': 'image_url', 'hasVariants': 'has_variants',
+    }),
+}
+
+
+class SyncTokenError(Exception):
+    pass
+
+
+def dump_token(cursors):
+    """
+    테이블별 커서 {테이블: (updated_at, id)} 를 sync 토큰으로 서명
+    """
+    payload = {'v': SYNC_TOKEN_VERSION,
+               'c': {table: [updated_at.isoformat(), pk] for table, (updated_at, pk) in cursors.items()}}
+    return signing.dumps(payload, salt=SYNC_TOKEN_SALT, compress=True)
+
+
+def load_token(token):
+    """
+    sync 토큰에서 테이블별 커서를 꺼낸다 (토큰이 없으면 빈 dict = 처음 동기화)
+    """
+    if not token:
+        return {}
+    try:
+        payload = signing.loads(token, salt=SYNC_TOKEN_SALT)
+        if payload.get('v') != SYNC_TOKEN_VERSION:
+            raise SyncTokenError('지원하지 않는 sync 토큰입니다. 처음부터 다시 동기화해 주세요.')
+        return {table: (datetime.fromisoformat(updated_at), pk)
+                for table, (updated_at, pk) in payload['c'].items() if table in SYNC_TABLES}
+    except (signing.BadSignature, KeyError, TypeError, ValueError):
+        raise SyncTokenError('올바르지 않은 sync 토큰입니다.')
+
+
+def _scan(model, columns, cursor, until, limit):
+    # (updated_at, id) 인덱스를 타는 키셋 스캔 - 커서 다음 행부터 limit + 1 행을 읽는다
+    soft_delete = any(field.name == 'is_deleted' for field in model._meta.concrete_fields)
+    queryset = model._base_manager.filter(updated_at__lte=until)
+    if cursor is not None:
+        updated_at, pk = cursor
+        queryset = queryset.filter(Q(updated_at__gt=updated_at) | Q(id__gt=pk), updated_at__gte=updated_at)
+
+    # 행 모양을 (id, updated_at, is_deleted, 컬럼...) 으로 맞추기 위해 soft delete 가 없는 모델은 id 를 한 번 더 읽는다
+    lookups = ['id', 'updated_at', 'is_deleted' if soft_delete else 'id', *columns.values()]
+    rows = queryset.order_by('updated_at', 'id').values_list(*lookups)[:limit + 1]
+    return list(rows), soft_delete
+
+
+def collect_changes(token=None, page_size=None):
+    """
+    토큰 이후 바뀐 행을 테이블별로 모아서 반환
+    {'token': 다음 토큰, 'has_more': 남은 행 여부, 'tables': {테이블: {'columns', 'rows', 'deleted'}}}
+    """
+    cursors = load_token(token)
+    page_size = page_size or settings.SYNC_PAGE_SIZE
+    until = timezone.now() - timedelta(seconds=settings.SYNC_SAFETY_WINDOW)
+
+    tables = {}
+    remaining = page_size
+    has_more = False
+    for table, (label, columns) in SYNC_TABLES.items():
+        if remaining == 0:
+            has_more = True
+            break
+        cursor = cursors.get(table)
+        rows, soft_delete = _scan(apps.get_model(label), columns, cursor, until, remaining)
+        if len(rows) > remaining:
+            rows = rows[:remaining]
+            has_more = True
+        if not rows:
+            continue
+
+        changes = {'columns': ['id', 'updatedAt', *columns], 'rows': [], 'deleted': []}
+        for pk, updated_at, is_deleted, *values in rows:
+            if soft_delete and is_deleted:
+                # 처음 동기화할 때는 삭제된 행을 내려줄 필요가 없음 (커서는 그대로 넘어간다)
+                if cursor is not None:
+                    changes['deleted'].append(pk)
+            else:
+                changes['rows'].append([pk, updated_at, *values])
+        tables[table] = changes
+        cursors[table] = rows[-1][1], rows[-1][0]
+        remaining -= len(rows)
+        if has_more:
+            break
+
+    return {'token': dump_token(cursors), 'has_more': has_more, 'tables': tables}
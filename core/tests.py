@@ -1,3 +1,607 @@
-from django.test import TestCase
+import io
+import itertools
+import json
+import os
+import shutil
+import tempfile
+import uuid
+from datetime import date, time, timedelta
+from decimal import Decimal
+from unittest import mock
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections
+from django.db.models import F
+from django.http import QueryDict
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+from django.utils.translation import gettext_lazy
+from djangorestframework_camel_case.parser import CamelCaseJSONParser as LibraryJSONParser
+from djangorestframework_camel_case.render import CamelCaseJSONRenderer as LibraryJSONRenderer
+from djangorestframework_camel_case.util import underscoreize as library_underscoreize
+from rest_framework import serializers
+from rest_framework.exceptions import ParseError
+from .benchmark import capture_queries, check_budgets
+from .cache import cached_data, invalidate
+from .camel_case import CamelCaseJSONParser, CamelCaseJSONRenderer, underscoreize
+from .db_router import read_from_replicas, replica_health
+from .models import ReplicationHeartbeat
+from .performance import RequestMetrics
+from .serializers import EagerLoadingMixin
+from club.loaders import load_club_detail
+from club.tests import make_club
+from club.models import Club
+from club.serializers import CoachSerializer, TeamSerializer
+from coach.models import Coach
+from competition.models import Competition
+from users.models import CustomUser
+from users.serializers import UserInfoSerializer
+from team.models import Team
 
-# Create your tests here.
+
+class CachedDataTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_build_runs_once_until_tag_is_invalidated(self):
+        calls = []
+
+        def build(tag):
+            tag('club:1', 'club-members:1')
+            calls.append(1)
+            return {'value': len(calls)}
+
+        self.assertEqual(cached_data('club:1', build), {'value': 1})
+        self.assertEqual(cached_data('club:1', build), {'value': 1})
+
+        invalidate('club-members:1')
+        self.assertEqual(cached_data('club:1', build), {'value': 2})
+
+        # 관계 없는 태그는 영향 없음
+        invalidate('club-members:2', 'user:1')
+        self.assertEqual(cached_data('club:1', build), {'value': 2})
+
+    def test_invalidation_during_build_is_not_served(self):
+        def build(tag):
+            tag('team:1')
+            invalidate('team:1')  # 데이터를 읽는 도중 변경이 일어난 경우
+            return {'stale': True}
+
+        cached_data('team:1', build)
+        self.assertEqual(cached_data('team:1', lambda tag: {'stale': False}), {'stale': False})
+
+
+class ResponseCacheInvalidationTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.club = make_club(members=3, teams=1, coaches=1)
+        self.team = Team.objects.get(club=self.club)
+        self.member = CustomUser.objects.filter(club=self.club).exclude(coach__isnull=False).first()
+
+    def get(self, name, pk):
+        return self.client.get(reverse(name, args=[pk])).json()
+
+    def test_repeat_hits_are_served_from_cache(self):
+        for name, pk in (('club-detail', self.club.pk), ('team-detail', self.team.pk), ('user-detail', self.member.pk)):
+            self.get(name, pk)
+            with self.assertNumQueries(0):
+                self.get(name, pk)
+
+    def test_user_save_evicts_user_club_and_team_entries(self):
+        self.get('club-detail', self.club.pk)
+        self.get('team-detail', self.team.pk)
+        self.get('user-detail', self.member.pk)
+
+        self.member.username = '새이름'
+        self.member.save()
+
+        club = self.get('club-detail', self.club.pk)
+        self.assertIn('새이름', [user['username'] for user in club['users']])
+        team = self.get('team-detail', self.team.pk)
+        self.assertIn('새이름', [user['username'] for user in team['users']])
+        self.assertEqual(self.get('user-detail', self.member.pk)['username'], '새이름')
+
+    def test_club_and_image_changes_evict_embedding_entries(self):
+        self.get('user-detail', self.member.pk)
+        self.club.name = '바뀐클럽'
+        self.club.save()
+        self.assertEqual(self.get('user-detail', self.member.pk)['club']['name'], '바뀐클럽')
+
+        self.get('team-detail', self.team.pk)
+        image = self.member.image_url
+        image.image_url = 'https://example.com/new.png'
+        image.save()
+        team = self.get('team-detail', self.team.pk)
+        self.assertIn({'imageUrl': 'https://example.com/new.png'}, [user['imageUrl'] for user in team['users']])
+
+    def test_soft_delete_and_membership_moves(self):
+        self.get('club-detail', self.club.pk)
+        self.member.delete()  # soft delete
+        other = make_club(members=0, teams=0, coaches=0)
+
+        self.get('club-detail', self.club.pk)
+        moved = CustomUser.objects.filter(club=self.club, is_deleted=False).exclude(coach__isnull=False).first()
+        moved.club = other
+        moved.save()
+        club = self.get('club-detail', self.club.pk)
+        self.assertNotIn(moved.pk, [user['id'] for user in club['users']])
+
+
+class ConditionalGetTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.club = make_club(members=3, teams=1, coaches=1)
+        self.team = Team.objects.get(club=self.club)
+        self.member = CustomUser.objects.filter(club=self.club).exclude(coach__isnull=False).first()
+        self.urls = [reverse('club-detail', args=[self.club.pk]),
+                     reverse('team-detail', args=[self.team.pk]),
+                     reverse('user-detail', args=[self.member.pk])]
+
+    def test_matching_etag_returns_304_without_building_payload(self):
+        for url in self.urls:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('Last-Modified', response)
+
+            with self.assertNumQueries(0):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.content, b'')
+
+    def test_if_modified_since_alone_never_returns_stale_304(self):
+        url = reverse('team-detail', args=[self.team.pk])
+        since = http_date((timezone.now() + timedelta(minutes=1)).timestamp())
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=since).status_code, 200)
+
+        # 멤버가 빠져도 최대 updated_at 은 그대로 - If-Modified-Since 만으로는 변경을 알 수 없으므로 항상 200
+        CustomUser.objects.filter(pk=self.member.pk).delete()
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(self.member.pk, [user['id'] for user in response.json()['users']])
+
+    def test_member_change_produces_new_validator(self):
+        etags = [self.client.get(url)['ETag'] for url in self.urls]
+
+        self.member.username = '새이름'
+        self.member.save()
+
+        for url, etag in zip(self.urls, etags):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response['ETag'], etag)
+
+    def test_removed_member_changes_etag(self):
+        url = reverse('team-detail', args=[self.team.pk])
+        etag = self.client.get(url)['ETag']
+        cache.clear()
+        # updated_at 이 바뀌지 않는 변경 (행 삭제) 도 행 수로 감지
+        CustomUser.objects.filter(pk=self.member.pk).update(team=None, updated_at=self.member.updated_at)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_missing_resource_keeps_404(self):
+        response = self.client.get(reverse('club-detail', args=[999]))
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn('ETag', response)
+
+
+class SoftDeleteQuerySetTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.club = make_club(members=4, teams=1, coaches=1)
+        self.team = Team.objects.get(club=self.club)
+
+    def test_bulk_delete_is_a_single_update(self):
+        for i in range(5):
+            Competition.objects.create(name=f'대회{i}')
+
+        # 받는 시그널이 없는 모델은 UPDATE 한 번
+        with self.assertNumQueries(1):
+            self.assertEqual(Competition.objects.filter(name__in=['대회0', '대회1']).delete(),
+                             (2, {'competition.Competition': 2}))
+
+        self.assertEqual(Competition.objects.count(), 3)
+        self.assertEqual(Competition.all_objects.count(), 5)
+
+        Competition.all_objects.restore()
+        self.assertEqual(Competition.objects.count(), 5)
+
+    def test_default_manager_hides_deleted_rows(self):
+        users = CustomUser.objects.filter(club=self.club)
+        deleted = users.first()
+        deleted.delete()
+
+        self.assertNotIn(deleted, CustomUser.objects.all())
+        self.assertIn(deleted, CustomUser.all_objects.all())
+        # 역참조 매니저와 로그인 조회도 기본 매니저를 사용
+        self.assertEqual(self.club.customuser_set.count(), 4)
+        with self.assertRaises(CustomUser.DoesNotExist):
+            CustomUser.objects.get_by_natural_key(deleted.phone)
+
+    def test_bulk_delete_invalidates_cached_responses(self):
+        club = self.client.get(reverse('club-detail', args=[self.club.pk])).json()
+        team = self.client.get(reverse('team-detail', args=[self.team.pk])).json()
+        self.assertEqual(len(club['users']), 4)
+        self.assertEqual(len(team['users']), 5)
+        member_updated_at = CustomUser.objects.filter(club=self.club).values_list('updated_at', flat=True).first()
+
+        CustomUser.objects.filter(club=self.club).delete()
+
+        club = self.client.get(reverse('club-detail', args=[self.club.pk])).json()
+        team = self.client.get(reverse('team-detail', args=[self.team.pk])).json()
+        self.assertEqual((club['users'], team['users']), ([], []))
+        self.assertTrue(all(updated_at > member_updated_at
+                            for updated_at in CustomUser.all_objects.values_list('updated_at', flat=True)))
+
+        CustomUser.all_objects.filter(club=self.club).restore()
+        club = self.client.get(reverse('club-detail', args=[self.club.pk])).json()
+        self.assertEqual(len(club['users']), 4)
+
+    def test_deleted_users_phone_cannot_sign_up_again(self):
+        user = CustomUser.objects.filter(club=self.club).first()
+        CustomUser.objects.filter(pk=user.pk).delete()
+
+        response = self.client.post(reverse('signup'), {
+            'phone': user.phone, 'password': 'test-password-1234', 'username': '새유저',
+            'birth': 1990, 'gender': 'male',
+        })
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(SYNC_SAFETY_WINDOW=0)
+class SyncViewTest(TestCase):
+
+    def setUp(self):
+        self.club = make_club(members=3, teams=2, coaches=1)
+        self.team = Team.objects.filter(club=self.club).first()
+
+    def sync(self, token=None, **params):
+        if token:
+            params['token'] = token
+        response = self.client.get(reverse('sync'), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def ids(self, body, table, key='rows'):
+        return [row[0] for row in body['tables'].get(table, {}).get('rows', [])] if key == 'rows' \
+            else body['tables'].get(table, {}).get('deleted', [])
+
+    def test_first_sync_returns_live_rows_and_next_sync_is_empty(self):
+        deleted = CustomUser.objects.filter(club=self.club).last()
+        deleted.delete()
+
+        # 테이블마다 키셋 스캔 한 번
+        with self.assertNumQueries(5):
+            body = self.sync()
+        self.assertFalse(body['hasMore'])
+        users = body['tables']['users']
+        self.assertEqual(users['columns'][:2], ['id', 'updatedAt'])
+        self.assertNotIn('phone', users['columns'])
+        self.assertEqual(sorted(self.ids(body, 'users')), sorted(CustomUser.objects.values_list('id', flat=True)))
+        self.assertEqual(users['deleted'], [])
+        self.assertEqual(len(self.ids(body, 'images')), 1 + 2 + 4)
+
+        self.assertEqual(self.sync(body['token'])['tables'], {})
+
+    def test_changes_and_tombstones_after_token(self):
+        token = self.sync()['token']
+
+        self.team.name = '바뀐팀'
+        self.team.save()
+        Club.objects.filter(pk=self.club.pk).delete()
+
+        body = self.sync(token)
+        self.assertEqual(set(body['tables']), {'clubs', 'teams'})
+        self.assertEqual(body['tables']['clubs'], {'columns': body['tables']['clubs']['columns'], 'rows': [],
+                                                   'deleted': [self.club.pk]})
+        team = dict(zip(body['tables']['teams']['columns'], body['tables']['teams']['rows'][0]))
+        self.assertEqual((team['id'], team['name']), (self.team.pk, '바뀐팀'))
+
+    def test_pages_cover_every_row_once(self):
+        expected = {'clubs': 1, 'teams': 2, 'users': 4, 'images': 7}
+        seen = {table: [] for table in expected}
+        token, pages = None, 0
+        while True:
+            body = self.sync(token, pageSize=3)
+            pages += 1
+            for table in seen:
+                seen[table] += self.ids(body, table)
+            token = body['token']
+            if not body['hasMore']:
+                break
+
+        self.assertEqual({table: len(ids) for table, ids in seen.items()}, expected)
+        self.assertEqual({table: len(set(ids)) for table, ids in seen.items()}, expected)
+        self.assertGreaterEqual(pages, 5)
+
+    @override_settings(SYNC_SAFETY_WINDOW=60)
+    def test_rows_inside_safety_window_are_deferred(self):
+        self.assertEqual(self.sync()['tables'], {})
+
+    def test_invalid_token(self):
+        response = self.client.get(reverse('sync'), {'token': 'not-a-token'})
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(DATABASE_REPLICAS=['replica'], DATABASE_REPLICA_MAX_LAG=5, DATABASE_REPLICA_LAG_CHECK_INTERVAL=0)
+class ReplicaRoutingTest(TransactionTestCase):
+    # primary(테스트 DB) 와 복제본(임시 sqlite 파일) 두 DB 로 라우팅 확인
+    # 복제본 별칭은 테스트 러너가 만드는 DB 가 아니므로 테스트 클래스 안에서만 등록한다
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.replica_dir = tempfile.mkdtemp()
+        connections.settings['replica'] = connections.configure_settings({
+            'default': connections.settings['default'],
+            'replica': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': os.path.join(cls.replica_dir, 'replica.sqlite3')},
+        })['replica']
+
+    @classmethod
+    def tearDownClass(cls):
+        connections['replica'].close()
+        del connections['replica']
+        del connections.settings['replica']
+        shutil.rmtree(cls.replica_dir)
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        replica_health.reset()
+        self.replicated = Club.objects.create(name='복제된클럽')
+        self.replicate(lag=0)
+        # 복제본에 아직 반영되지 않은 행
+        self.recent = Club.objects.create(name='새클럽')
+
+    def replicate(self, lag):
+        # primary 의 현재 상태를 복제본에 복사 (heartbeat 는 lag 초 전에 기록된 것으로)
+        ReplicationHeartbeat.objects.update_or_create(
+            pk=ReplicationHeartbeat.SINGLETON_ID, defaults={'beat_at': timezone.now() - timedelta(seconds=lag)})
+        for alias in ('default', 'replica'):
+            connections[alias].ensure_connection()
+        connections['default'].connection.backup(connections['replica'].connection)
+
+    def club_list_ids(self):
+        return [club['id'] for club in self.client.get(reverse('club-list')).json()['data']]
+
+    def test_read_requests_are_served_from_replica(self):
+        self.assertEqual(self.club_list_ids(), [self.replicated.pk])
+        # 요청 밖의 쿼리는 primary
+        self.assertEqual(Club.objects.count(), 2)
+
+    def test_write_pins_the_rest_of_the_request_to_primary(self):
+        with read_from_replicas():
+            self.assertEqual(Club.objects.count(), 1)
+            Club.objects.create(name='또다른클럽')
+            self.assertEqual(Club.objects.count(), 3)
+
+    def test_lagging_replica_falls_back_to_primary(self):
+        self.replicate(lag=60)
+        self.assertEqual(self.club_list_ids(), [self.replicated.pk, self.recent.pk])
+
+        # 복제가 따라잡으면 다시 복제본에서 읽는다
+        self.replicate(lag=0)
+        Club.objects.create(name='복제 안 된 클럽')
+        self.assertEqual(len(self.club_list_ids()), 2)
+
+    def test_benchmark_counts_queries_on_every_alias(self):
+        with capture_queries() as queries:
+            self.club_list_ids()
+        self.assertGreater(queries.counts['replica'], 0)
+        self.assertEqual(len(queries), sum(queries.counts.values()))
+        self.assertEqual(len(queries.captured_queries), len(queries))
+
+    def test_cached_responses_are_built_from_primary(self):
+        response = self.client.get(reverse('club-detail', args=[self.recent.pk]))
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(PERFORMANCE_SERVER_TIMING=True)
+class PerformanceMiddlewareTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.club = make_club(members=3, teams=1, coaches=1)
+
+    def timings(self, response):
+        timings = {}
+        for metric in response['Server-Timing'].split(', '):
+            name, *params = metric.split(';')
+            timings[name] = dict(param.split('=', 1) for param in params)
+        return timings
+
+    def test_server_timing_reports_queries_serializer_and_render_time(self):
+        url = reverse('club-detail', args=[self.club.pk])
+        with self.assertNumQueries(8) as context:
+            response = self.client.get(url)
+
+        timings = self.timings(response)
+        self.assertEqual(set(timings), {'db', 'serialize', 'render', 'total'})
+        self.assertEqual(timings['db']['desc'], f'"{len(context.captured_queries)} queries"')
+        self.assertGreater(float(timings['serialize']['dur']), 0)
+        self.assertGreater(float(timings['render']['dur']), 0)
+        self.assertGreaterEqual(float(timings['total']['dur']), float(timings['db']['dur']))
+
+        # 캐시에서 응답하면 쿼리가 없음
+        timings = self.timings(self.client.get(url))
+        self.assertEqual(timings['db']['desc'], '"0 queries"')
+
+    def test_serializer_time_excludes_queries_and_does_not_patch_drf(self):
+        from rest_framework.serializers import BaseSerializer
+        self.assertFalse(getattr(BaseSerializer.data.fget, 'instrumented', False))
+
+        with mock.patch('time.perf_counter', side_effect=itertools.count()):
+            metrics = RequestMetrics()  # 0
+            metrics.view_started()  # 1
+            metrics.record_query(lambda *args: None, 'SELECT 1', (), False, {})  # 2, 3 -> SQL 1초
+            metrics.view_finished()  # 4
+        self.assertEqual((metrics.db_time, metrics.serializer_time), (1, 2))
+
+    @override_settings(PERFORMANCE_SLOW_REQUEST_MS=0, PERFORMANCE_SLOW_QUERY_COUNT=2)
+    def test_slow_request_logs_slowest_queries(self):
+        with self.assertLogs('core.performance', 'WARNING') as logs:
+            self.client.get(reverse('club-detail', args=[self.club.pk]))
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual((record['method'], record['path'], record['status']),
+                         ('GET', reverse('club-detail', args=[self.club.pk]), 200))
+        self.assertEqual(record['queries'], 8)
+        self.assertEqual(len(record['slow_queries']), 2)
+        self.assertGreaterEqual(record['slow_queries'][0]['ms'], record['slow_queries'][1]['ms'])
+        self.assertTrue(record['slow_queries'][0]['sql'].startswith('SELECT'))
+
+    @override_settings(PERFORMANCE_INSTRUMENTATION=False)
+    def test_can_be_disabled(self):
+        response = self.client.get(reverse('club-detail', args=[self.club.pk]))
+        self.assertNotIn('Server-Timing', response)
+
+    @override_settings(PERFORMANCE_SERVER_TIMING=False, PERFORMANCE_SLOW_REQUEST_MS=0)
+    def test_header_can_be_hidden_while_logging(self):
+        with self.assertLogs('core.performance', 'WARNING'):
+            response = self.client.get(reverse('club-detail', args=[self.club.pk]))
+        self.assertNotIn('Server-Timing', response)
+
+
+
+class CamelCaseTest(TestCase):
+
+    def assertSameOutput(self, data):
+        self.assertEqual(CamelCaseJSONRenderer().render(data), LibraryJSONRenderer().render(data))
+
+    def test_club_detail_is_rendered_byte_for_byte(self):
+        club = make_club(members=3, teams=2, coaches=1)
+        self.assertSameOutput(load_club_detail(club.pk))
+
+    def test_edge_values_are_rendered_byte_for_byte(self):
+        self.assertSameOutput({
+            'snake_case_key': 'line\u2028separator\u2029 "따옴표" \\ \x00 😀',
+            'floats': [0.1, -0.0, 1e16, 1.5e-7, 123456789.125, 3.0],
+            'big_int': 2 ** 70,
+            'created_at': timezone.now(), 'birth_date': date(1990, 1, 2), 'play_time': time(10, 30),
+            'duration': timedelta(hours=1), 'price': Decimal('12.50'), 'uuid': uuid.UUID(int=1),
+            'lazy_value': gettext_lazy('lazy'), gettext_lazy('lazy_key'): (1, 2, [{'nested_key': None}]),
+            1: 'int key', True: 'bool key', 'image_url1': b'ab', 'empty': {},
+        })
+        self.assertSameOutput([{'a_b': 1}, ('c_d',)])
+        self.assertEqual(CamelCaseJSONRenderer().render(None), b'')
+        # NaN 은 STRICT_JSON 설정대로 오류
+        with self.assertRaises(ValueError):
+            CamelCaseJSONRenderer().render({'value': float('nan')})
+
+    def test_indent_is_rendered_byte_for_byte(self):
+        data = {'user_name': '유저', 'team_list': [1, 2]}
+        self.assertEqual(CamelCaseJSONRenderer().render(data, 'application/json; indent=2'),
+                         LibraryJSONRenderer().render(data, 'application/json; indent=2'))
+
+    def test_parser_matches_library(self):
+        for body in ('{"userName": "유저", "imageUrl1": {"teamId": [1, 2.5, null]}, "HTTPStatus": true}',
+                     '{"bigNumber": 123456789012345678901234567890, "nanValue": NaN, "tooBig": 1e400}',
+                     '[{"aB": "\\ud800"}]', '"string"', 'null'):
+            expected = LibraryJSONParser().parse(io.BytesIO(body.encode()))
+            self.assertEqual(repr(CamelCaseJSONParser().parse(io.BytesIO(body.encode()))), repr(expected))
+
+        with self.assertRaisesMessage(ParseError, 'JSON parse error'):
+            CamelCaseJSONParser().parse(io.BytesIO(b'{"userName": '))
+
+    def test_query_string_keys_are_underscoreized(self):
+        query = QueryDict('pageSize=10&clubId=1&clubId=2')
+        self.assertEqual(list(underscoreize(query).lists()), list(library_underscoreize(query).lists()))
+        self.assertEqual(dict(underscoreize(query).lists()), {'page_size': ['10'], 'club_id': ['1', '2']})
+
+
+class EagerLoadingMixinTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_lookups_follow_serializer_declarations(self):
+        class TeamWithClubSerializer(EagerLoadingMixin, serializers.ModelSerializer):
+            club_id = serializers.PrimaryKeyRelatedField(source='club', read_only=True)  # FK 컬럼만 사용
+            club_name = serializers.CharField(source='club.name')
+
+            class Meta:
+                model = Team
+                fields = ('id', 'club_id', 'club_name')
+
+        class ClubWithTeamsSerializer(EagerLoadingMixin, serializers.ModelSerializer):
+            team_set = TeamSerializer(many=True, read_only=True)
+
+            class Meta:
+                model = Club
+                fields = ('id', 'team_set')
+
+        self.assertEqual(TeamWithClubSerializer.eager_loading_lookups(), (('club',), ()))
+        self.assertEqual(ClubWithTeamsSerializer.eager_loading_lookups(), ((), ('team_set', 'team_set__image_url')))
+        self.assertEqual(CoachSerializer.eager_loading_lookups(), (('user', 'user__image_url', 'user__team'), ()))
+        self.assertEqual(UserInfoSerializer.eager_loading_lookups(),
+                         (('image_url', 'club', 'club__image_url', 'team', 'team__image_url'), ()))
+
+    def test_detail_views_run_a_fixed_number_of_queries(self):
+        # 캐시가 비어있을 때: validator + 상세정보 (인원수와 상관없이 같은 쿼리 수)
+        for members in (3, 30):
+            club = make_club(members=members, teams=1, coaches=1)
+            team = Team.objects.get(club=club)
+            member = CustomUser.objects.filter(club=club).last()
+            # 유저 상세: 소속 클럽 / 팀 id 1번 + validator 1번 + 프로필 1번
+            for name, pk, queries in (('team-detail', team.pk, 4), ('user-detail', member.pk, 3)):
+                with self.assertNumQueries(queries):
+                    response = self.client.get(reverse(name, args=[pk]))
+                self.assertEqual(response.status_code, 200)
+
+
+class SeedDataCommandTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def seed(self, **options):
+        call_command('seed_data', clubs=3, teams=2, members=10, coaches=2, competitions=4, chunk_size=7,
+                     stdout=io.StringIO(), **options)
+
+    def test_generates_requested_sizes(self):
+        self.seed()
+        self.assertEqual(Club.objects.count(), 3)
+        self.assertEqual(Team.objects.count(), 6)
+        self.assertEqual(CustomUser.objects.count(), 30)
+        self.assertEqual(Coach.objects.count(), 6)
+        self.assertEqual(Competition.objects.count(), 4)
+        self.assertFalse(CustomUser.objects.filter(tier__isnull=True).exists())
+        self.assertFalse(Coach.objects.exclude(user__club=F('club')).exists())
+
+        club = Club.objects.first()
+        response = self.client.get(reverse('club-detail', args=[club.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['coaches']), 2)
+
+    def test_same_seed_generates_same_data(self):
+        columns = ('username', 'gender', 'birth', 'tier', 'image_url__image_url')
+        self.seed(seed=7)
+        first = list(CustomUser.objects.order_by('id').values_list(*columns))
+        self.seed(seed=7)
+        second = list(CustomUser.objects.order_by('id').values_list(*columns))[len(first):]
+        self.assertEqual(first, second)
+        # 두 번째 실행은 전화번호가 겹치지 않게 이어서 생성
+        self.assertEqual(CustomUser.objects.values('phone').distinct().count(), 60)
+
+
+class CheckBudgetsTest(TestCase):
+
+    def test_reports_query_and_latency_regressions(self):
+        baselines = {'club-detail@10': {'queries': 8, 'p99_ms': 10.0}, 'user-detail@10': {'queries': 3, 'p99_ms': 5.0}}
+        results = {
+            'club-detail@10': {'queries': 9, 'p99_ms': 19.0},  # 쿼리 초과, p99 는 허용 범위 (20ms) 안
+            'user-detail@10': {'queries': 3, 'p99_ms': 10.5},  # p99 초과 (허용 max(10, 5 + 5) = 10ms)
+            'sync@10': {'queries': 50, 'p99_ms': 999.0},  # 기준값 없음
+        }
+        violations = check_budgets(results, baselines, latency_tolerance=1.0)
+        self.assertEqual(len(violations), 2)
+        self.assertTrue(violations[0].startswith('club-detail@10: 쿼리 9개'))
+        self.assertTrue(violations[1].startswith('user-detail@10: p99'))
+        self.assertEqual(check_budgets(baselines, baselines), [])
+        # 빠른 응답은 비율 대신 최소 여유 (5ms) 로 판단
+        self.assertEqual(check_budgets({'user-detail@10': {'queries': 3, 'p99_ms': 9.9}}, baselines), [])
@@ -1,3 +1,23 @@
-from django.shortcuts import render
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from .serializers import SyncQuerySerializer
+from .sync import collect_changes, SyncTokenError
 
-# Create your views here.
+
+class SyncView(APIView):
+    """
+    마지막 동기화 이후 바뀐 클럽 / 팀 / 티어 / 유저 / 이미지 조회 API (앱 실행 시 이용)
+    """
+
+    def get(self, request):
+        serializer = SyncQuerySerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
+        try:
+            # 토큰이 없으면 처음부터, 있으면 토큰 이후 바뀐 행만 (has_more 이면 새 토큰으로 다시 요청)
+            changes = collect_changes(data.get('token'), data.get('page_size'))
+        except SyncTokenError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(changes, status=status.HTTP_200_OK)
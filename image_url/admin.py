@@ -1,4 +1,5 @@
 from django.contrib import admin
-from .models import ImageUrl
+from .models import ImageUrl, ImageVariant
 
 admin.site.register(ImageUrl)
+admin.site.register(ImageVariant)
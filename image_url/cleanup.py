@@ -0,0 +1,27 @@
+from django.db.models import Exists, OuterRef
+from .models import ImageUrl, ImageVariant
+
+
+# 사용하지 않는 이미지 찾기 (manage.py gc_images)
+#
+# ImageUrl 을 참조하는 모든 FK (CustomUser / Club / Team / Competition ...) 에 대해 NOT EXISTS 로 anti-join 해서
+# 아무도 참조하지 않는 행을 한 번의 쿼리로 찾는다. 참조하는 모델은 ImageUrl 의 역방향 관계에서 가져오므로
+# 새로운 모델이 이미지를 참조해도 따로 등록할 필요가 없다. (soft delete 된 행도 참조로 본다)
+
+
+def image_references():
+    """
+    ImageUrl 을 참조하는 관계 목록 (파생본 제외)
+    """
+    return [relation for relation in ImageUrl._meta.related_objects if relation.related_model is not ImageVariant]
+
+
+def orphaned_images(cutoff):
+    """
+    cutoff 이전에 마지막으로 사용(생성 / 재사용)되었고 아무도 참조하지 않는 ImageUrl 쿼리셋
+    """
+    queryset = ImageUrl.objects.filter(updated_at__lt=cutoff)
+    for relation in image_references():
+        referencing = relation.related_model._base_manager.filter(**{relation.field.name: OuterRef('pk')})
+        queryset = queryset.filter(~Exists(referencing))
+    return queryset
@@ -0,0 +1,86 @@
+import os
+from uuid import uuid4
+from PIL import Image, ImageOps
+
+
+# 이미지 파생본(썸네일) 렌더링
+#
+# 프로세스 풀(image_url.uploads)의 워커 프로세스에서 실행되므로 Django 를 import 하지 않는다.
+# 원본 한 장으로 크기(긴 변 기준 px) x 형식(webp / jpeg) 조합의 파생본 파일을 만들고,
+# 파생본의 저장 key 는 원본 key 에서 결정적으로 만들어지므로 (variant_name) URL 을 DB 조회 없이 계산할 수 있다.
+
+VARIANT_FORMATS = {
+    # 형식 이름: (Pillow 형식, 확장자)
+    'webp': ('WEBP', 'webp'),
+    'jpeg': ('JPEG', 'jpg'),
+}
+
+
+def variant_name(name, size, format):
+    """
+    원본 key / URL 에서 파생본 key / URL 을 만든다 (abc.png -> abc_256.webp)
+    """
+    base = name.rsplit('.', 1)[0]
+    return f'{base}_{size}.{VARIANT_FORMATS[format][1]}'
+
+
+def rendered_variant_name(name, rendered, size, format):
+    """
+    실제로 만든 파생본 목록(rendered: [[크기, 형식], ...])에 있으면 파생본 key / URL, 없으면 원본을 그대로 반환
+    (설정이 바뀌어도 만들지 않은 파생본을 가리키지 않도록 현재 설정이 아니라 저장된 목록으로 판단)
+    """
+    if not name or not size or not rendered or [size, format] not in rendered:
+        return name
+    return variant_name(name, size, format)
+
+
+def _for_format(image, format):
+    # jpeg 는 투명도를 지원하지 않으므로 흰 배경에 합성
+    has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+    if format == 'jpeg':
+        if has_alpha:
+            image = image.convert('RGBA')
+            background = Image.new('RGB', image.size, 'white')
+            background.paste(image, mask=image.getchannel('A'))
+            return background
+        return image if image.mode in ('RGB', 'L') else image.convert('RGB')
+    if has_alpha:
+        return image if image.mode == 'RGBA' else image.convert('RGBA')
+    return image if image.mode == 'RGB' else image.convert('RGB')
+
+
+def render_variants(source_path, output_dir, sizes, formats, quality=80):
+    """
+    source_path 이미지의 파생본을 output_dir 에 저장하고 결과 목록을 반환
+    [{'size', 'format', 'path', 'width', 'height', 'file_size'}, ...]
+    원본보다 큰 크기로 확대하지 않는다.
+    """
+    results = []
+    with Image.open(source_path) as original:
+        # jpeg 는 필요한 크기 근처까지 축소된 상태로 디코딩 (큰 사진에서 디코딩 시간 / 메모리 절약)
+        original.draft('RGB', (max(sizes), max(sizes)))
+        image = ImageOps.exif_transpose(original)
+        image.load()
+
+    # 큰 크기부터 만들고, 작은 크기는 직전 결과에서 다시 줄인다
+    for size in sorted(sizes, reverse=True):
+        image.thumbnail((size, size), Image.LANCZOS)
+        for format in formats:
+            pillow_format, extension = VARIANT_FORMATS[format]
+            output = _for_format(image, format)
+            path = os.path.join(output_dir, f'{uuid4().hex}_{size}.{extension}')
+            options = {'quality': quality}
+            if format == 'jpeg':
+                options.update(optimize=True, progressive=True)
+            else:
+                options.update(method=4)
+            output.save(path, format=pillow_format, **options)
+            results.append({
+                'size': size,
+                'format': format,
+                'path': path,
+                'width': output.width,
+                'height': output.height,
+                'file_size': os.path.getsize(path),
+            })
+    return results
@@ -0,0 +1,41 @@
+import io
+import os
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from core.benchmark import benchmark_database, run_timed, format_result
+from image_url.tests.s3_stub import S3Stub
+from image_url.utils import S3ImageUploader, create_s3_client, get_transfer_config
+
+
+class PerUploadClientUploader(S3ImageUploader):
+    # 비교용: 예전 방식 (업로드마다 boto3 클라이언트를 새로 생성)
+    def __init__(self, bucket_name=None):
+        super().__init__(bucket_name)
+        self.s3 = create_s3_client()
+
+
+class Command(BaseCommand):
+    help = 'S3 클라이언트 벤치마크 (로컬 S3 대역 서버 사용): 업로드 1건당 클라이언트 생성 비용을 비교'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200)
+        parser.add_argument('--size', type=int, default=64 * 1024, help='업로드할 파일 크기 (bytes)')
+
+    def handle(self, *args, **options):
+        payload = os.urandom(options['size'])
+        with benchmark_database(), S3Stub() as stub, override_settings(
+                AWS_S3_ENDPOINT_URL=stub.endpoint_url, AWS_STORAGE_BUCKET_NAME='bench',
+                AWS_S3_REGION_NAME='us-east-1', AWS_ACCESS_KEY_ID='bench', AWS_SECRET_ACCESS_KEY='bench'):
+            self.stdout.write(f'업로드 ({options["size"]} bytes, S3 대역 서버 {stub.endpoint_url})')
+            results = {}
+            for name, uploader_class in (('업로드마다 클라이언트 생성 (기존)', PerUploadClientUploader),
+                                         ('공용 클라이언트', S3ImageUploader)):
+                def upload():
+                    uploader_class(bucket_name='bench').upload_fileobj(io.BytesIO(payload), 'bench.bin')
+
+                results[name] = run_timed(upload, options['iterations'])
+                self.stdout.write(format_result(name, results[name]))
+
+            # 클라이언트 생성만 따로 측정 (업로드 1건당 추가 비용)
+            self.stdout.write(format_result('클라이언트 생성만', run_timed(create_s3_client, options['iterations'])))
+            self.stdout.write(format_result('TransferConfig 생성만', run_timed(get_transfer_config, options['iterations'])))
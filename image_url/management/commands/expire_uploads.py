@@ -0,0 +1,47 @@
+import os
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from image_url.models import ImageUrl
+
+
+class Command(BaseCommand):
+    help = ('처리되지 못한 업로드 정리 (배포 / 워커 재시작 후, 또는 주기적으로 실행): '
+            '오래된 pending 행은 failed 로 바꾸고 (같은 파일이 다시 업로드되면 그 행으로 재업로드), '
+            '업로드가 가져가지 않은 오래된 스풀 파일은 삭제')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--minutes', type=float, default=30,
+                            help='이 시간보다 오래 pending 인 행 / 수정되지 않은 스풀 파일을 정리')
+        parser.add_argument('--dry-run', action='store_true', help='변경하지 않고 대상 개수만 출력')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(minutes=options['minutes'])
+        # 재업로드가 시작되면 updated_at 이 갱신되므로 (enqueue_upload) 진행 중인 재시도는 건너뛴다
+        stale = ImageUrl.objects.filter(status=ImageUrl.STATUS_PENDING, updated_at__lt=cutoff)
+        paths = self.stale_spool_files(time.time() - options['minutes'] * 60)
+
+        if options['dry_run']:
+            self.stdout.write(f'pending 이미지 {stale.count()}개, 스풀 파일 {len(paths)}개 정리 대상')
+            return
+
+        expired = stale.update(status=ImageUrl.STATUS_FAILED, updated_at=timezone.now())
+        removed = 0
+        for path in paths:
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                # 그 사이 업로드 워커가 처리하고 지운 파일
+                pass
+        self.stdout.write(f'pending 이미지 {expired}개 failed 처리, 스풀 파일 {removed}개 삭제')
+
+    def stale_spool_files(self, cutoff):
+        # 파생본 렌더링용 임시 디렉토리는 건너뛰고 파일만 확인
+        spool_dir = str(settings.IMAGE_UPLOAD_SPOOL_DIR)
+        if not os.path.isdir(spool_dir):
+            return []
+        return [entry.path for entry in os.scandir(spool_dir)
+                if entry.is_file() and entry.stat().st_mtime < cutoff]
@@ -0,0 +1,130 @@
+import json
+import os
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from image_url.cleanup import orphaned_images
+from image_url.models import ImageUrl, ImageVariant
+from image_url.storage import get_storage
+
+
+class Command(BaseCommand):
+    help = ('아무도 참조하지 않는 ImageUrl 행과 저장소 객체를 작은 배치로 나눠서 삭제 '
+            '(서비스 중 실행 가능, --checkpoint 로 중단된 지점부터 이어서 실행)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--grace-hours', type=float, default=24,
+                            help='이 시간 안에 생성 / 재사용된 이미지는 건너뜀 (업로드 직후 아직 연결되지 않은 이미지 보호)')
+        parser.add_argument('--sleep', type=float, default=0.05, help='배치 사이 대기 시간(초)')
+        parser.add_argument('--checkpoint', help='진행 상황을 저장할 파일 (다시 실행하면 이어서 진행, 끝나면 삭제)')
+        parser.add_argument('--dry-run', action='store_true', help='삭제하지 않고 대상 개수만 출력')
+
+    def handle(self, *args, **options):
+        self.storage = get_storage()
+        self.checkpoint = options['checkpoint']
+        cutoff = timezone.now() - timedelta(hours=options['grace_hours'])
+        state = self.load_state()
+        deleted_rows = deleted_objects = 0
+        failed = []
+
+        # 지난 실행에서 행은 지웠지만 저장소 객체를 지우지 못하고 중단된 경우
+        if state['pending_keys']:
+            deleted_objects, failed = self.delete_objects(state['pending_keys'], failed)
+            state['pending_keys'] = []
+            self.save_state(state)
+
+        while True:
+            ids = list(orphaned_images(cutoff)
+                       .filter(id__gt=state['last_id'])
+                       .order_by('id')
+                       .values_list('id', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+
+            if options['dry_run']:
+                deleted_rows += len(ids)
+                state['last_id'] = ids[-1]
+                continue
+
+            images = self.delete_rows(ids, cutoff)
+            deleted_rows += len(images)
+
+            # 행 삭제가 커밋된 뒤 저장소 객체를 지운다 (지우기 전에 중단되면 다음 실행에서 이어서 삭제)
+            state = {'last_id': ids[-1], 'pending_keys': self.storage_keys(images)}
+            self.save_state(state)
+            count, failed = self.delete_objects(state['pending_keys'], failed)
+            deleted_objects += count
+            state['pending_keys'] = []
+            self.save_state(state)
+
+            if options['sleep']:
+                time.sleep(options['sleep'])
+
+        if options['dry_run']:
+            self.stdout.write(f'삭제 대상 이미지 {deleted_rows}개')
+            return
+
+        if self.checkpoint and os.path.exists(self.checkpoint):
+            os.remove(self.checkpoint)
+        self.stdout.write(f'이미지 {deleted_rows}개, 저장소 객체 {deleted_objects}개 삭제')
+        if failed:
+            self.stderr.write(f'저장소 객체 {len(failed)}개 삭제 실패: {", ".join(failed[:20])}')
+
+    def delete_rows(self, ids, cutoff):
+        """
+        후보 id 중 지금도 참조되지 않는 행만 잠그고 삭제 - 삭제한 행의 (content_hash, URL 목록) 을 반환
+        """
+        with transaction.atomic():
+            # 조회 이후 다른 요청에서 연결되었거나 재사용된(updated_at 갱신) 이미지는 여기서 걸러진다
+            rows = list(orphaned_images(cutoff)
+                        .filter(id__in=ids)
+                        .select_for_update()
+                        .values_list('id', 'content_hash', 'image_url'))
+            if not rows:
+                return []
+            row_ids = [pk for pk, _, _ in rows]
+
+            urls = {pk: [url] for pk, _, url in rows}
+            for image_id, url in ImageVariant.objects.filter(image_id__in=row_ids).values_list('image_id', 'image_url'):
+                urls[image_id].append(url)
+
+            # 아무도 참조하지 않는 이미지이므로 무효화할 캐시가 없다 - 행마다 시그널을 보내지 않고 바로 삭제
+            variants = ImageVariant.objects.filter(image_id__in=row_ids)
+            variants._raw_delete(variants.db)
+            images = ImageUrl.objects.filter(id__in=row_ids)
+            images._raw_delete(images.db)
+
+        return [(content_hash, urls[pk]) for pk, content_hash, _ in rows]
+
+    def storage_keys(self, images):
+        # 삭제하는 사이 같은 내용이 다시 업로드되어 새 행이 생겼다면 (같은 key) 객체를 남겨둔다
+        hashes = [content_hash for content_hash, _ in images if content_hash]
+        reborn = set(ImageUrl.objects.filter(content_hash__in=hashes).values_list('content_hash', flat=True))
+        keys = []
+        for content_hash, urls in images:
+            if content_hash in reborn:
+                continue
+            keys += [key for key in map(self.storage.key, urls) if key]
+        return keys
+
+    def delete_objects(self, keys, failed):
+        errors = self.storage.delete_many(keys)
+        return len(keys) - len(errors), failed + errors
+
+    def load_state(self):
+        if self.checkpoint and os.path.exists(self.checkpoint):
+            with open(self.checkpoint) as f:
+                return json.load(f)
+        return {'last_id': 0, 'pending_keys': []}
+
+    def save_state(self, state):
+        if not self.checkpoint:
+            return
+        # 중간에 중단되어도 파일이 깨지지 않도록 임시 파일에 쓰고 교체
+        temp_path = f'{self.checkpoint}.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(temp_path, self.checkpoint)
@@ -0,0 +1,41 @@
+# Generated by Django 5.0.14 on 2026-10-18 19:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('image_url', '0014_imageurl_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='imageurl',
+            name='has_variants',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.CreateModel(
+            name='ImageVariant',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('size', models.PositiveIntegerField()),
+                ('format', models.CharField(choices=[('webp', 'webp'), ('jpeg', 'jpeg')], max_length=10)),
+                ('image_url', models.CharField(max_length=1024)),
+                ('width', models.PositiveIntegerField()),
+                ('height', models.PositiveIntegerField()),
+                ('file_size', models.PositiveIntegerField()),
+                ('image', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='variants', to='image_url.imageurl')),
+            ],
+            options={
+                'db_table': 'image_variant',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='imagevariant',
+            constraint=models.UniqueConstraint(fields=('image', 'size', 'format'), name='image_variant_unique'),
+        ),
+    ]
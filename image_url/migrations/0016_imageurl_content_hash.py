@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-18 19:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('image_url', '0015_imagevariant'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='imageurl',
+            name='content_hash',
+            field=models.CharField(blank=True, max_length=64, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.14 on 2026-10-18 19:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('image_url', '0016_imageurl_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='imageurl',
+            index=models.Index(fields=['updated_at', 'id'], name='image_url_updated_at_id_idx'),
+        ),
+    ]
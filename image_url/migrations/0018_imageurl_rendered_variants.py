@@ -0,0 +1,28 @@
+from django.db import migrations, models
+
+
+def fill_rendered_variants(apps, schema_editor):
+    # 이미 만든 파생본은 ImageVariant 행에서 채운다
+    ImageUrl = apps.get_model('image_url', 'ImageUrl')
+    ImageVariant = apps.get_model('image_url', 'ImageVariant')
+    rendered = {}
+    for image_id, size, format in ImageVariant.objects.order_by('image_id', 'size', 'format').values_list('image_id', 'size', 'format').iterator():
+        rendered.setdefault(image_id, []).append([size, format])
+    for image_id, variants in rendered.items():
+        ImageUrl.objects.filter(pk=image_id).update(rendered_variants=variants)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('image_url', '0017_imageurl_image_url_updated_at_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='imageurl',
+            name='rendered_variants',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.RunPython(fill_rendered_variants, migrations.RunPython.noop),
+    ]
@@ -1,16 +1,65 @@
 from django.db import models
 from core.models import TimeStampedModel
+from .imaging import VARIANT_FORMATS, rendered_variant_name
 
 
 class ImageUrl(TimeStampedModel):
+    # 업로드 상태 (업로드는 요청 스레드 밖에서 처리되므로 처음에는 pending 으로 생성됨)
+    STATUS_PENDING = 'pending'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = (
+        (STATUS_PENDING, '업로드 중'),
+        (STATUS_DONE, '업로드 완료'),
+        (STATUS_FAILED, '업로드 실패'),
+    )
+
     id = models.AutoField(primary_key=True)
     image_url = models.CharField(max_length=1024, blank=True, null=True)
     extension = models.CharField(max_length=10, blank=True, null=True)
     size = models.IntegerField(null=True, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_DONE)
+    has_variants = models.BooleanField(default=False) # 파생본(썸네일) 생성 완료 여부
+    rendered_variants = models.JSONField(default=list, blank=True) # 실제로 만든 파생본 [[크기, 형식], ...] (ImageVariant 행과 같은 내용)
+    content_hash = models.CharField(max_length=64, unique=True, null=True, blank=True) # 파일 내용의 sha256 (같은 파일은 한 행 / 한 객체로 재사용)
     
 
     class Meta:
         db_table = 'image_url'
+        indexes = [
+            # 변경분 동기화 키셋 스캔용 (core.sync)
+            models.Index(fields=['updated_at', 'id'], name='image_url_updated_at_id_idx'),
+        ]
 
     def __str__(self):
         return f"{self.id} - {self.image_url if self.image_url else 'No Image'}"
+
+    def variant_url(self, size, format='webp'):
+        """
+        파생본 URL (해당 크기 / 형식의 파생본을 만들지 않았으면 원본 URL)
+        파생본 key 는 원본 key 에서 결정되고 만든 목록은 rendered_variants 에 있으므로 DB 조회 없음
+        """
+        return rendered_variant_name(self.image_url, self.rendered_variants, size, format)
+
+
+class ImageVariant(TimeStampedModel):
+    # 원본 이미지의 크기 / 형식별 파생본 (image_url.uploads 에서 생성)
+    FORMAT_CHOICES = tuple((format, format) for format in VARIANT_FORMATS)
+
+    id = models.AutoField(primary_key=True)
+    image = models.ForeignKey(ImageUrl, on_delete=models.CASCADE, related_name='variants')
+    size = models.PositiveIntegerField() # 긴 변 기준 px
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES)
+    image_url = models.CharField(max_length=1024)
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    file_size = models.PositiveIntegerField() # bytes
+
+    class Meta:
+        db_table = 'image_variant'
+        constraints = [
+            models.UniqueConstraint(fields=['image', 'size', 'format'], name='image_variant_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.image_id} - {self.size}px {self.format}"
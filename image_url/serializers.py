@@ -1,12 +1,43 @@
+from django.conf import settings
 from rest_framework import serializers
 from .models import ImageUrl
 
 
+def variant_sizes():
+    """
+    화면별로 사용하는 파생본 크기 (avatar, card, detail) - settings.IMAGE_VARIANT_SIZES 에서 작은 것 / 가운데 / 큰 것
+    (만들지 않는 크기의 URL 을 내려주지 않도록 설정에서 가져온다, 설정이 비어 있으면 None 으로 원본 사용)
+    """
+    sizes = sorted(settings.IMAGE_VARIANT_SIZES)
+    if not sizes:
+        return None, None, None
+    return sizes[0], sizes[len(sizes) // 2], sizes[-1]
+
+
+# 기본 설정 (64, 256, 1024) 기준
+# VARIANT_AVATAR: 멤버 목록의 프로필 사진 / VARIANT_CARD: 목록 카드, 프로필 화면 / VARIANT_DETAIL: 클럽, 팀 상세 대표 이미지
+VARIANT_AVATAR, VARIANT_CARD, VARIANT_DETAIL = variant_sizes()
+
+
 class ImageUrlSerializer(serializers.ModelSerializer):
-    
+    """
+    variant 를 지정하면 파생본이 있는 이미지는 해당 크기의 파생본 URL 을 image_url 로 내려준다
+    """
+
+    def __init__(self, *args, variant=None, variant_format='webp', **kwargs):
+        self.variant = variant
+        self.variant_format = variant_format
+        super().__init__(*args, **kwargs)
+
     class Meta:
         model = ImageUrl
         fields = ['image_url']
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if self.variant:
+            data['image_url'] = instance.variant_url(self.variant, self.variant_format)
+        return data
         
         
 
@@ -16,11 +47,35 @@ class ImageUrlSerializer(serializers.ModelSerializer):
 class ImageUploadSerializer(serializers.ModelSerializer):
     class Meta:
         model = ImageUrl
-        fields = ['image_url', 'extension', 'size']
+        fields = ['id', 'image_url', 'extension', 'size', 'status']
+        read_only_fields = ['id', 'status']
 
     def update(self, instance, validated_data):
         instance.image_url = validated_data.get('image_url', instance.image_url)
         instance.extension = validated_data.get('extension', instance.extension)
         instance.size = validated_data.get('size', instance.size)
         instance.save()
-        return instance
\ No newline at end of file
+        return instance
+
+
+
+class ImagePresignSerializer(serializers.Serializer):
+    file_name = serializers.CharField(max_length=255)
+    content_type = serializers.RegexField(r'^image/[\w.+-]+$', max_length=100)
+    size = serializers.IntegerField(min_value=1)  # bytes (업로드할 파일과 정확히 같아야 함)
+    content_hash = serializers.RegexField(r'^[0-9a-f]{64}$', required=False)  # 파일 내용의 sha256 (hex, 선택)
+
+    def validate_size(self, value):
+        if value > settings.IMAGE_DIRECT_UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError('파일 크기가 너무 큽니다.')
+        return value
+
+    def validate_file_name(self, value):
+        if '.' not in value:
+            raise serializers.ValidationError('확장자가 필요합니다.')
+        return value
+
+
+
+class ImageConfirmSerializer(serializers.Serializer):
+    token = serializers.CharField()
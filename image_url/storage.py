@@ -0,0 +1,142 @@
+import base64
+import os
+import shutil
+from functools import lru_cache
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from botocore.exceptions import ClientError
+from django.utils.module_loading import import_string
+from .utils import S3ImageUploader
+
+
+# 이미지 저장소
+# 업로드 파이프라인(image_url.uploads)은 settings.IMAGE_STORAGE_BACKEND 에 지정된 저장소로 파일을 올린다.
+# 서버 환경에서는 S3Storage, 테스트 / 로컬 개발에서는 LocalDirectoryStorage 를 사용한다.
+# 클라이언트가 저장소로 바로 올리는 방식(presigned URL)은 S3Storage 에서만 지원한다.
+
+
+class S3Storage:
+    """
+    S3 버킷 저장소
+    """
+
+    supports_direct_upload = True  # presign_upload 로 클라이언트가 바로 올릴 수 있는지
+
+    def __init__(self):
+        self.uploader = S3ImageUploader()
+
+    def save(self, path, key):
+        """
+        로컬 파일(path)을 key 이름으로 업로드하고 URL 을 반환
+        """
+        with open(path, 'rb') as f:
+            return self.uploader.upload_fileobj(f, key)
+
+    def url(self, key):
+        return self.uploader.file_url(key)
+
+    def key(self, url):
+        """
+        이 저장소의 URL 이면 key, 아니면 None
+        """
+        prefix = self.url('')
+        return url[len(prefix):] if url and url.startswith(prefix) and len(url) > len(prefix) else None
+
+    def delete_many(self, keys):
+        """
+        여러 객체를 DeleteObjects 요청(최대 1000개씩)으로 삭제하고, 삭제하지 못한 key 목록을 반환
+        """
+        failed = []
+        for start in range(0, len(keys), 1000):
+            batch = keys[start:start + 1000]
+            response = self.uploader.s3.delete_objects(
+                Bucket=self.uploader.bucket_name,
+                Delete={'Objects': [{'Key': key} for key in batch], 'Quiet': True})
+            failed += [error['Key'] for error in response.get('Errors', [])]
+        return failed
+
+    def stat(self, key):
+        """
+        저장된 객체의 크기(bytes), 없으면 None
+        """
+        try:
+            return self.uploader.s3.head_object(Bucket=self.uploader.bucket_name, Key=key)['ContentLength']
+        except ClientError as e:
+            if e.response['ResponseMetadata']['HTTPStatusCode'] == 404:
+                return None
+            raise
+
+    def presign_upload(self, key, content_type, content_length, content_sha256=None, expires_in=600):
+        """
+        클라이언트가 key 로 바로 업로드할 수 있는 presigned PUT 요청 정보
+        Content-Length 가 서명에 포함되므로 선언한 크기와 다른 파일은 S3 가 거부하고,
+        content_sha256(hex) 를 주면 업로드 내용이 해시와 같은지도 검증한다
+        """
+        params = {'Bucket': self.uploader.bucket_name, 'Key': key, 'ContentType': content_type,
+                  'ContentLength': content_length}
+        headers = {'Content-Type': content_type}
+        if content_sha256:
+            checksum = base64.b64encode(bytes.fromhex(content_sha256)).decode()
+            params['ChecksumSHA256'] = checksum
+            headers['x-amz-checksum-sha256'] = checksum
+        url = self.uploader.s3.generate_presigned_url('put_object', Params=params, ExpiresIn=expires_in,
+                                                      HttpMethod='PUT')
+        return {'url': url, 'method': 'PUT', 'headers': headers}
+
+
+class LocalDirectoryStorage:
+    """
+    로컬 디렉토리 저장소 (S3 대신 사용)
+    """
+
+    supports_direct_upload = False
+
+    def __init__(self, location=None, base_url=None):
+        self.location = str(location or settings.IMAGE_LOCAL_STORAGE_DIR)
+        self.base_url = base_url or settings.IMAGE_LOCAL_STORAGE_URL
+
+    def path(self, key):
+        return os.path.join(self.location, key)
+
+    def save(self, path, key):
+        os.makedirs(self.location, exist_ok=True)
+        shutil.copyfile(path, self.path(key))
+        return self.url(key)
+
+    def url(self, key):
+        return f'{self.base_url}{key}'
+
+    def key(self, url):
+        if url and url.startswith(self.base_url) and len(url) > len(self.base_url):
+            return url[len(self.base_url):]
+        return None
+
+    def delete_many(self, keys):
+        for key in keys:
+            try:
+                os.remove(self.path(key))
+            except FileNotFoundError:
+                pass
+        return []
+
+    def stat(self, key):
+        try:
+            return os.path.getsize(self.path(key))
+        except FileNotFoundError:
+            return None
+
+
+@lru_cache(maxsize=None)
+def get_storage():
+    """
+    settings.IMAGE_STORAGE_BACKEND 저장소 인스턴스 (프로세스당 하나)
+    """
+    return import_string(settings.IMAGE_STORAGE_BACKEND)()
+
+
+@receiver(setting_changed)
+def reset_storage(setting, **kwargs):
+    # 테스트에서 override_settings 로 저장소 설정을 바꾸면 인스턴스를 새로 만든다
+    if setting.startswith('IMAGE_') or setting.startswith('AWS_'):
+        get_storage.cache_clear()
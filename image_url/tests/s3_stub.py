@@ -0,0 +1,217 @@
+import base64
+import hashlib
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+from xml.etree import ElementTree
+
+
+# 로컬 S3 대역 서버 (테스트 / 벤치마크용, 서비스 코드에서는 import 하지 않는다)
+#
+# 실제 S3 대신 boto3 클라이언트가 붙을 수 있도록 path 방식 주소(/버킷/키)의 최소 API 만 구현한다.
+#   - PutObject / GetObject / HeadObject / DeleteObject / DeleteObjects
+#   - 멀티파트 업로드 (CreateMultipartUpload / UploadPart / CompleteMultipartUpload / AbortMultipartUpload)
+#   - presigned URL 로 보내는 PUT 과 x-amz-checksum-sha256 검증
+# 서명은 검증하지 않는다. 사용 예:
+#
+#     with S3Stub() as stub:
+#         with override_settings(AWS_S3_ENDPOINT_URL=stub.endpoint_url, AWS_STORAGE_BUCKET_NAME='bucket'):
+#             ...
+
+S3_XMLNS = 'http://s3.amazonaws.com/doc/2006-03-01/'
+
+
+class S3StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def stub(self):
+        return self.server.stub
+
+    def parse_path(self):
+        parts = urlsplit(self.path)
+        bucket, _, key = parts.path.lstrip('/').partition('/')
+        return unquote(bucket), unquote(key), parse_qs(parts.query, keep_blank_values=True)
+
+    def read_body(self):
+        if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            body = self.read_http_chunks()
+        else:
+            body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        if 'aws-chunked' in self.headers.get('Content-Encoding', ''):
+            body = decode_aws_chunked(body)
+        return body
+
+    def read_http_chunks(self):
+        body = bytearray()
+        while True:
+            size = int(self.rfile.readline().split(b';')[0].strip(), 16)
+            if size == 0:
+                # 트레일러가 끝날 때까지 읽는다
+                while self.rfile.readline() not in (b'\r\n', b'\n', b''):
+                    pass
+                return bytes(body)
+            body += self.rfile.read(size)
+            self.rfile.readline()
+
+    def send(self, status, body=b'', headers=None, send_body=True):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if send_body and body:
+            self.wfile.write(body)
+
+    def send_xml(self, status, root):
+        self.send(status, ElementTree.tostring(root, xml_declaration=True, encoding='utf-8'),
+                  {'Content-Type': 'application/xml'})
+
+    def send_error_xml(self, status, code, send_body=True):
+        root = ElementTree.Element('Error')
+        ElementTree.SubElement(root, 'Code').text = code
+        ElementTree.SubElement(root, 'Message').text = code
+        body = ElementTree.tostring(root, xml_declaration=True, encoding='utf-8')
+        self.send(status, body, {'Content-Type': 'application/xml'}, send_body=send_body)
+
+    def do_PUT(self):
+        bucket, key, query = self.parse_path()
+        body = self.read_body()
+        self.stub.record('PUT', bucket, key)
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        if 'uploadId' in query:
+            upload = self.stub.uploads.get(query['uploadId'][0])
+            if upload is None:
+                return self.send_error_xml(404, 'NoSuchUpload')
+            upload['parts'][int(query['partNumber'][0])] = body
+        elif key:
+            checksum = self.headers.get('x-amz-checksum-sha256') or query.get('x-amz-checksum-sha256', [None])[0]
+            if checksum and checksum != base64.b64encode(hashlib.sha256(body).digest()).decode():
+                return self.send_error_xml(400, 'BadDigest')
+            self.stub.put_object(bucket, key, body, self.headers.get('Content-Type', 'binary/octet-stream'))
+        self.send(200, headers={'ETag': etag})
+
+    def do_POST(self):
+        bucket, key, query = self.parse_path()
+        body = self.read_body()
+        self.stub.record('POST', bucket, key)
+        if 'uploads' in query:
+            upload_id = uuid.uuid4().hex
+            self.stub.uploads[upload_id] = {'bucket': bucket, 'key': key, 'parts': {},
+                                            'content_type': self.headers.get('Content-Type', 'binary/octet-stream')}
+            root = ElementTree.Element('InitiateMultipartUploadResult', xmlns=S3_XMLNS)
+            ElementTree.SubElement(root, 'Bucket').text = bucket
+            ElementTree.SubElement(root, 'Key').text = key
+            ElementTree.SubElement(root, 'UploadId').text = upload_id
+            return self.send_xml(200, root)
+        if 'uploadId' in query:
+            upload = self.stub.uploads.pop(query['uploadId'][0], None)
+            if upload is None:
+                return self.send_error_xml(404, 'NoSuchUpload')
+            data = b''.join(upload['parts'][number] for number in sorted(upload['parts']))
+            self.stub.put_object(bucket, key, data, upload['content_type'])
+            root = ElementTree.Element('CompleteMultipartUploadResult', xmlns=S3_XMLNS)
+            ElementTree.SubElement(root, 'Bucket').text = bucket
+            ElementTree.SubElement(root, 'Key').text = key
+            ElementTree.SubElement(root, 'ETag').text = f'"{hashlib.md5(data).hexdigest()}-{len(upload["parts"])}"'
+            return self.send_xml(200, root)
+        if 'delete' in query:
+            root = ElementTree.Element('DeleteResult', xmlns=S3_XMLNS)
+            for element in ElementTree.fromstring(body).iter():
+                if element.tag.rsplit('}', 1)[-1] == 'Key':
+                    self.stub.objects.pop((bucket, element.text), None)
+                    deleted = ElementTree.SubElement(root, 'Deleted')
+                    ElementTree.SubElement(deleted, 'Key').text = element.text
+            return self.send_xml(200, root)
+        self.send_error_xml(400, 'InvalidRequest')
+
+    def do_GET(self, send_body=True):
+        bucket, key, _ = self.parse_path()
+        self.stub.record('HEAD' if not send_body else 'GET', bucket, key)
+        obj = self.stub.objects.get((bucket, key))
+        if obj is None:
+            return self.send_error_xml(404, 'NoSuchKey', send_body=send_body)
+        headers = {'Content-Type': obj['content_type'], 'ETag': obj['etag']}
+        self.send_response(200)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(obj['body'])))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(obj['body'])
+
+    def do_HEAD(self):
+        self.do_GET(send_body=False)
+
+    def do_DELETE(self):
+        bucket, key, query = self.parse_path()
+        self.stub.record('DELETE', bucket, key)
+        if 'uploadId' in query:
+            self.stub.uploads.pop(query['uploadId'][0], None)
+        else:
+            self.stub.objects.pop((bucket, key), None)
+        self.send(204)
+
+
+def decode_aws_chunked(body):
+    """
+    aws-chunked 인코딩 본문(크기;서명\\r\\n데이터\\r\\n ... 0\\r\\n트레일러)을 원래 데이터로 복원
+    """
+    data = bytearray()
+    position = 0
+    while True:
+        line_end = body.index(b'\r\n', position)
+        size = int(body[position:line_end].split(b';')[0], 16)
+        position = line_end + 2
+        if size == 0:
+            return bytes(data)
+        data += body[position:position + size]
+        position += size + 2
+
+
+class S3Stub:
+    """
+    백그라운드 스레드에서 실행되는 로컬 S3 대역 서버
+    """
+
+    def __init__(self, host='127.0.0.1', port=0):
+        self.objects = {}
+        self.uploads = {}
+        self.requests = []
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), S3StubHandler)
+        self.server.daemon_threads = True
+        self.server.stub = self
+        self.thread = None
+
+    @property
+    def endpoint_url(self):
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def record(self, method, bucket, key):
+        with self._lock:
+            self.requests.append((method, bucket, key))
+
+    def put_object(self, bucket, key, body, content_type):
+        self.objects[(bucket, key)] = {'body': body, 'content_type': content_type,
+                                       'etag': f'"{hashlib.md5(body).hexdigest()}"'}
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
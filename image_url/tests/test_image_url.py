@@ -0,0 +1,750 @@
+import gc
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+import urllib.error
+import urllib.request
+from datetime import timedelta
+from io import BytesIO, StringIO
+from unittest import mock
+from PIL import Image
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.client import ClientHandler
+from django.urls import reverse
+from django.utils import timezone
+from ..cleanup import orphaned_images
+from ..management.commands.gc_images import Command
+from ..models import ImageUrl, ImageVariant
+from .s3_stub import S3Stub
+from ..serializers import ImageUrlSerializer, variant_sizes
+from ..storage import LocalDirectoryStorage, get_storage
+from ..upload_handlers import StreamedUploadedFile, SpooledUploadedFile, StreamingUploadMixin
+from ..uploads import enqueue_upload, wait_for_uploads
+from ..utils import S3ImageUploader, get_s3_client
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from club.models import Club
+from competition.models import Competition
+from team.models import Team
+from users.models import CustomUser
+from users.serializers import CustomTokenObtainPairSerializer
+
+
+def make_image(name='profile.png', size=4096):
+    # 실제 PNG 뒤에 패딩을 붙여서 원하는 크기로 맞춘다 (ImageField 검증 통과)
+    buffer = BytesIO()
+    Image.new('RGB', (8, 8), 'white').save(buffer, format='PNG')
+    content = buffer.getvalue()
+    return SimpleUploadedFile(name, content + b'\0' * (size - len(content)), content_type='image/png')
+
+
+class LocalStorageMixin:
+    # 업로드 파이프라인을 S3 대신 임시 디렉토리 저장소로 실행
+
+    def setUp(self):
+        super().setUp()
+        self.storage_dir = tempfile.mkdtemp()
+        self.spool_dir = tempfile.mkdtemp()
+        self.settings_override = override_settings(
+            IMAGE_STORAGE_BACKEND='image_url.storage.LocalDirectoryStorage',
+            IMAGE_LOCAL_STORAGE_DIR=self.storage_dir,
+            IMAGE_LOCAL_STORAGE_URL='/media/images/',
+            IMAGE_UPLOAD_SPOOL_DIR=self.spool_dir,
+            IMAGE_UPLOAD_RETRY_DELAY=0,
+            IMAGE_VARIANT_PROCESSES=0,
+        )
+        self.settings_override.enable()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.storage_dir, ignore_errors=True)
+        shutil.rmtree(self.spool_dir, ignore_errors=True)
+        super().tearDown()
+
+
+@override_settings(IMAGE_UPLOAD_EAGER=True)
+class ImageUploadViewTest(LocalStorageMixin, TestCase):
+
+    def upload(self, image):
+        return self.client.post(reverse('image-upload'), {'image_url': image})
+
+    def test_upload_returns_pending_row_and_completes_on_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.upload(make_image(size=4096))
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['status'], ImageUrl.STATUS_PENDING)
+        self.assertIsNone(response.data['image_url'])
+        self.assertEqual(len(callbacks), 1)
+
+        callbacks[0]()
+        image = ImageUrl.objects.get(pk=response.data['id'])
+        self.assertEqual(image.status, ImageUrl.STATUS_DONE)
+        self.assertEqual(image.extension, 'png')
+        self.assertEqual(image.size, 4)
+        key = image.image_url.removeprefix('/media/images/')
+        self.assertTrue(os.path.exists(os.path.join(self.storage_dir, key)))
+        self.assertEqual(os.listdir(self.spool_dir), [])
+
+        response = self.client.get(reverse('image-detail', args=[image.pk]))
+        self.assertEqual(response.data['status'], ImageUrl.STATUS_DONE)
+
+    def test_failed_upload_is_retried_then_marked_failed(self):
+        with mock.patch.object(LocalDirectoryStorage, 'save', side_effect=OSError('down')) as save, \
+                self.assertLogs('image_url.uploads', 'WARNING'):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.upload(make_image())
+
+        self.assertEqual(save.call_count, 4)  # 최초 1번 + 재시도 3번
+        image = ImageUrl.objects.get(pk=response.data['id'])
+        self.assertEqual(image.status, ImageUrl.STATUS_FAILED)
+        self.assertIsNone(image.image_url)
+        self.assertEqual(os.listdir(self.spool_dir), [])
+
+    def test_transient_failure_recovers(self):
+        save = get_storage().save
+        calls = []
+
+        def flaky(path, key):
+            calls.append(key)
+            if len(calls) == 1:
+                raise OSError('timeout')
+            return save(path, key)
+
+        with mock.patch.object(get_storage(), 'save', side_effect=flaky), \
+                self.assertLogs('image_url.uploads', 'WARNING'):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.upload(make_image())
+
+        self.assertEqual(calls[0], calls[1])  # 원본을 같은 key 로 다시 업로드
+        self.assertEqual(ImageUrl.objects.get(pk=response.data['id']).status, ImageUrl.STATUS_DONE)
+
+    def test_missing_file(self):
+        response = self.client.post(reverse('image-upload'), {})
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(IMAGE_UPLOAD_EAGER=True)
+class SignupImageUploadTest(LocalStorageMixin, TestCase):
+
+    def test_signup_links_pending_image(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('signup'), {
+                'phone': '01011112222', 'password': 'test-password-1234', 'username': '테스트',
+                'birth': 1990, 'gender': 'male', 'image_file': make_image(),
+            })
+
+        self.assertEqual(response.status_code, 201)
+        image = CustomUser.objects.get(phone='01011112222').image_url
+        self.assertEqual(image.status, ImageUrl.STATUS_DONE)
+        self.assertTrue(image.image_url.startswith('/media/images/'))
+
+    def test_rolled_back_signup_removes_spool_file(self):
+        save = CustomUser.save
+
+        def fail_after_image(user, *args, **kwargs):
+            if user.image_url_id:
+                raise IntegrityError('image step failed')
+            return save(user, *args, **kwargs)
+
+        with mock.patch.object(CustomUser, 'save', fail_after_image), self.assertRaises(IntegrityError):
+            self.client.post(reverse('signup'), {
+                'phone': '01011112222', 'password': 'test-password-1234', 'username': '테스트',
+                'birth': 1990, 'gender': 'male', 'image_file': make_image(size=2 * 1024 * 1024),
+            })
+
+        self.assertFalse(CustomUser.objects.exists())
+        self.assertFalse(ImageUrl.objects.exists())
+        self.assertEqual(os.listdir(self.spool_dir), [])
+
+
+class ExpireUploadsCommandTest(LocalStorageMixin, TestCase):
+
+    def test_stale_pending_rows_and_spool_files_are_cleaned(self):
+        stale = ImageUrl.objects.create(status=ImageUrl.STATUS_PENDING, content_hash='a' * 64)
+        fresh = ImageUrl.objects.create(status=ImageUrl.STATUS_PENDING, content_hash='b' * 64)
+        ImageUrl.objects.filter(pk=stale.pk).update(updated_at=timezone.now() - timedelta(hours=1))
+
+        old_path, new_path = os.path.join(self.spool_dir, 'old.png'), os.path.join(self.spool_dir, 'new.png')
+        for path in (old_path, new_path):
+            with open(path, 'wb') as f:
+                f.write(b'x')
+        os.utime(old_path, (time.time() - 3600, time.time() - 3600))
+
+        call_command('expire_uploads', minutes=30, stdout=StringIO())
+
+        self.assertEqual(ImageUrl.objects.get(pk=stale.pk).status, ImageUrl.STATUS_FAILED)
+        self.assertEqual(ImageUrl.objects.get(pk=fresh.pk).status, ImageUrl.STATUS_PENDING)
+        self.assertEqual(os.listdir(self.spool_dir), ['new.png'])
+
+
+def make_photo(width, height, mode='RGB', name='photo.png'):
+    buffer = BytesIO()
+    # 반투명 RGBA 는 jpeg 파생본에서 흰 배경으로 합성되어야 함
+    Image.new(mode, (width, height), (255, 0, 0, 128) if mode == 'RGBA' else 'red').save(buffer, format='PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+@override_settings(IMAGE_UPLOAD_EAGER=True)
+class ImageVariantTest(LocalStorageMixin, TestCase):
+
+    def upload(self, file):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('image-upload'), {'image_url': file})
+        return ImageUrl.objects.get(pk=response.data['id'])
+
+    def test_variants_are_stored_next_to_original(self):
+        image = self.upload(make_photo(2000, 1000, mode='RGBA'))
+
+        self.assertTrue(image.has_variants)
+        variants = {(variant.size, variant.format): variant for variant in image.variants.all()}
+        self.assertEqual(set(variants), {(size, format) for size in (64, 256, 1024) for format in ('webp', 'jpeg')})
+        self.assertEqual((variants[1024, 'webp'].width, variants[1024, 'webp'].height), (1024, 512))
+        self.assertEqual((variants[64, 'jpeg'].width, variants[64, 'jpeg'].height), (64, 32))
+
+        # 파생본 URL 은 원본 URL 에서 계산되고, 실제 파일도 같은 key 로 저장됨
+        for (size, format), variant in variants.items():
+            self.assertEqual(variant.image_url, image.variant_url(size, format))
+            with Image.open(os.path.join(self.storage_dir, variant.image_url.removeprefix('/media/images/'))) as stored:
+                self.assertEqual(stored.format, 'WEBP' if format == 'webp' else 'JPEG')
+                self.assertEqual(stored.size, (variant.width, variant.height))
+                self.assertEqual(stored.mode, 'RGBA' if format == 'webp' else 'RGB')
+
+    def test_small_images_are_not_upscaled(self):
+        image = self.upload(make_photo(100, 50))
+        self.assertEqual(image.variants.get(size=1024, format='webp').width, 100)
+
+    def test_serializer_picks_variant_without_queries(self):
+        image = self.upload(make_photo(300, 300))
+        image = ImageUrl.objects.get(pk=image.pk)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(ImageUrlSerializer(image, variant=64).data['image_url'], image.variant_url(64))
+            self.assertEqual(ImageUrlSerializer(image).data['image_url'], image.image_url)
+            self.assertTrue(ImageUrlSerializer(image, variant=256, variant_format='jpeg').data['image_url'].endswith('_256.jpg'))
+
+        # 파생본이 없는 이미지는 원본 URL
+        original = ImageUrl.objects.create(image_url='https://example.com/a.png')
+        self.assertEqual(ImageUrlSerializer(original, variant=64).data['image_url'], 'https://example.com/a.png')
+
+    def test_screen_sizes_come_from_settings(self):
+        self.assertEqual(variant_sizes(), (64, 256, 1024))
+        with override_settings(IMAGE_VARIANT_SIZES=(1200, 80, 320, 160)):
+            self.assertEqual(variant_sizes(), (80, 320, 1200))
+        with override_settings(IMAGE_VARIANT_SIZES=()):
+            self.assertEqual(variant_sizes(), (None, None, None))
+            # 파생본 크기가 없으면 원본 URL
+            image = ImageUrl(image_url='https://example.com/a.png', has_variants=True, rendered_variants=[[64, 'webp']])
+            self.assertEqual(ImageUrlSerializer(image, variant=None).data['image_url'], image.image_url)
+            self.assertEqual(image.variant_url(None), image.image_url)
+
+    def test_urls_follow_rendered_variants_not_current_settings(self):
+        image = self.upload(make_photo(300, 300))
+        self.assertEqual(sorted(image.rendered_variants),
+                         sorted([size, format] for size, format in image.variants.values_list('size', 'format')))
+
+        # 설정이 바뀌어도 이미 만든 파생본은 그대로, 만들지 않은 크기는 원본 URL
+        with override_settings(IMAGE_VARIANT_SIZES=(128, 512)):
+            image = ImageUrl.objects.get(pk=image.pk)
+            self.assertTrue(image.variant_url(256).endswith('_256.webp'))
+            self.assertEqual(image.variant_url(512), image.image_url)
+
+    def test_unreadable_image_keeps_original_only(self):
+        # 형식 검사(매직 바이트)는 통과하지만 Pillow 로 열 수 없는 파일
+        with self.assertLogs('image_url.uploads', 'WARNING'):
+            image = self.upload(SimpleUploadedFile('broken.png', b'\x89PNG\r\n\x1a\n' + b'broken' * 10))
+
+        self.assertEqual(image.status, ImageUrl.STATUS_DONE)
+        self.assertFalse(image.has_variants)
+        self.assertFalse(image.variants.exists())
+
+
+@override_settings(IMAGE_UPLOAD_EAGER=True, IMAGE_VARIANT_SIZES=())
+class ContentDeduplicationTest(LocalStorageMixin, TestCase):
+
+    def upload(self, file):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(reverse('image-upload'), {'image_url': file})
+
+    def test_same_content_reuses_row_and_object(self):
+        first = self.upload(make_image('a.png'))
+        self.assertEqual(first.status_code, 202)
+
+        with mock.patch.object(LocalDirectoryStorage, 'save') as save:
+            second = self.upload(make_image('b.png'))
+        save.assert_not_called()
+
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.data['id'], first.data['id'])
+        self.assertEqual(ImageUrl.objects.count(), 1)
+        self.assertEqual(len(os.listdir(self.storage_dir)), 1)
+        self.assertEqual(os.listdir(self.spool_dir), [])
+
+        image = ImageUrl.objects.get()
+        self.assertEqual(image.content_hash, hashlib.sha256(make_image().read()).hexdigest())
+        self.assertEqual(image.image_url, f'/media/images/{image.content_hash}.png')
+
+    def test_different_content_is_stored_separately(self):
+        self.upload(make_image(size=4096))
+        self.upload(make_image(size=8192))
+        self.assertEqual(ImageUrl.objects.count(), 2)
+        self.assertEqual(len(os.listdir(self.storage_dir)), 2)
+
+    def test_failed_upload_is_retried_on_next_upload(self):
+        with mock.patch.object(LocalDirectoryStorage, 'save', side_effect=OSError('down')), \
+                self.assertLogs('image_url.uploads', 'WARNING'):
+            first = self.upload(make_image())
+        self.assertEqual(ImageUrl.objects.get().status, ImageUrl.STATUS_FAILED)
+
+        second = self.upload(make_image())
+        self.assertEqual(second.data['id'], first.data['id'])
+        self.assertEqual(ImageUrl.objects.get().status, ImageUrl.STATUS_DONE)
+
+    def test_signups_with_same_avatar_share_image(self):
+        for phone in ('01011110001', '01011110002'):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(reverse('signup'), {
+                    'phone': phone, 'password': 'test-password-1234', 'username': '테스트',
+                    'birth': 1990, 'gender': 'male', 'image_file': make_image(),
+                })
+        self.assertEqual(set(CustomUser.objects.values_list('image_url', flat=True)), {ImageUrl.objects.get().pk})
+
+
+class BackgroundUploadTest(LocalStorageMixin, TransactionTestCase):
+
+    def test_upload_finishes_on_worker_pool(self):
+        response = self.client.post(reverse('image-upload'), {'image_url': make_image()})
+        self.assertEqual(response.status_code, 202)
+
+        wait_for_uploads(timeout=10)
+        image = ImageUrl.objects.get(pk=response.data['id'])
+        self.assertEqual(image.status, ImageUrl.STATUS_DONE)
+        self.assertEqual(image.size, 4)
+
+    @override_settings(IMAGE_VARIANT_PROCESSES=1)
+    def test_variants_are_rendered_in_process_pool(self):
+        response = self.client.post(reverse('image-upload'), {'image_url': make_photo(600, 300)})
+
+        wait_for_uploads(timeout=60)
+        image = ImageUrl.objects.get(pk=response.data['id'])
+        self.assertTrue(image.has_variants)
+        self.assertEqual(image.variants.count(), 6)
+
+
+class S3StubMixin(LocalStorageMixin):
+    # 로컬 S3 대역 서버에 S3Storage 로 업로드
+
+    def setUp(self):
+        super().setUp()
+        self.stub = S3Stub().start()
+        self.aws_override = override_settings(
+            AWS_S3_ENDPOINT_URL=self.stub.endpoint_url, AWS_STORAGE_BUCKET_NAME='test-bucket',
+            AWS_S3_REGION_NAME='us-east-1', AWS_ACCESS_KEY_ID='test', AWS_SECRET_ACCESS_KEY='test',
+            IMAGE_STORAGE_BACKEND='image_url.storage.S3Storage', IMAGE_UPLOAD_EAGER=True,
+        )
+        self.aws_override.enable()
+
+    def tearDown(self):
+        self.aws_override.disable()
+        self.stub.stop()
+        super().tearDown()
+
+
+class SharedS3ClientTest(S3StubMixin, TestCase):
+
+    def test_client_is_shared_across_uploaders_and_threads(self):
+        clients = set()
+        threads = [threading.Thread(target=lambda: clients.add(id(S3ImageUploader().s3))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(clients, {id(get_s3_client())})
+
+    def test_upload_pipeline_stores_object_in_s3(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('image-upload'), {'image_url': make_image()})
+
+        image = ImageUrl.objects.get(pk=response.data['id'])
+        self.assertEqual(image.status, ImageUrl.STATUS_DONE)
+        bucket, key = image.image_url.removeprefix(f'{self.stub.endpoint_url}/').split('/')
+        self.assertEqual(bucket, 'test-bucket')
+        self.assertEqual(len(self.stub.objects[(bucket, key)]['body']), 4096)
+
+    @override_settings(AWS_S3_MULTIPART_THRESHOLD=5 * 1024 * 1024, AWS_S3_MULTIPART_CHUNKSIZE=5 * 1024 * 1024)
+    def test_large_file_uses_multipart_upload(self):
+        content = os.urandom(11 * 1024 * 1024)
+        S3ImageUploader().upload_fileobj(BytesIO(content), 'large.bin')
+
+        self.assertEqual(self.stub.objects[('test-bucket', 'large.bin')]['body'], content)
+        self.assertEqual([method for method, _, _ in self.stub.requests], ['POST', 'PUT', 'PUT', 'PUT', 'POST'])
+
+    def test_delete_many_is_split_into_batches_of_1000(self):
+        keys = [f'{i}.png' for i in range(2500)]
+        for key in keys:
+            self.stub.put_object('test-bucket', key, b'x', 'image/png')
+
+        failed = get_storage().delete_many(keys)
+
+        self.assertEqual(failed, [])
+        self.assertEqual(self.stub.objects, {})
+        self.assertEqual([method for method, _, _ in self.stub.requests], ['POST', 'POST', 'POST'])
+
+
+class DirectUploadTest(S3StubMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        user = CustomUser.objects.create_user(phone='01012345678', password='test-password-1234',
+                                              username='업로더', gender='male', birth=1990)
+        access = CustomTokenObtainPairSerializer.get_token(user).access_token
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {access}'
+
+    def presign(self, content, **extra):
+        data = {'fileName': 'photo.png', 'contentType': 'image/png', 'size': len(content), **extra}
+        return self.client.post(reverse('image-presign'), data, content_type='application/json')
+
+    def put(self, upload, content):
+        request = urllib.request.Request(upload['url'], data=content, method=upload['method'], headers=upload['headers'])
+        try:
+            return urllib.request.urlopen(request).status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+    def confirm(self, token):
+        return self.client.post(reverse('image-confirm'), {'token': token}, content_type='application/json')
+
+    def test_client_uploads_directly_and_confirms(self):
+        content = make_image(size=8192).read()
+        response = self.presign(content)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.put(response.data['upload'], content), 200)
+
+        confirmed = self.confirm(response.data['token'])
+        self.assertEqual(confirmed.status_code, 201)
+        image = ImageUrl.objects.get(pk=confirmed.data['id'])
+        self.assertEqual((image.status, image.extension, image.size), (ImageUrl.STATUS_DONE, 'png', 8))
+        key = image.image_url.removeprefix(f'{self.stub.endpoint_url}/test-bucket/')
+        self.assertEqual(self.stub.objects['test-bucket', key]['body'], content)
+        # 서버는 파일 내용을 읽지 않고 HEAD 로 확인만 함
+        self.assertEqual([method for method, _, _ in self.stub.requests], ['PUT', 'HEAD'])
+
+    def test_confirm_requires_uploaded_object_and_valid_token(self):
+        content = make_image().read()
+        token = self.presign(content).data['token']
+
+        self.assertEqual(self.confirm(token).status_code, 400)
+        self.assertEqual(self.confirm(token + 'x').status_code, 400)
+        self.assertFalse(ImageUrl.objects.exists())
+
+    def test_confirm_without_hash_is_idempotent(self):
+        content = make_image().read()
+        response = self.presign(content)
+        self.assertEqual(self.put(response.data['upload'], content), 200)
+
+        first = self.confirm(response.data['token'])
+        second = self.confirm(response.data['token'])
+        self.assertEqual((first.status_code, second.status_code), (201, 201))
+        self.assertEqual(first.data['id'], second.data['id'])
+        self.assertEqual(ImageUrl.objects.count(), 1)
+
+    def test_requires_authentication(self):
+        del self.client.defaults['HTTP_AUTHORIZATION']
+        content = make_image().read()
+        self.assertEqual(self.presign(content).status_code, 401)
+        self.assertEqual(self.confirm('token').status_code, 401)
+        self.assertEqual(self.stub.requests, [])
+
+    def test_content_hash_is_enforced_and_deduplicated(self):
+        content = make_image().read()
+        content_hash = hashlib.sha256(content).hexdigest()
+        response = self.presign(content, contentHash=content_hash)
+
+        # 선언한 해시와 다른 파일은 저장소가 거부
+        self.assertEqual(self.put(response.data['upload'], content[:-1] + b'x'), 400)
+        self.assertEqual(self.put(response.data['upload'], content), 200)
+        image_id = self.confirm(response.data['token']).data['id']
+        self.assertEqual(ImageUrl.objects.get(pk=image_id).content_hash, content_hash)
+
+        again = self.presign(content, contentHash=content_hash)
+        self.assertEqual(again.status_code, 200)
+        self.assertIsNone(again.data['upload'])
+        self.assertEqual(again.data['image']['id'], image_id)
+
+    def test_size_limit(self):
+        response = self.client.post(reverse('image-presign'), {
+            'fileName': 'big.png', 'contentType': 'image/png', 'size': 50 * 1024 * 1024,
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_local_storage_does_not_support_direct_upload(self):
+        with override_settings(IMAGE_STORAGE_BACKEND='image_url.storage.LocalDirectoryStorage'):
+            self.assertEqual(self.presign(b'abc').status_code, 501)
+
+
+BOUNDARY = 'StreamingUploadBoundary'
+
+
+class LazyMultipartBody:
+    """
+    파일 하나를 담은 multipart 본문을 read() 할 때마다 만들어내는 wsgi.input (테스트 쪽 메모리를 쓰지 않음)
+    """
+    block = os.urandom(64 * 1024)
+
+    def __init__(self, field, file_name, header, size):
+        self.prefix = (f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="{field}"; filename="{file_name}"\r\n'
+                       f'Content-Type: application/octet-stream\r\n\r\n').encode() + header
+        self.filler = size - len(header)
+        self.suffix = f'\r\n--{BOUNDARY}--\r\n'.encode()
+        self.length = len(self.prefix) + self.filler + len(self.suffix)
+        self.position = 0
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self.length - self.position
+        output = bytearray()
+        while size > 0 and self.position < self.length:
+            filler_end = len(self.prefix) + self.filler
+            if self.position < len(self.prefix):
+                chunk = self.prefix[self.position:self.position + size]
+            elif self.position < filler_end:
+                offset = (self.position - len(self.prefix)) % len(self.block)
+                chunk = self.block[offset:offset + min(size, filler_end - self.position)]
+            else:
+                start = self.position - filler_end
+                chunk = self.suffix[start:start + size]
+            output += chunk
+            self.position += len(chunk)
+            size -= len(chunk)
+        return bytes(output)
+
+    def readline(self, size=-1):
+        return self.read(size)
+
+
+def stream_upload(url, body):
+    environ = RequestFactory()._base_environ(
+        PATH_INFO=url, REQUEST_METHOD='POST', CONTENT_LENGTH=str(body.length),
+        CONTENT_TYPE=f'multipart/form-data; boundary={BOUNDARY}', **{'wsgi.input': body})
+    return ClientHandler()(environ)
+
+
+def png_header():
+    # PNG 매직 바이트 + 파일마다 다른 값 (중복 제거로 합쳐지지 않도록)
+    return b'\x89PNG\r\n\x1a\n' + os.urandom(8)
+
+
+class DiscardStorage:
+    # 파일을 청크 단위로 읽기만 하는 저장소 (메모리 측정용)
+
+    def save(self, path, key):
+        with open(path, 'rb') as f:
+            while f.read(1024 * 1024):
+                pass
+        return f'/discard/{key}'
+
+
+@override_settings(IMAGE_UPLOAD_EAGER=True, IMAGE_VARIANT_SIZES=(), IMAGE_UPLOAD_MEMORY_LIMIT=256 * 1024)
+class StreamingUploadHandlerTest(LocalStorageMixin, TestCase):
+
+    def test_non_image_is_rejected_before_body_is_read(self):
+        body = LazyMultipartBody('image_url', 'notes.txt', b'plain text file', 10 * 1024 * 1024)
+        response = stream_upload(reverse('image-upload'), body)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('지원하지 않는 이미지 형식', response.data['detail'])
+        self.assertLess(body.position, 256 * 1024)
+        self.assertFalse(ImageUrl.objects.exists())
+        self.assertEqual(os.listdir(self.spool_dir), [])
+
+    @override_settings(IMAGE_UPLOAD_MAX_SIZE=1024 * 1024)
+    def test_oversized_upload_is_rejected(self):
+        response = stream_upload(reverse('image-upload'), LazyMultipartBody('image_url', 'a.png', png_header(), 3 * 1024 * 1024))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(os.listdir(self.spool_dir), [])
+
+    def test_large_file_is_spooled_once_and_handed_to_pipeline(self):
+        handed = []
+        with mock.patch('image_url.uploads.spool_file', side_effect=AssertionError('copied again')), \
+                mock.patch('image_url.uploads.process_upload', side_effect=lambda *args: handed.append(args)):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = stream_upload(reverse('image-upload'), LazyMultipartBody('image_url', 'a.png', png_header(), 2 * 1024 * 1024))
+
+        self.assertEqual(response.status_code, 202)
+        (image_id, path, key), = handed
+        self.assertEqual(os.path.dirname(path), self.spool_dir)
+        self.assertEqual(os.path.getsize(path), 2 * 1024 * 1024)
+        with open(path, 'rb') as f:
+            self.assertEqual(key, f'{hashlib.sha256(f.read()).hexdigest()}.png')
+        self.assertEqual(ImageUrl.objects.get(pk=image_id).content_hash, key.split('.')[0])
+
+    def test_memory_limit_decides_where_file_is_kept(self):
+        files = []
+
+        class CaptureView(StreamingUploadMixin, APIView):
+            def post(self, request):
+                files.append(request.FILES['image_url'])
+                return Response(status=204)
+
+        for size in (64 * 1024, 1024 * 1024):
+            request = RequestFactory().post('/', {'image_url': SimpleUploadedFile('a.png', png_header() + b'0' * size)})
+            CaptureView.as_view()(request)
+        small, large = files
+        self.assertEqual(type(small), StreamedUploadedFile)
+        self.assertIsInstance(large, SpooledUploadedFile)
+
+        # 파이프라인이 넘겨받지 않은 스풀 파일은 닫을 때 삭제
+        path = large.temporary_file_path()
+        large.close()
+        self.assertFalse(os.path.exists(path))
+
+
+@unittest.skipUnless(os.path.exists('/proc/self/status'), '/proc 에서 RSS 를 읽을 수 있어야 함')
+@override_settings(IMAGE_UPLOAD_EAGER=True, IMAGE_VARIANT_SIZES=())
+class StreamingUploadMemoryTest(LocalStorageMixin, TransactionTestCase):
+    concurrency = 8
+    file_size = 20 * 1024 * 1024
+
+    def setUp(self):
+        super().setUp()
+        # LocalStorageMixin 의 저장소 대신 읽기만 하는 저장소 사용
+        self.override = override_settings(IMAGE_STORAGE_BACKEND='image_url.tests.test_image_url.DiscardStorage')
+        self.override.enable()
+
+    def tearDown(self):
+        self.override.disable()
+        super().tearDown()
+
+    def rss(self):
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+
+    def test_concurrent_large_uploads_keep_rss_bounded(self):
+        url = reverse('image-upload')
+        self.assertEqual(stream_upload(url, LazyMultipartBody('image_url', 'warm.png', png_header(), 1024 * 1024)).status_code, 202)
+        gc.collect()
+        baseline = self.rss()
+
+        peak = [baseline]
+        done = threading.Event()
+
+        def sample():
+            while not done.is_set():
+                peak[0] = max(peak[0], self.rss())
+                time.sleep(0.002)
+
+        statuses = []
+
+        def upload():
+            response = stream_upload(url, LazyMultipartBody('image_url', 'big.png', png_header(), self.file_size))
+            statuses.append(response.status_code)
+
+        # 본문 파싱은 동시에 진행하고, 테스트 DB(sqlite 메모리 DB)에 쓰는 부분만 한 번에 하나씩 실행
+        db_lock = threading.Lock()
+
+        def serialized_enqueue(file):
+            with db_lock:
+                return enqueue_upload(file)
+
+        sampler = threading.Thread(target=sample)
+        sampler.start()
+        with mock.patch('image_url.views.enqueue_upload', side_effect=serialized_enqueue):
+            threads = [threading.Thread(target=upload) for _ in range(self.concurrency)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        done.set()
+        sampler.join()
+
+        self.assertEqual(statuses, [202] * self.concurrency)
+        self.assertEqual(ImageUrl.objects.filter(status=ImageUrl.STATUS_DONE, size=self.file_size // 1024).count(), self.concurrency)
+        # 전체 160MB 를 받는 동안 늘어난 메모리는 요청당 상한(1MB) + 청크 버퍼 수준이어야 함
+        self.assertLess(peak[0] - baseline, 48 * 1024 * 1024)
+        self.assertEqual(os.listdir(self.spool_dir), [])
+
+
+class GcImagesCommandTest(LocalStorageMixin, TestCase):
+
+    def make_stored_image(self, name, age_hours=48, variants=0):
+        # 저장소에 파일을 만들고 age_hours 전에 마지막으로 사용된 ImageUrl 로 등록
+        storage = LocalDirectoryStorage()
+        os.makedirs(storage.location, exist_ok=True)
+        image = ImageUrl.objects.create(image_url=storage.url(f'{name}.png'), content_hash=name.ljust(64, '0'),
+                                        has_variants=bool(variants),
+                                        rendered_variants=[[size, 'webp'] for size in (64, 256)[:variants]])
+        keys = [f'{name}.png'] + [f'{name}_{size}.webp' for size in (64, 256)[:variants]]
+        for key in keys:
+            with open(storage.path(key), 'wb') as f:
+                f.write(b'image')
+        for key in keys[1:]:
+            image.variants.create(size=int(key.split('_')[1].split('.')[0]), format='webp',
+                                  image_url=storage.url(key), width=1, height=1, file_size=5)
+        ImageUrl.objects.filter(pk=image.pk).update(updated_at=timezone.now() - timedelta(hours=age_hours))
+        return image
+
+    def stored_keys(self):
+        return sorted(os.listdir(self.storage_dir))
+
+    def setUp(self):
+        super().setUp()
+        club = Club.objects.create(name='클럽', image_url=self.make_stored_image('club'))
+        Team.objects.create(name='팀', club=club, image_url=self.make_stored_image('team'))
+        Competition.objects.create(name='대회', image_url=self.make_stored_image('competition'))
+        CustomUser.objects.create_user(phone='01000000001', password='x', username='유저', gender='male', birth=1990,
+                                       image_url=self.make_stored_image('user'))
+        deleted = CustomUser.objects.create_user(phone='01000000002', password='x', username='탈퇴', gender='male',
+                                                 birth=1990, image_url=self.make_stored_image('deleted'))
+        deleted.delete()  # soft delete 된 유저의 이미지도 참조로 본다
+        self.recent = self.make_stored_image('recent', age_hours=1)
+        self.orphans = [self.make_stored_image(f'orphan{i}', variants=i % 3) for i in range(5)]
+
+    def test_only_old_unreferenced_images_are_deleted(self):
+        call_command('gc_images', batch_size=2, sleep=0, stdout=StringIO())
+
+        remaining = set(ImageUrl.objects.values_list('content_hash', flat=True))
+        self.assertEqual(remaining, {name.ljust(64, '0') for name in ('club', 'team', 'competition', 'user', 'deleted', 'recent')})
+        self.assertFalse(ImageVariant.objects.exists())
+        self.assertEqual(self.stored_keys(), sorted(f'{name}.png' for name in ('club', 'team', 'competition', 'user', 'deleted', 'recent')))
+
+    def test_dry_run_deletes_nothing(self):
+        stdout = StringIO()
+        call_command('gc_images', dry_run=True, stdout=stdout)
+        self.assertIn('5개', stdout.getvalue())
+        self.assertEqual(ImageUrl.objects.count(), 11)
+
+    def test_image_linked_after_scan_is_kept(self):
+        # 후보 조회와 삭제 사이에 다른 요청이 이미지를 연결한 경우
+        cutoff = timezone.now() - timedelta(hours=24)
+        ids = list(orphaned_images(cutoff).values_list('id', flat=True))
+        Club.objects.create(name='새클럽', image_url=self.orphans[0])
+
+        deleted = Command().delete_rows(ids, cutoff)
+
+        self.assertEqual(len(deleted), 4)
+        self.assertTrue(ImageUrl.objects.filter(pk=self.orphans[0].pk).exists())
+
+    def test_resumes_object_deletion_after_interruption(self):
+        checkpoint = os.path.join(self.spool_dir, 'gc.json')
+        with mock.patch.object(LocalDirectoryStorage, 'delete_many', side_effect=RuntimeError('interrupted')):
+            with self.assertRaises(RuntimeError):
+                call_command('gc_images', batch_size=10, sleep=0, checkpoint=checkpoint, stdout=StringIO())
+
+        # 행은 이미 지워졌고 객체 key 는 체크포인트에 남아 있음
+        self.assertEqual(ImageUrl.objects.count(), 6)
+        with open(checkpoint) as f:
+            self.assertEqual(len(json.load(f)['pending_keys']), 9)  # 원본 5개 + 파생본 4개
+
+        call_command('gc_images', batch_size=10, sleep=0, checkpoint=checkpoint, stdout=StringIO())
+        self.assertEqual(len(self.stored_keys()), 6)
+        self.assertFalse(os.path.exists(checkpoint))
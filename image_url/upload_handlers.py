@@ -0,0 +1,190 @@
+import hashlib
+import os
+from io import BytesIO
+from uuid import uuid4
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler
+from django.http.multipartparser import MultiPartParserError
+from .uploads import discard_uncommitted_spool
+
+
+# 메모리 상한이 있는 이미지 업로드 핸들러
+#
+# Django 기본 핸들러 대신 요청 본문을 청크 단위로 받으면서
+#   - 처음 몇 바이트(매직 바이트)로 이미지 형식을 확인해서, 이미지가 아니면 본문을 끝까지 읽기 전에 거부하고
+#   - 파일 크기가 IMAGE_UPLOAD_MAX_SIZE 를 넘으면 바로 거부하고
+#   - 요청 하나가 메모리에 들고 있는 파일 데이터를 IMAGE_UPLOAD_MEMORY_LIMIT 이하로 유지한다
+#     (넘으면 업로드 파이프라인의 스풀 디렉토리에 바로 써서, image_url.uploads 가 복사 없이 넘겨받는다)
+#   - 받는 동안 sha256 을 계산해 둔다 (중복 확인용)
+# 거부할 때 발생시키는 MultiPartParserError 는 DRF 에서 400 응답이 된다.
+
+SNIFF_BYTES = 12
+
+
+def sniff_image_type(header):
+    """
+    파일 앞부분으로 이미지 형식을 판별 (모르는 형식이면 None)
+    """
+    if header.startswith(b'\xff\xd8\xff'):
+        return 'jpeg'
+    if header.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'png'
+    if header[:6] in (b'GIF87a', b'GIF89a'):
+        return 'gif'
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return 'webp'
+    if header[4:8] == b'ftyp' and header[8:12] in (b'heic', b'heix', b'mif1', b'msf1', b'avif'):
+        return 'heic'
+    return None
+
+
+class UploadRejected(MultiPartParserError):
+    pass
+
+
+class StreamedUploadedFile(UploadedFile):
+    """
+    StreamingImageUploadHandler 가 메모리에 받은 파일 (content_hash 를 미리 계산해 둠)
+    """
+
+    def __init__(self, file, name, content_type, size, charset, content_type_extra, content_hash):
+        super().__init__(file, name, content_type, size, charset, content_type_extra)
+        self.content_hash = content_hash
+
+    def claim_spool(self):
+        # 메모리에 있는 파일은 넘겨줄 스풀 파일이 없음
+        return None
+
+
+class SpooledUploadedFile(StreamedUploadedFile):
+    """
+    StreamingImageUploadHandler 가 스풀 디렉토리에 받은 파일
+    업로드 파이프라인이 claim_spool() 로 넘겨받지 않으면 요청이 끝날 때(close) 삭제된다
+    """
+
+    def __init__(self, file, path, *args):
+        super().__init__(file, *args)
+        self.spool_path = path
+
+    def temporary_file_path(self):
+        return self.file.name
+
+    def claim_spool(self):
+        """
+        스풀 파일의 (경로, sha256) 을 넘겨받는다 (이후 삭제 책임은 받는 쪽에 있음)
+        """
+        self.file.flush()
+        path, self.spool_path = self.spool_path, None
+        return path, self.content_hash
+
+    def close(self):
+        try:
+            return self.file.close()
+        finally:
+            if self.spool_path and os.path.exists(self.spool_path):
+                os.remove(self.spool_path)
+
+
+class StreamingImageUploadHandler(FileUploadHandler):
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.memory_used = 0
+        self.files = []
+        self.destination = None
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        # 본문 전체 크기가 상한보다 크면 읽기 전에 거부 (파일 외 필드 여유분 1MB)
+        if content_length > settings.IMAGE_UPLOAD_MAX_SIZE + 1024 * 1024:
+            raise UploadRejected('파일 크기가 너무 큽니다.')
+        return None
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.destination = BytesIO()
+        self.path = None
+        self.header = b''
+        self.received = 0
+        self.in_memory = 0
+        self.digest = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        if len(self.header) < SNIFF_BYTES:
+            self.header += raw_data[:SNIFF_BYTES - len(self.header)]
+            if len(self.header) >= SNIFF_BYTES and sniff_image_type(self.header) is None:
+                self.reject('지원하지 않는 이미지 형식입니다.')
+
+        self.received += len(raw_data)
+        if self.received > settings.IMAGE_UPLOAD_MAX_SIZE:
+            self.reject('파일 크기가 너무 큽니다.')
+
+        if self.path is None and self.memory_used + len(raw_data) > settings.IMAGE_UPLOAD_MEMORY_LIMIT:
+            self.roll_over()
+        if self.path is None:
+            self.memory_used += len(raw_data)
+            self.in_memory += len(raw_data)
+
+        self.digest.update(raw_data)
+        self.destination.write(raw_data)
+        return None
+
+    def roll_over(self):
+        # 메모리 상한을 넘으면 지금까지 받은 데이터를 스풀 파일로 옮기고 이후 청크는 파일에 바로 쓴다
+        os.makedirs(settings.IMAGE_UPLOAD_SPOOL_DIR, exist_ok=True)
+        extension = self.file_name.split('.')[-1].lower() if '.' in self.file_name else 'bin'
+        self.path = os.path.join(str(settings.IMAGE_UPLOAD_SPOOL_DIR), f'{uuid4()}.{extension}')
+        spool = open(self.path, 'w+b')
+        spool.write(self.destination.getvalue())
+        self.destination = spool
+        self.memory_used -= self.in_memory
+        self.in_memory = 0
+
+    def file_complete(self, file_size):
+        if sniff_image_type(self.header) is None:
+            self.reject('지원하지 않는 이미지 형식입니다.')
+
+        self.destination.seek(0)
+        args = (self.file_name, self.content_type, file_size, self.charset, self.content_type_extra,
+                self.digest.hexdigest())
+        if self.path is None:
+            file = StreamedUploadedFile(self.destination, *args)
+        else:
+            file = SpooledUploadedFile(self.destination, self.path, *args)
+        self.files.append(file)
+        self.destination = None
+        return file
+
+    def upload_interrupted(self):
+        self.discard()
+
+    def reject(self, message):
+        # 받던 파일과 이 요청에서 먼저 받은 파일을 정리하고 거부
+        self.discard()
+        for file in self.files:
+            file.close()
+        raise UploadRejected(message)
+
+    def discard(self):
+        if self.destination is not None:
+            self.destination.close()
+            self.destination = None
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class StreamingUploadMixin:
+    """
+    업로드 파일을 StreamingImageUploadHandler 로 받는 APIView mixin
+    (CSRF 검사 등에서 request.POST 를 읽기 전에 핸들러를 바꿔야 하므로 initialize_request 에서 설정)
+    롤백된 요청의 스풀 파일 정리는 image_url.uploads.discard_uncommitted_spool 참고
+    """
+
+    def initialize_request(self, request, *args, **kwargs):
+        request.upload_handlers = [StreamingImageUploadHandler(request)]
+        return super().initialize_request(request, *args, **kwargs)
+
+    def dispatch(self, request, *args, **kwargs):
+        # 요청 처리 중 트랜잭션이 롤백되면 업로드가 예약되지 않은 스풀 파일을 지운다
+        with discard_uncommitted_spool():
+            return super().dispatch(request, *args, **kwargs)
@@ -0,0 +1,325 @@
+import hashlib
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from uuid import uuid4
+from django.conf import settings
+from django.core import signing
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+from .imaging import render_variants, variant_name
+from .models import ImageUrl, ImageVariant
+from .storage import get_storage
+
+
+logger = logging.getLogger(__name__)
+
+
+# 이미지 업로드 파이프라인
+#
+# 요청 스레드에서는 업로드된 파일을 로컬 디스크(IMAGE_UPLOAD_SPOOL_DIR)에 옮겨두고 pending 상태의 ImageUrl 행만 만든 뒤 바로 응답한다.
+# 실제 저장소(S3 등) 업로드는 백그라운드 스레드 풀에서 재시도와 함께 처리하고,
+# 완료되면 image_url / extension / size 를 채우고 상태를 done 으로 바꾼다.
+# 원본 업로드 후에는 프로세스 풀에서 Pillow 로 파생본(IMAGE_VARIANT_SIZES x IMAGE_VARIANT_FORMATS)을 만들어 함께 올린다.
+# (ImageUrl 저장 시그널로 이 이미지를 사용하는 응답 캐시도 무효화된다)
+#
+# 저장소 key 는 파일 내용의 sha256 이다. 스풀에 복사하면서 해시를 계산하고,
+# 같은 내용의 이미지가 이미 있으면 새로 올리지 않고 기존 ImageUrl 을 그대로 반환한다.
+#
+# 스풀 파일은 커밋 후 실행되는 업로드 콜백만 사용 / 삭제하므로, 트랜잭션이 롤백되면 파일이 남는다.
+# 업로드를 받는 view 는 discard_uncommitted_spool() 안에서 실행해서 롤백된 업로드의 스풀 파일을 바로 지우고,
+# 워커 재시작 등으로 처리되지 못한 pending 행 / 스풀 파일은 expire_uploads 명령어로 정리한다.
+
+_executor = None
+_executor_lock = threading.Lock()
+_futures = set()
+_render_pool = None
+_spool_local = threading.local()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=settings.IMAGE_UPLOAD_WORKERS,
+                                           thread_name_prefix='image-upload')
+        return _executor
+
+
+def get_render_pool():
+    """
+    파생본 렌더링용 프로세스 풀 (IMAGE_VARIANT_PROCESSES 가 0 이면 None - 현재 스레드에서 렌더링)
+    """
+    global _render_pool
+    if settings.IMAGE_VARIANT_PROCESSES <= 0:
+        return None
+    with _executor_lock:
+        if _render_pool is None:
+            # 스레드가 여러 개인 프로세스에서 fork 하지 않도록 spawn 사용 (워커는 Django 없이 imaging 모듈만 import)
+            _render_pool = ProcessPoolExecutor(max_workers=settings.IMAGE_VARIANT_PROCESSES,
+                                               mp_context=multiprocessing.get_context('spawn'))
+        return _render_pool
+
+
+def spool_file(file, extension):
+    """
+    업로드된 파일을 스풀 디렉토리에 청크 단위로 복사하면서 sha256 을 계산 (경로, 해시) 반환
+    """
+    os.makedirs(settings.IMAGE_UPLOAD_SPOOL_DIR, exist_ok=True)
+    path = os.path.join(str(settings.IMAGE_UPLOAD_SPOOL_DIR), f'{uuid4()}.{extension}')
+    digest = hashlib.sha256()
+    with open(path, 'wb') as destination:
+        for chunk in file.chunks():
+            digest.update(chunk)
+            destination.write(chunk)
+    return path, digest.hexdigest()
+
+
+def enqueue_upload(file):
+    """
+    파일을 스풀에 저장하고 pending 상태의 ImageUrl 을 반환 (업로드는 트랜잭션 커밋 후 백그라운드에서 진행)
+    같은 내용의 이미지가 이미 있으면 업로드 없이 기존 ImageUrl 을 반환
+    """
+    extension = file.name.split('.')[-1].lower()
+    # StreamingImageUploadHandler 가 이미 스풀 디렉토리에 받아둔 파일은 복사 없이 넘겨받는다
+    claim_spool = getattr(file, 'claim_spool', None)
+    spooled = claim_spool() if claim_spool else None
+    path, content_hash = spooled or spool_file(file, extension)
+    spool = track_spool(path)
+    key = f'{content_hash}.{extension}'
+
+    for _ in range(3):
+        image = ImageUrl.objects.filter(content_hash=content_hash).first()
+        if image is None:
+            try:
+                with transaction.atomic():
+                    image = ImageUrl.objects.create(status=ImageUrl.STATUS_PENDING, content_hash=content_hash)
+            except IntegrityError:
+                # 같은 파일이 동시에 업로드된 경우 먼저 만들어진 행을 다시 조회
+                continue
+            schedule_upload(image.pk, path, key, spool)
+            return image
+
+        # 이전 업로드가 실패한 파일이면 같은 행으로 다시 업로드
+        if image.status == ImageUrl.STATUS_FAILED and ImageUrl.objects.filter(
+                pk=image.pk, status=ImageUrl.STATUS_FAILED).update(status=ImageUrl.STATUS_PENDING,
+                                                                    updated_at=timezone.now()):
+            image.status = ImageUrl.STATUS_PENDING
+            schedule_upload(image.pk, path, key, spool)
+            return image
+
+        # 기존 이미지 재사용 - updated_at 을 갱신해서 이미지 정리(gc_images)의 유예 기간을 다시 시작
+        # (조회 후 그 사이에 정리된 행이면 다시 만든다)
+        if ImageUrl.objects.filter(pk=image.pk).update(updated_at=timezone.now()):
+            os.remove(path)
+            return image
+
+    os.remove(path)
+    raise IntegrityError(f'image {content_hash} could not be created or reused')
+
+
+def schedule_upload(image_id, path, key, spool=None):
+    def upload():
+        if spool is not None:
+            spool.committed = True
+        if settings.IMAGE_UPLOAD_EAGER:
+            process_upload(image_id, path, key)
+        else:
+            submit(process_upload, image_id, path, key)
+
+    if spool is not None:
+        spool.callback = upload
+    transaction.on_commit(upload)
+
+
+class SpoolEntry:
+
+    def __init__(self, path):
+        self.path = path
+        self.callback = None  # 예약된 on_commit 업로드 콜백
+        self.committed = False  # 콜백이 실행되어 업로드가 파일을 넘겨받았는지
+
+
+def track_spool(path):
+    # discard_uncommitted_spool() 블록 안이면 스풀 파일을 등록 (블록 밖이면 None)
+    stack = getattr(_spool_local, 'stack', None)
+    if not stack:
+        return None
+    spool = SpoolEntry(path)
+    stack[-1].append(spool)
+    return spool
+
+
+@contextmanager
+def discard_uncommitted_spool():
+    """
+    블록 안에서 스풀에 저장했지만 업로드가 커밋되지 않은 파일을 블록이 끝날 때 삭제
+    (트랜잭션이 롤백되면 on_commit 콜백이 버려지므로, 콜백이 실행되지도 대기 중이지도 않은 파일을 지운다)
+    """
+    stack = _spool_local.__dict__.setdefault('stack', [])
+    spools = []
+    stack.append(spools)
+    try:
+        yield
+    finally:
+        stack.pop()
+        pending = {id(callback) for _, callback, _ in connection.run_on_commit}
+        for spool in spools:
+            if spool.committed:
+                continue
+            if spool.callback is not None and id(spool.callback) in pending:
+                # 바깥 트랜잭션이 아직 진행 중 - 바깥 블록에 넘긴다 (바깥 블록이 없으면 expire_uploads 가 정리)
+                if stack:
+                    stack[-1].append(spool)
+                continue
+            if os.path.exists(spool.path):
+                os.remove(spool.path)
+
+
+def submit(fn, *args):
+    future = get_executor().submit(fn, *args)
+    _futures.add(future)
+    future.add_done_callback(_futures.discard)
+    return future
+
+
+def wait_for_uploads(timeout=None):
+    """
+    진행 중인 백그라운드 업로드가 끝날 때까지 대기 (테스트 / 종료 시 사용)
+    """
+    wait(list(_futures), timeout=timeout)
+
+
+def process_upload(image_id, path, key):
+    """
+    스풀 파일을 저장소에 업로드하고 ImageUrl 을 완료 상태로 변경 (실패 시 재시도)
+    """
+    try:
+        size_kb = int(os.path.getsize(path) / 1024)
+        for attempt in range(settings.IMAGE_UPLOAD_RETRIES + 1):
+            try:
+                file_url = get_storage().save(path, key)
+                break
+            except Exception:
+                logger.warning('이미지 업로드 실패 (image_id=%s, 시도 %s)', image_id, attempt + 1, exc_info=True)
+                if attempt == settings.IMAGE_UPLOAD_RETRIES:
+                    ImageUrl.objects.filter(pk=image_id).update(status=ImageUrl.STATUS_FAILED)
+                    return
+                time.sleep(settings.IMAGE_UPLOAD_RETRY_DELAY * (2 ** attempt))
+
+        image = ImageUrl.objects.get(pk=image_id)
+        image.image_url = file_url
+        image.extension = key.split('.')[-1]
+        image.size = size_kb
+        image.status = ImageUrl.STATUS_DONE
+        image.rendered_variants = create_variants(image, path, key)
+        image.has_variants = bool(image.rendered_variants)
+        image.save()
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+        if threading.current_thread() is not threading.main_thread() and not settings.IMAGE_UPLOAD_EAGER:
+            # 워커 스레드의 DB 연결 정리
+            connection.close()
+
+
+def create_variants(image, path, key):
+    """
+    스풀 파일로 파생본을 만들어 저장소에 올리고 ImageVariant 행을 생성 (만든 [[크기, 형식], ...] 반환)
+    이미지가 아닌 파일이거나 렌더링 / 업로드에 실패하면 원본만 사용한다.
+    """
+    if not settings.IMAGE_VARIANT_SIZES:
+        return []
+
+    with tempfile.TemporaryDirectory(dir=settings.IMAGE_UPLOAD_SPOOL_DIR) as output_dir:
+        args = (path, output_dir, settings.IMAGE_VARIANT_SIZES, settings.IMAGE_VARIANT_FORMATS,
+                settings.IMAGE_VARIANT_QUALITY)
+        try:
+            pool = get_render_pool()
+            renders = pool.submit(render_variants, *args).result() if pool else render_variants(*args)
+            storage = get_storage()
+            variants = [
+                ImageVariant(image=image, size=render['size'], format=render['format'],
+                             image_url=storage.save(render['path'], variant_name(key, render['size'], render['format'])),
+                             width=render['width'], height=render['height'], file_size=render['file_size'])
+                for render in renders
+            ]
+        except Exception:
+            logger.warning('이미지 파생본 생성 실패 (image_id=%s)', image.pk, exc_info=True)
+            return []
+
+    ImageVariant.objects.bulk_create(variants)
+    return [[variant.size, variant.format] for variant in variants]
+
+
+# 저장소 직접 업로드 (presigned PUT)
+#
+# 파일은 클라이언트가 저장소로 바로 올리고, 서버는 presigned URL 발급과 업로드 확인(HEAD)만 한다.
+# 발급할 때 key / 크기 / 해시를 서명된 토큰에 담아두고, 확인할 때 토큰으로 받은 key 만 ImageUrl 로 등록한다.
+# (파일 내용을 서버가 읽지 않으므로 파생본은 만들지 않는다)
+
+DIRECT_UPLOAD_SALT = 'image_url.direct_upload'
+
+
+class DirectUploadError(Exception):
+    pass
+
+
+def presign_direct_upload(file_name, content_type, size, content_hash=None):
+    """
+    직접 업로드용 presigned 요청 정보와 확인 토큰을 반환
+    같은 해시의 이미지가 이미 있으면 업로드 없이 기존 ImageUrl 을 반환 (upload 는 None)
+    """
+    extension = file_name.split('.')[-1].lower()
+    if content_hash:
+        image = ImageUrl.objects.filter(content_hash=content_hash, status=ImageUrl.STATUS_DONE).first()
+        if image is not None and ImageUrl.objects.filter(pk=image.pk).update(updated_at=timezone.now()):
+            return {'image': image, 'upload': None, 'token': None}
+        key = f'{content_hash}.{extension}'
+    else:
+        key = f'{uuid4()}.{extension}'
+
+    upload = get_storage().presign_upload(key, content_type, size, content_hash,
+                                          expires_in=settings.IMAGE_DIRECT_UPLOAD_EXPIRES)
+    token = signing.dumps({'key': key, 'size': size, 'hash': content_hash}, salt=DIRECT_UPLOAD_SALT)
+    return {'image': None, 'upload': upload, 'token': token}
+
+
+def confirm_direct_upload(token):
+    """
+    토큰의 객체가 저장소에 올라왔는지 확인하고 ImageUrl 을 생성해서 반환
+    """
+    try:
+        payload = signing.loads(token, salt=DIRECT_UPLOAD_SALT, max_age=settings.IMAGE_DIRECT_UPLOAD_EXPIRES * 2)
+    except signing.BadSignature:
+        raise DirectUploadError('유효하지 않은 업로드 토큰입니다.')
+
+    storage = get_storage()
+    size = storage.stat(payload['key'])
+    if size is None:
+        raise DirectUploadError('업로드된 파일이 없습니다.')
+    if size != payload['size']:
+        raise DirectUploadError('업로드된 파일의 크기가 다릅니다.')
+
+    fields = {
+        'image_url': storage.url(payload['key']),
+        'extension': payload['key'].split('.')[-1],
+        'size': int(size / 1024),
+        'status': ImageUrl.STATUS_DONE,
+    }
+    if not payload['hash']:
+        # 같은 토큰으로 다시 확인해도 (재시도 등) 같은 key 의 이미지 하나만 만든다
+        image, _ = ImageUrl.objects.get_or_create(image_url=fields['image_url'], defaults=fields)
+        return image
+    try:
+        with transaction.atomic():
+            image, _ = ImageUrl.objects.update_or_create(content_hash=payload['hash'], defaults=fields)
+    except IntegrityError:
+        # 같은 파일의 확인 요청이 동시에 들어온 경우
+        image = ImageUrl.objects.get(content_hash=payload['hash'])
+    return image
@@ -0,0 +1,13 @@
+from django.urls import path
+from .views import (ImageUploadView,
+                    ImageDetailView,
+                    ImagePresignView,
+                    ImageConfirmView
+)
+
+urlpatterns = [
+    path('image/upload/', ImageUploadView.as_view(), name='image-upload'), # 이미지 업로드 API (백그라운드 업로드)
+    path('image/presign/', ImagePresignView.as_view(), name='image-presign'), # 저장소 직접 업로드 URL 발급 API
+    path('image/confirm/', ImageConfirmView.as_view(), name='image-confirm'), # 직접 업로드 완료 확인 API
+    path('image/<int:pk>/', ImageDetailView.as_view(), name='image-detail'), # 이미지 업로드 상태 조회 API
+]
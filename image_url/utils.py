@@ -1,29 +1,109 @@
+import hashlib
+import threading
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from django.conf import settings
-from uuid import uuid4
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+
+# S3 클라이언트는 프로세스 전체에서 하나만 만들어서 공유한다.
+# boto3 클라이언트는 스레드 안전하므로 업로드 워커 스레드들이 같은 커넥션 풀을 재사용하고,
+# 업로드마다 자격 증명 조회 / 엔드포인트 설정 / 커넥션 풀 생성 비용을 다시 내지 않는다.
+# (boto3.client() 호출 자체는 스레드 안전하지 않으므로 생성 시에만 락을 건다)
+
+_s3_client = None
+_s3_client_lock = threading.Lock()
+
+
+def create_s3_client():
+    """
+    settings 기준으로 새 S3 클라이언트를 생성
+    """
+    options = {
+        'config': Config(
+            max_pool_connections=settings.AWS_S3_MAX_POOL_CONNECTIONS,
+            retries={'max_attempts': 3, 'mode': 'standard'},
+            signature_version='s3v4',  # presigned URL 도 SigV4 로 서명
+            # 로컬 S3 호환 서버(AWS_S3_ENDPOINT_URL)는 버킷 이름을 경로로 받는다
+            s3={'addressing_style': 'path' if settings.AWS_S3_ENDPOINT_URL else 'auto'},
+        ),
+    }
+    if settings.AWS_S3_ENDPOINT_URL:
+        options['endpoint_url'] = settings.AWS_S3_ENDPOINT_URL
+    if settings.IS_LOCAL:
+        # 로컬 환경에서는 명시적으로 키를 사용하여 s3 클라이언트를 생성
+        options['aws_access_key_id'] = settings.AWS_ACCESS_KEY_ID
+        options['aws_secret_access_key'] = settings.AWS_SECRET_ACCESS_KEY
+    # 서버 환경에서는 IAM 역할을 사용하여 s3 클라이언트를 생성
+    return boto3.session.Session().client('s3', region_name=settings.AWS_S3_REGION_NAME, **options)
+
+
+def get_s3_client():
+    """
+    프로세스 공용 S3 클라이언트 (처음 호출할 때 생성)
+    """
+    global _s3_client
+    if _s3_client is None:
+        with _s3_client_lock:
+            if _s3_client is None:
+                _s3_client = create_s3_client()
+    return _s3_client
+
+
+def get_transfer_config():
+    """
+    멀티파트 업로드 설정 (기준 크기 / 파트 크기 / 동시 전송 수)
+    """
+    return TransferConfig(
+        multipart_threshold=settings.AWS_S3_MULTIPART_THRESHOLD,
+        multipart_chunksize=settings.AWS_S3_MULTIPART_CHUNKSIZE,
+        max_concurrency=settings.AWS_S3_MAX_CONCURRENCY,
+    )
+
+
+@receiver(setting_changed)
+def reset_s3_client(setting, **kwargs):
+    # 테스트에서 AWS 설정을 바꾸면 다음 호출 때 클라이언트를 새로 만든다
+    global _s3_client
+    if setting.startswith('AWS_') or setting == 'IS_LOCAL':
+        with _s3_client_lock:
+            _s3_client = None
+
 
 class S3ImageUploader:
-    def __init__(self, bucket_name=settings.AWS_STORAGE_BUCKET_NAME):
-        if settings.IS_LOCAL:
-            # 로컬 환경에서는 명시적으로 키를 사용하여 s3 클라이언트를 생성
-            self.s3 = boto3.client('s3',
-                                   aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                                   aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY)
-        else:
-            # 서버 환경에서는 IAM 역할을 사용하여 s3 클라이언트를 생성
-            self.s3 = boto3.client('s3')
-        self.bucket_name = bucket_name
+    def __init__(self, bucket_name=None):
+        self.s3 = get_s3_client()
+        self.bucket_name = bucket_name or settings.AWS_STORAGE_BUCKET_NAME
 
     def upload_file(self, file):
         """
         S3 버킷에 파일을 업로드하고 업로드된 파일의 URL을 반환
+        (파일 이름은 내용의 sha256 이므로 같은 파일은 같은 객체로 저장됨)
+        """
+        digest = hashlib.sha256()
+        for chunk in file.chunks():
+            digest.update(chunk)
+        file.seek(0)
+        file_name = f"{digest.hexdigest()}.{file.name.split('.')[-1]}"
+        file_url = self.upload_fileobj(file, file_name)
+        file_size_kb = int(file.size / 1024)
+        return file_url, file_name.split('.')[-1], file_size_kb
+
+    def upload_fileobj(self, fileobj, file_name):
+        """
+        파일 객체를 지정한 이름(key)으로 업로드하고 URL을 반환
         """
-        file_name = f"{uuid4()}.{file.name.split('.')[-1]}"
         self.s3.upload_fileobj(
-            file,
+            fileobj,
             self.bucket_name,
-            file_name
+            file_name,
+            Config=get_transfer_config()
         )
-        file_url = f"https://{self.bucket_name}.s3.amazonaws.com/{file_name}"
-        file_size_kb = int(file.size / 1024)
-        return file_url, file_name.split('.')[-1], file_size_kb
\ No newline at end of file
+        return self.file_url(file_name)
+
+    def file_url(self, file_name):
+        if settings.AWS_S3_ENDPOINT_URL:
+            return f"{settings.AWS_S3_ENDPOINT_URL.rstrip('/')}/{self.bucket_name}/{file_name}"
+        return f"https://{self.bucket_name}.s3.amazonaws.com/{file_name}"
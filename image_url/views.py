@@ -1,26 +1,69 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from .serializers import ImageUploadSerializer
-from .utils import S3ImageUploader
+from rest_framework.permissions import IsAuthenticated
+from .models import ImageUrl
+from .serializers import ImageUploadSerializer, ImagePresignSerializer, ImageConfirmSerializer
+from .storage import get_storage
+from .upload_handlers import StreamingUploadMixin
+from .uploads import enqueue_upload, presign_direct_upload, confirm_direct_upload, DirectUploadError
 
 
 
 
-class ImageUploadView(APIView):
+class ImageUploadView(StreamingUploadMixin, APIView):
     def post(self, request, *args, **kwargs):
-        serializer = ImageUploadSerializer(data=request.data)
-        if serializer.is_valid():
-            image_file = request.FILES.get('image_url')
-            if image_file:
-                # S3Uploader 클래스의 인스턴스를 생성
-                uploader = S3ImageUploader()
-
-                # 해당 인스턴스를 사용하여 파일 업로드
-                file_url, extension, size = uploader.upload_file(image_file)
-                
-                # S3로부터 받은 URL, 확장자, 파일 크기 정보 업데이트
-                serializer.save(image_url=file_url, extension=extension, size=size)
-                return Response(serializer.data, status=status.HTTP_201_CREATED)
-            return Response({"error": "No image file provided"}, status=status.HTTP_400_BAD_REQUEST)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+        image_file = request.FILES.get('image_url')
+        if image_file:
+            # 파일을 스풀에 저장하고 pending 상태의 ImageUrl 을 바로 반환 (S3 업로드는 백그라운드에서 진행)
+            # 이미 업로드된 파일과 내용이 같으면 기존 이미지를 그대로 반환
+            image = enqueue_upload(image_file)
+            serializer = ImageUploadSerializer(image)
+            if image.status == ImageUrl.STATUS_DONE:
+                return Response(serializer.data, status=status.HTTP_200_OK)
+            return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+        return Response({"error": "No image file provided"}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class ImageDetailView(APIView):
+    def get(self, request, pk, *args, **kwargs):
+        # 업로드 진행 상태 확인용 (pending / done / failed)
+        image = ImageUrl.objects.filter(pk=pk).first()
+        if image is None:
+            return Response({"error": "해당 이미지가 존재하지 않습니다."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(ImageUploadSerializer(image).data)
+
+
+class ImagePresignView(APIView):
+    permission_classes = (IsAuthenticated,)
+
+    def post(self, request, *args, **kwargs):
+        # 클라이언트가 S3 로 바로 업로드할 presigned PUT URL 발급 (파일은 서버를 거치지 않음)
+        if not get_storage().supports_direct_upload:
+            return Response({"error": "직접 업로드를 지원하지 않는 저장소입니다."}, status=status.HTTP_501_NOT_IMPLEMENTED)
+        serializer = ImagePresignSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
+        result = presign_direct_upload(data['file_name'], data['content_type'], data['size'], data.get('content_hash'))
+
+        if result['image'] is not None:
+            # 같은 내용의 이미지가 이미 있으면 업로드할 필요 없음
+            return Response({'image': ImageUploadSerializer(result['image']).data, 'upload': None, 'token': None})
+        return Response({'image': None, 'upload': result['upload'], 'token': result['token']},
+                        status=status.HTTP_201_CREATED)
+
+
+class ImageConfirmView(APIView):
+    permission_classes = (IsAuthenticated,)
+
+    def post(self, request, *args, **kwargs):
+        # presigned URL 로 업로드가 끝난 뒤 호출 - 저장소에 파일이 있는지 확인하고 ImageUrl 생성
+        serializer = ImageConfirmSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            image = confirm_direct_upload(serializer.validated_data['token'])
+        except DirectUploadError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(ImageUploadSerializer(image).data, status=status.HTTP_201_CREATED)
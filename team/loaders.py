@@ -0,0 +1,47 @@
+from django.db.models import Max, Count
+from .models import Team
+from users.models import CustomUser
+from core.cache import cached_data
+from core.conditional import make_validator
+from .serializers import TeamMemberSerializer
+
+
+def team_detail_validator(pk):
+    """
+    팀 상세 응답의 ETag validator (팀이 없으면 None)
+    팀 + 소속 유저 (와 각각의 이미지) 의 최대 updated_at 과 행 수를 집계 쿼리로만 계산
+    """
+    team = Team.objects.filter(pk=pk).values('updated_at', 'image_url__updated_at').first()
+    if team is None:
+        return None
+
+    users = CustomUser.objects.filter(team=pk).aggregate(
+        Max('updated_at'), Max('image_url__updated_at'), Count('id'))
+
+    return make_validator([*team.values(), *users.values()])
+
+
+
+# 팀 멤버 목록 로더
+# 멤버 행은 팀 정보 없이 (멤버 이미지는 JOIN) 'team-members:{id}' 태그로 따로 캐시하고,
+# 각 행의 team 은 호출하는 쪽에서 이미 불러온 팀 객체로 채운다 (멤버마다 팀을 다시 읽지 않음).
+# 그래서 팀 이름 / 설명만 바뀌면 멤버 목록은 다시 만들지 않고, 멤버 가입 / 탈퇴 / 이동 / 프로필 변경 때만 다시 만든다.
+def load_team_members(team_id):
+    """
+    팀 멤버 목록 (UserWithTeamInfoSerializer 에서 team 을 뺀 행)
+    """
+    users = TeamMemberSerializer.setup_eager_loading(CustomUser.objects.filter(team=team_id))
+    return TeamMemberSerializer(users, many=True).data
+
+
+def team_roster(team):
+    """
+    팀 멤버 목록 (UserWithTeamInfoSerializer 와 같은 모양) - 멤버 행은 캐시에서 가져온다
+    """
+    def build(tag):
+        tag(f'team-members:{team.pk}')
+        return load_team_members(team.pk)
+
+    members = cached_data(f'team:{team.pk}:roster', build)
+    team_info = {'id': team.id, 'name': team.name}
+    return [{**member, 'team': team_info} for member in members]
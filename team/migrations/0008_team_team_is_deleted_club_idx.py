@@ -0,0 +1,19 @@
+# Generated by Django 5.0.14 on 2026-10-18 19:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('club', '0009_club_is_deleted_id_idx'),
+        ('image_url', '0016_imageurl_content_hash'),
+        ('team', '0007_alter_team_id'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='team',
+            index=models.Index(fields=['is_deleted', 'club'], name='team_is_deleted_club_idx'),
+        ),
+    ]
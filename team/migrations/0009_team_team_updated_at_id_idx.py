@@ -0,0 +1,19 @@
+# Generated by Django 5.0.14 on 2026-10-18 19:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('club', '0010_club_club_updated_at_id_idx'),
+        ('image_url', '0017_imageurl_image_url_updated_at_id_idx'),
+        ('team', '0008_team_team_is_deleted_club_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='team',
+            index=models.Index(fields=['updated_at', 'id'], name='team_updated_at_id_idx'),
+        ),
+    ]
@@ -12,4 +12,10 @@ class Team(TimeStampedModel, SoftDeleteModel):
         return self.name
 
     class Meta:
-        db_table = 'team'
\ No newline at end of file
+        db_table = 'team'
+        indexes = [
+            # 삭제되지 않은 클럽 소속 팀 조회용 복합 인덱스
+            models.Index(fields=['is_deleted', 'club'], name='team_is_deleted_club_idx'),
+            # 변경분 동기화 키셋 스캔용 (core.sync)
+            models.Index(fields=['updated_at', 'id'], name='team_updated_at_id_idx'),
+        ]
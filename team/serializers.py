@@ -1,14 +1,24 @@
 from rest_framework import serializers
 from .models import Team
 from users.models import CustomUser
-from image_url.serializers import ImageUrlSerializer
+from image_url.serializers import ImageUrlSerializer, VARIANT_AVATAR, VARIANT_DETAIL
+from core.serializers import EagerLoadingMixin
 
-class TeamDetailSerializer(serializers.ModelSerializer):
-    image_url = ImageUrlSerializer(read_only=True)
+class TeamDetailSerializer(EagerLoadingMixin, serializers.ModelSerializer):
+    image_url = ImageUrlSerializer(read_only=True, variant=VARIANT_DETAIL)
  
     class Meta:
         model = Team
         fields = ['id', 'name', 'description', 'image_url']
+
+
+class TeamMemberSerializer(EagerLoadingMixin, serializers.ModelSerializer):
+    # 팀 멤버 목록 (team 은 team.loaders.team_roster 에서 이미 불러온 팀으로 채운다)
+    image_url = ImageUrlSerializer(read_only=True, variant=VARIANT_AVATAR)
+
+    class Meta:
+        model = CustomUser
+        fields = ('id', 'username', 'image_url')
     
         
 
@@ -1,3 +1,55 @@
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+from club.serializers import UserWithTeamInfoSerializer
+from club.tests import make_club
+from users.models import CustomUser
+from .models import Team
 
-# Create your tests here.
+
+class TeamRosterTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.club = make_club(members=60, teams=2, coaches=0)
+        self.team, self.other_team = Team.objects.filter(club=self.club).order_by('id')
+
+    def get_users(self, team):
+        response = self.client.get(reverse('team-detail', args=[team.pk]))
+        self.assertEqual(response.status_code, 200)
+        return response.json()['users']
+
+    def test_roster_matches_serializer_with_fixed_queries(self):
+        # validator 2번 + 팀 1번 + 멤버 목록 1번 (멤버 수와 상관없음)
+        with self.assertNumQueries(4):
+            users = self.get_users(self.team)
+
+        expected = UserWithTeamInfoSerializer(CustomUser.objects.filter(team=self.team), many=True).data
+        self.assertEqual(len(users), 30)
+        self.assertEqual(users, [{'id': row['id'], 'username': row['username'],
+                                  'imageUrl': {'imageUrl': row['image_url']['image_url']}, 'team': row['team']}
+                                 for row in expected])
+
+    def test_team_change_reuses_cached_roster(self):
+        self.get_users(self.team)
+        self.team.name = '새이름'
+        self.team.save()
+
+        # validator 2번 + 팀 1번 (멤버 목록은 캐시)
+        with self.assertNumQueries(3):
+            users = self.get_users(self.team)
+        self.assertEqual({user['team']['name'] for user in users}, {'새이름'})
+
+    def test_membership_change_rebuilds_both_rosters(self):
+        self.get_users(self.team)
+        self.get_users(self.other_team)
+        user = CustomUser.objects.filter(team=self.team).first()
+        user.team = self.other_team
+        user.save()
+
+        self.assertNotIn(user.pk, [row['id'] for row in self.get_users(self.team)])
+        moved = [row for row in self.get_users(self.other_team) if row['id'] == user.pk]
+        self.assertEqual(moved[0]['team'], {'id': self.other_team.pk, 'name': self.other_team.name})
+
+        CustomUser.objects.filter(pk=user.pk).delete()
+        self.assertNotIn(user.pk, [row['id'] for row in self.get_users(self.other_team)])
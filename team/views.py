@@ -1,29 +1,40 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from .models import Team
-from users.models import CustomUser
 from .serializers import TeamDetailSerializer
-from club.serializers import UserWithTeamInfoSerializer
+from core.cache import cached_data
+from core.conditional import conditional_response
+from .loaders import team_detail_validator, team_roster
 
 class TeamDetailView(APIView):
     """
     팀 상세 정보 조회하는 API
     """
     def get(self, request, pk):
+        # 팀 / 소속 유저가 바뀌면 시그널로 캐시가 무효화된다 (core.signals 참고)
+        def build_validator(tag):
+            tag(f'team:{pk}', f'team-members:{pk}')
+            return team_detail_validator(pk)
+
+        # 클라이언트가 가진 데이터가 최신이면 (If-None-Match) serializer 없이 304 응답
+        validator = cached_data(f'team:{pk}:validator', build_validator)
+        return conditional_response(request, validator, lambda: self.get_detail(pk))
+
+    def get_detail(self, pk):
         try:
-            team = Team.objects.get(pk=pk)
-            team_serializer = TeamDetailSerializer(team)
+            def build(tag):
+                tag(f'team:{pk}', f'team-members:{pk}')
+                team = TeamDetailSerializer.setup_eager_loading(Team.objects).get(pk=pk)
+                team_serializer = TeamDetailSerializer(team)
+
+                # 팀에 속한 유저 정보 (멤버 목록은 따로 캐시, 팀 정보는 위에서 불러온 팀으로 채움)
+                return {
+                    'team': team_serializer.data,
+                    'users': team_roster(team)
+                }
 
-            # 팀에 속한 유저 정보 가져오기 (코치로 등록된 유저 제외)
-            users = CustomUser.objects.filter(team=team)
-            user_serializer = UserWithTeamInfoSerializer(users, many=True)
+            response_data = cached_data(f'team:{pk}', build)
 
-            # 클럽 정보와 함께 코치, 팀, 유저 정보 포함하여 응답
-            response_data = {
-                'team': team_serializer.data,
-                'users': user_serializer.data
-            }
-            
             return Response(response_data)
         except Team.DoesNotExist:
             return Response({'error': '해당팀이 존재하지 않습니다.'}, status=404)
\ No newline at end of file
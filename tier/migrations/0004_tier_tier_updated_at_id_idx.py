@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-18 19:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matchtype', '0002_alter_matchtype_id'),
+        ('tier', '0003_alter_tier_id'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tier',
+            index=models.Index(fields=['updated_at', 'id'], name='tier_updated_at_id_idx'),
+        ),
+    ]
@@ -9,3 +9,7 @@ class Tier(TimeStampedModel, SoftDeleteModel):
 
     class Meta:
         db_table = 'tier'
+        indexes = [
+            # 변경분 동기화 키셋 스캔용 (core.sync)
+            models.Index(fields=['updated_at', 'id'], name='tier_updated_at_id_idx'),
+        ]
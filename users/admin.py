@@ -3,15 +3,23 @@ from django.contrib.auth.admin import UserAdmin
 from .models import CustomUser
 
 class CustomUserAdmin(admin.ModelAdmin):
-    list_display = ('username', 'phone', 'gender', 'birth', 'club')  # 실제 CustomUser 모델의 필드를 반영
+    list_display = ('username', 'phone', 'gender', 'birth', 'club', 'is_deleted')  # 실제 CustomUser 모델의 필드를 반영
+    list_filter = ('is_deleted',)
     ordering = ('phone',)  # 실제 CustomUser 모델의 USERNAME_FIELD를 사용
-    
+    actions = ('restore_selected',)
+
+    def get_queryset(self, request):
+        # 관리자 화면에서는 삭제된 유저도 보여준다 (복구용)
+        return CustomUser.all_objects.order_by(*self.get_ordering(request))
+
     def delete_queryset(self, request, queryset):
-        # soft delete 기능 : db에서 삭제 하지 않고 불리언 타입으로 true 1 처리
-        for obj in queryset:
-            obj.is_deleted = True
-            obj.save()
-    
+        # soft delete 기능 : db에서 삭제 하지 않고 불리언 타입으로 true 1 처리 (UPDATE 한 번)
+        queryset.delete()
+
+    @admin.action(description='선택된 유저 복구')
+    def restore_selected(self, request, queryset):
+        queryset.restore()
+
 
 # 장고 어드민 사이트에 CustomUser 모델을 CustomUserAdmin 설정으로 등록
-admin.site.register(CustomUser, CustomUserAdmin)
\ No newline at end of file
+admin.site.register(CustomUser, CustomUserAdmin)
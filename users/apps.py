@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_save
 
 
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
+
+    def ready(self):
+        # 유저가 수정되면 프로세스 내 유저 캐시에서 제거
+        from core.signals import soft_delete_changed
+        from .authentication import forget_user, forget_users
+        post_save.connect(forget_user, sender='users.CustomUser', dispatch_uid='forget_cached_user')
+        soft_delete_changed.connect(forget_users, sender='users.CustomUser', dispatch_uid='forget_cached_users')
@@ -0,0 +1,107 @@
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+
+# 토큰 클레임 기반 인증
+#
+# simplejwt 기본 JWTAuthentication 은 요청마다 users 테이블에서 유저를 조회한다.
+# 로그인 시 토큰에 id / phone / is_active / club / team 클레임을 넣어두고 (CustomTokenObtainPairSerializer.get_token)
+# 요청에서는 클레임만으로 가벼운 유저 객체를 만들어서 DB 조회 없이 인증한다.
+# 액세스 토큰 리프레시 때마다 DB 에서 유저를 다시 읽어서 클레임을 새로 채우므로 (RefreshAccessTokenView)
+# 비활성화 / 탈퇴 / 클럽, 팀 변경은 최대 액세스 토큰 수명(15분) 동안만 늦게 반영된다.
+# 최신 모델이 꼭 필요한 곳에서는 get_full_user() 를 사용한다.
+
+
+class ClaimsUser(TokenUser):
+    """
+    토큰 클레임으로 만든 유저 (DB 조회 없음)
+    """
+
+    @cached_property
+    def id(self):
+        return int(self.token[api_settings.USER_ID_CLAIM])
+
+    @cached_property
+    def phone(self):
+        return self.token.get('phone', '')
+
+    @cached_property
+    def is_active(self):
+        return self.token.get('is_active', True)
+
+    @cached_property
+    def club_id(self):
+        return self.token.get('club')
+
+    @cached_property
+    def team_id(self):
+        return self.token.get('team')
+
+    def get_full_user(self):
+        """
+        CustomUser 모델 인스턴스가 필요할 때 사용 (JWT_USER_CACHE_TTL 동안 프로세스 메모리에 캐시되므로 읽기 전용으로 사용)
+        """
+        return load_user(self.id)
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    users 테이블 조회 없이 토큰 클레임만으로 인증하는 JWT 인증 클래스
+    """
+
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+        if not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        return user
+
+
+# 짧은 TTL 의 프로세스 내 유저 캐시 (워커마다 따로 유지되므로 TTL 을 짧게 둔다)
+_user_cache = OrderedDict()
+_user_cache_lock = threading.Lock()
+
+
+def load_user(user_id):
+    """
+    CustomUser 를 조회 (JWT_USER_CACHE_TTL 초 동안 같은 프로세스에서는 재사용, 0 이면 캐시 사용 안 함)
+    """
+    ttl = getattr(settings, 'JWT_USER_CACHE_TTL', 0)
+    if ttl <= 0:
+        return get_user_model().objects.get(pk=user_id)
+
+    now = time.monotonic()
+    with _user_cache_lock:
+        cached = _user_cache.get(user_id)
+        if cached is not None and cached[0] > now:
+            _user_cache.move_to_end(user_id)
+            return cached[1]
+
+    user = get_user_model().objects.get(pk=user_id)
+    with _user_cache_lock:
+        _user_cache[user_id] = (now + ttl, user)
+        _user_cache.move_to_end(user_id)
+        while len(_user_cache) > getattr(settings, 'JWT_USER_CACHE_SIZE', 1024):
+            _user_cache.popitem(last=False)
+    return user
+
+
+def forget_user(sender, instance, **kwargs):
+    # 같은 프로세스에서 유저가 수정되면 캐시에서 바로 제거 (UsersConfig.ready 에서 연결)
+    with _user_cache_lock:
+        _user_cache.pop(instance.pk, None)
+
+
+def forget_users(sender, pks, **kwargs):
+    # 일괄 soft delete / 복구된 유저도 캐시에서 제거
+    with _user_cache_lock:
+        for pk in pks:
+            _user_cache.pop(pk, None)
@@ -0,0 +1,147 @@
+import hashlib
+import math
+import threading
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import Max, Q
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+# 메모리 기반 토큰 블랙리스트 인덱스
+#
+# simplejwt 는 리프레시 토큰을 검증할 때마다 token_blacklist_blacklistedtoken 테이블을 조회한다.
+# 블랙리스트에 오른 JTI 를 블룸 필터 + 최근 JTI 집합으로 프로세스 메모리에 들고 있다가
+#   - 블룸 필터에 없으면: 블랙리스트가 아님 (DB 조회 없음, 대부분의 경우)
+#   - 최근 집합에 있으면: 블랙리스트 (DB 조회 없음)
+#   - 블룸 필터에만 있으면: 오탐일 수 있으므로 DB 로 확인
+# 인덱스는 처음 사용할 때 DB 에서 만들어지고, 다른 워커에서 추가된 블랙리스트는
+# BLACKLIST_INDEX_SYNC_SECONDS 마다 새로 추가된 행만 가져와서 반영한다.
+# id 는 커밋 순서대로 보이지 않으므로 (작은 id 의 트랜잭션이 나중에 커밋될 수 있음) id > 마지막 id 뿐 아니라
+# 마지막 동기화 시각 - BLACKLIST_INDEX_SYNC_OVERLAP_SECONDS 이후에 추가된 행도 매번 다시 읽는다.
+
+
+class BloomFilter:
+    """
+    double hashing 방식의 블룸 필터
+    """
+
+    def __init__(self, capacity, error_rate=0.001):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class BlacklistIndex:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        인덱스를 비워서 다음 사용 시 DB 에서 다시 만들도록 한다
+        """
+        with self._lock:
+            self._bloom = None
+            self._recent = set()
+            self._last_id = 0
+            self._synced_at = 0.0
+            self._synced_since = None  # 마지막 동기화를 시작한 시각 (DB 의 blacklisted_at 과 비교)
+
+    def _capacity(self):
+        return getattr(settings, 'BLACKLIST_INDEX_CAPACITY', 100_000)
+
+    def _rebuild(self):
+        # 만료되지 않은 블랙리스트 JTI 로 블룸 필터를 새로 만든다
+        # (마지막 id 를 먼저 읽어서, 읽는 도중 추가된 행은 다음 동기화 때 반영)
+        started = timezone.now()
+        last_id = BlacklistedToken.objects.aggregate(Max('id'))['id__max'] or 0
+        jtis = list(BlacklistedToken.objects
+                    .filter(token__expires_at__gt=timezone.now())
+                    .values_list('token__jti', flat=True)
+                    .iterator(chunk_size=5000))
+
+        bloom = BloomFilter(max(self._capacity(), len(jtis) * 2))
+        for jti in jtis:
+            bloom.add(jti)
+        self._bloom, self._recent, self._last_id = bloom, set(), last_id
+        self._synced_at, self._synced_since = time.monotonic(), started
+
+    def _sync(self):
+        # 다른 워커에서 새로 추가된 블랙리스트만 가져온다
+        # (마지막 id 보다 작은 id 로 늦게 커밋된 행은 겹치는 시간 범위로 다시 읽어서 놓치지 않는다)
+        started = timezone.now()
+        overlap = timedelta(seconds=getattr(settings, 'BLACKLIST_INDEX_SYNC_OVERLAP_SECONDS', 300))
+        rows = (BlacklistedToken.objects
+                .filter(Q(id__gt=self._last_id) | Q(blacklisted_at__gte=self._synced_since - overlap))
+                .values_list('id', 'token__jti'))
+        for pk, jti in rows:
+            self._add(jti)
+            self._last_id = max(self._last_id, pk)
+        self._synced_at, self._synced_since = time.monotonic(), started
+
+    def _add(self, jti):
+        self._bloom.add(jti)
+        self._recent.add(jti)
+
+    def _ensure_fresh(self):
+        if self._bloom is None or len(self._recent) > self._capacity():
+            self._rebuild()
+        elif time.monotonic() - self._synced_at >= getattr(settings, 'BLACKLIST_INDEX_SYNC_SECONDS', 5):
+            self._sync()
+
+    def add(self, jti):
+        """
+        이 프로세스에서 블랙리스트에 추가한 토큰을 바로 반영
+        """
+        with self._lock:
+            self._ensure_fresh()
+            self._add(jti)
+
+    def is_blacklisted(self, jti):
+        with self._lock:
+            self._ensure_fresh()
+            if jti in self._recent:
+                return True
+            if jti not in self._bloom:
+                return False
+        # 블룸 필터 양성은 오탐일 수 있으므로 DB 로 확인
+        return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+
+blacklist_index = BlacklistIndex()
+
+
+class IndexedRefreshToken(RefreshToken):
+    """
+    블랙리스트 확인을 메모리 인덱스로 처리하는 리프레시 토큰
+    """
+
+    def check_blacklist(self):
+        if blacklist_index.is_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_('Token is blacklisted'))
+
+    def blacklist(self):
+        result = super().blacklist()
+        blacklist_index.add(self.payload[api_settings.JTI_CLAIM])
+        return result
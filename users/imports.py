@@ -0,0 +1,125 @@
+import csv
+import django
+import openpyxl
+from collections import defaultdict
+from django.contrib.auth.hashers import make_password
+from club.models import Club
+from team.models import Team
+
+
+# 유저 일괄 가입 (import_users 명령어) 도구
+
+COLUMNS = ('phone', 'password', 'username', 'birth', 'gender', 'club', 'team')
+
+
+class ImportFileError(Exception):
+    pass
+
+
+class RowError(ValueError):
+    # 파일을 읽는 단계에서 발견한 행 오류 (read_rows 가 행 대신 반환, 그 행만 건너뜀)
+    pass
+
+
+def read_rows(path):
+    """
+    CSV / XLSX 파일에서 (줄 번호, {컬럼: 문자열}) 을 한 행씩 읽는다 (첫 행은 컬럼 이름)
+    읽을 수 없는 행은 {컬럼: 문자열} 대신 RowError 를 반환
+    """
+    if path.lower().endswith('.xlsx'):
+        return _read_xlsx(path)
+    return _read_csv(path)
+
+
+def _read_csv(path):
+    with open(path, newline='', encoding='utf-8-sig') as file:
+        reader = csv.reader(file)
+        header = _header(next(reader, []))
+        for row in reader:
+            if any(value.strip() for value in row):
+                yield reader.line_num, _row(header, row)
+
+
+def _read_xlsx(path):
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = _header([_cell_text(value) for value in next(rows, ())])
+        phone = header.index('phone')
+        for line, values in enumerate(rows, start=2):
+            row = [_cell_text(value) for value in values]
+            if not any(row):
+                continue
+            if phone < len(values) and isinstance(values[phone], (int, float)):
+                # 숫자 셀은 엑셀이 앞자리 0 을 지우므로 (01012345678 -> 1012345678) 원래 번호를 알 수 없다
+                yield line, RowError(f'phone: 숫자 셀이라 앞자리 0 이 사라졌습니다. ({row[phone]}) '
+                                     f'전화번호 열을 텍스트 서식으로 저장해주세요.')
+                continue
+            yield line, _row(header, row)
+    finally:
+        workbook.close()
+
+
+def _cell_text(value):
+    # 숫자 셀(출생연도 등)은 1990.0 이 아니라 1990 으로 읽는다
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _header(row):
+    header = [name.strip().lower() for name in row]
+    missing = [name for name in ('phone', 'password', 'username') if name not in header]
+    if missing:
+        raise ImportFileError(f'필수 컬럼이 없습니다: {", ".join(missing)}')
+    return header
+
+
+def _row(header, values):
+    return {name: value.strip() for name, value in zip(header, values) if name in COLUMNS}
+
+
+class MembershipLookup:
+    """
+    클럽 / 팀 이름 -> id (시작할 때 한 번 읽어서 메모리에서 찾는다, 팀은 클럽 안에서 이름으로 찾음)
+    """
+
+    def __init__(self):
+        self.clubs = defaultdict(list)
+        for pk, name in Club.objects.values_list('id', 'name'):
+            self.clubs[name].append(pk)
+        self.teams = defaultdict(list)
+        for pk, club_id, name in Team.objects.values_list('id', 'club_id', 'name'):
+            self.teams[club_id, name].append(pk)
+
+    def resolve(self, club_name, team_name):
+        """
+        (club_id, team_id) - 찾을 수 없으면 ValueError
+        """
+        if not club_name:
+            if team_name:
+                raise ValueError('팀을 지정하려면 클럽도 필요합니다.')
+            return None, None
+        club_id = self._one(self.clubs.get(club_name), f'클럽 "{club_name}"')
+        if not team_name:
+            return club_id, None
+        return club_id, self._one(self.teams.get((club_id, team_name)), f'클럽 "{club_name}" 의 팀 "{team_name}"')
+
+    def _one(self, ids, label):
+        if not ids:
+            raise ValueError(f'{label} 을(를) 찾을 수 없습니다.')
+        if len(ids) > 1:
+            raise ValueError(f'{label} 이(가) 여러 개 있습니다.')
+        return ids[0]
+
+
+def init_hash_worker():
+    # spawn 방식으로 만든 프로세스는 장고 설정이 없으므로 다시 불러온다 (fork 방식이면 이미 설정되어 있음)
+    django.setup()
+
+
+def hash_password(password):
+    # 프로세스 풀에서 실행 (모듈 함수여야 pickle 가능)
+    return make_password(password)
@@ -0,0 +1,61 @@
+from .models import CustomUser
+from .serializers import UserInfoSerializer
+from core.cache import cached_data, versioned_data
+from core.conditional import make_validator
+
+
+def user_detail_validator(pk):
+    """
+    유저 상세 응답의 ETag validator (유저가 없으면 None)
+    유저 / 클럽 / 팀 과 각각의 이미지 updated_at 을 JOIN 쿼리 한 번으로 계산
+    """
+    user = CustomUser.objects.filter(pk=pk).values(
+        'updated_at', 'image_url__updated_at',
+        'club__updated_at', 'club__image_url__updated_at',
+        'team__updated_at', 'team__image_url__updated_at').first()
+    if user is None:
+        return None
+
+    return make_validator(user.values())
+
+
+# 유저 상세(프로필) 로더
+# 프로필은 유저 / 클럽 / 팀 태그의 버전을 키에 넣어서 캐시한다 (core.cache.versioned_data).
+# 태그 버전은 유저 / 클럽 / 팀 (과 각각의 이미지) 이 저장될 때 core.signals 에서 올라가므로
+# 셋 중 하나라도 바뀌면 키가 바뀌어서 다음 요청에서 JOIN 쿼리 한 번으로 다시 만든다.
+# 키를 만들려면 소속 클럽 / 팀 id 가 필요하므로 그것만 'user:{id}' 태그로 따로 캐시한다 (클럽 / 팀 이동은 유저 저장이므로 같이 무효화).
+def user_membership(pk):
+    """
+    유저의 {'club_id', 'team_id'} (유저가 없으면 None)
+    """
+    def build(tag):
+        tag(f'user:{pk}')
+        return CustomUser.objects.filter(pk=pk).values('club_id', 'team_id').first()
+
+    return cached_data(f'user:{pk}:membership', build)
+
+
+def membership_tags(pk, membership):
+    return [f'user:{pk}',
+            f'club:{membership["club_id"]}' if membership['club_id'] else None,
+            f'team:{membership["team_id"]}' if membership['team_id'] else None]
+
+
+def load_user_profile(pk):
+    """
+    UserInfoSerializer 응답 데이터 - 이미지 / 클럽 / 팀 / 클럽 이미지 / 팀 이미지를 JOIN 쿼리 한 번으로 조회 (유저가 없으면 None)
+    """
+    user = UserInfoSerializer.setup_eager_loading(CustomUser.objects.filter(pk=pk)).first()
+    if user is None:
+        return None
+    return UserInfoSerializer(user).data
+
+
+def user_profile(pk):
+    """
+    캐시된 프로필 (유저가 없으면 None)
+    """
+    membership = user_membership(pk)
+    if membership is None:
+        return None
+    return versioned_data(f'user:{pk}:profile', membership_tags(pk, membership), lambda: load_user_profile(pk))
@@ -0,0 +1,86 @@
+from django.contrib.auth import authenticate
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from rest_framework import serializers
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from core.benchmark import benchmark_database, run_timed, format_result
+from users.authentication import StatelessJWTAuthentication
+from users.models import CustomUser
+from users.serializers import CustomTokenObtainPairSerializer
+from users.views import LoginView
+
+
+class WhoAmIView(APIView):
+    # 인증된 유저의 id 만 사용하는 뷰
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request):
+        return Response({'id': request.user.id})
+
+
+class DoubleIssueTokenObtainPairSerializer(CustomTokenObtainPairSerializer):
+    # 비교용: 예전 로그인 방식 (authenticate 2번 + 토큰 2번 발급)
+    def validate(self, attrs):
+        self.user = authenticate(phone=attrs.get(self.username_field), password=attrs.get('password'))
+        if self.user is None or not self.user.is_active:
+            raise serializers.ValidationError('로그인 실패')
+        data = super(CustomTokenObtainPairSerializer, self).validate(attrs)
+        refresh = self.get_token(self.user)
+        data['access'] = str(refresh.access_token)
+        data['refresh'] = str(refresh)
+        return data
+
+
+class Command(BaseCommand):
+    help = '인증 / 로그인 벤치마크 (임시 테스트 DB 에서 실행): 처리량과 요청당 쿼리 수를 비교'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scenario', choices=['auth', 'login', 'all'], default='all')
+        parser.add_argument('--iterations', type=int, default=2000, help='auth 시나리오 반복 횟수')
+        parser.add_argument('--logins', type=int, default=20, help='login 시나리오 반복 횟수 (비밀번호 해시 때문에 느림)')
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            self.user = CustomUser.objects.create_user(phone='01000000000', password='benchmark-password',
+                                                       username='bench', gender='male', birth=1990)
+            self.request_factory = RequestFactory()
+            if options['scenario'] in ('auth', 'all'):
+                self.bench_authentication(options['iterations'])
+            if options['scenario'] in ('login', 'all'):
+                self.bench_login(options['logins'])
+
+    def bench_authentication(self, iterations):
+        access = str(CustomTokenObtainPairSerializer.get_token(self.user).access_token)
+
+        self.stdout.write('요청 인증 (Authorization: Bearer ...)')
+        for name, authentication_class in (('JWTAuthentication (기존)', JWTAuthentication),
+                                           ('StatelessJWTAuthentication', StatelessJWTAuthentication)):
+            view = WhoAmIView.as_view(authentication_classes=(authentication_class,))
+
+            def request():
+                response = view(self.request_factory.get('/', HTTP_AUTHORIZATION=f'Bearer {access}'))
+                assert response.status_code == 200, response.data
+
+            self.stdout.write(format_result(name, run_timed(request, iterations)))
+
+    def bench_login(self, logins):
+        # 대회 체크인처럼 로그인이 몰릴 때의 초당 로그인 처리량
+        self.stdout.write('로그인 (POST auth/signin/)')
+        for name, serializer_class in (('토큰 2번 발급 (기존)', DoubleIssueTokenObtainPairSerializer),
+                                       ('토큰 1번 발급', CustomTokenObtainPairSerializer)):
+            view = LoginView.as_view(serializer_class=serializer_class)
+
+            def login():
+                request = self.request_factory.post('/', {'phone': '01000000000', 'password': 'benchmark-password'},
+                                                    content_type='application/json')
+                response = view(request)
+                assert response.status_code == 200, response.data
+
+            before = OutstandingToken.objects.count()
+            result = run_timed(login, logins, warmup=1)
+            rows = (OutstandingToken.objects.count() - before) / (logins + 1)
+            self.stdout.write(f'{format_result(name, result)}  outstanding tokens/login {rows:.1f}')
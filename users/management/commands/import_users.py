@@ -0,0 +1,128 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+from core.cache import invalidate
+from users.imports import ImportFileError, MembershipLookup, RowError, hash_password, init_hash_worker, read_rows
+from users.models import CustomUser
+from users.serializers import ImportUserSerializer
+
+
+class Command(BaseCommand):
+    help = ('CSV / XLSX 멤버 목록으로 유저 일괄 가입 '
+            '(컬럼: phone, password, username, birth, gender, club, team - 클럽 / 팀은 이름, 오류가 있는 행만 건너뜀)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV(UTF-8) 또는 XLSX 파일')
+        parser.add_argument('--club', default='', help='club 컬럼이 비어 있는 행에 사용할 클럽 이름')
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='비밀번호 해시 프로세스 수 (0 이면 현재 프로세스에서 해시)')
+        parser.add_argument('--dry-run', action='store_true', help='저장하지 않고 검증만 실행')
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.lookup = MembershipLookup()
+        self.pool = None
+        if options['workers'] > 0 and not options['dry_run']:
+            self.pool = ProcessPoolExecutor(options['workers'], initializer=init_hash_worker)
+
+        started = time.perf_counter()
+        rows = created = failed = 0
+        self.seen_phones = set()
+        try:
+            reader = read_rows(options['path'])
+            while True:
+                batch = list(islice(reader, options['batch_size']))
+                if not batch:
+                    break
+                count, errors = self.import_batch(batch)
+                rows += len(batch)
+                created += count
+                failed += len(errors)
+                for line, message in errors:
+                    self.stderr.write(f'{line}행: {message}')
+        except (ImportFileError, OSError) as e:
+            raise CommandError(e)
+        finally:
+            if self.pool is not None:
+                self.pool.shutdown()
+
+        elapsed = time.perf_counter() - started
+        verb = '검증' if options['dry_run'] else '등록'
+        self.stdout.write(f'{rows}행 중 {created}명 {verb}, 오류 {failed}행 '
+                          f'({elapsed:.2f}초, {rows / elapsed if elapsed else 0:.0f} rows/s)')
+
+    def import_batch(self, batch):
+        """
+        한 배치를 검증 / 저장하고 (저장한 유저 수, [(줄 번호, 오류 메세지)]) 를 반환
+        """
+        errors = []
+        valid = []
+        for line, row in batch:
+            try:
+                valid.append((line, self.validate(row)))
+            except ValueError as e:
+                errors.append((line, str(e)))
+
+        # 이미 가입된 전화번호는 배치마다 한 번에 확인 (탈퇴한 유저 포함, CreateUserSerializer 와 같은 규칙)
+        phones = [data['phone'] for _, data in valid]
+        existing = set(CustomUser.all_objects.filter(phone__in=phones).values_list('phone', flat=True))
+        if existing:
+            errors += [(line, f'phone: 이미 가입된 전화번호입니다. ({data["phone"]})')
+                       for line, data in valid if data['phone'] in existing]
+            valid = [(line, data) for line, data in valid if data['phone'] not in existing]
+
+        if self.options['dry_run'] or not valid:
+            return len(valid), errors
+
+        passwords = [data.pop('password') for _, data in valid]
+        users = [CustomUser(password=password, **data) for (_, data), password in zip(valid, self.hash(passwords))]
+        count, insert_errors = self.insert(valid, users)
+
+        # bulk_create 는 post_save 를 보내지 않으므로 클럽 / 팀 멤버 목록 캐시를 직접 무효화
+        invalidate(*{f'club-members:{user.club_id}' for user in users if user.club_id},
+                   *{f'team-members:{user.team_id}' for user in users if user.team_id})
+        return count, errors + insert_errors
+
+    def validate(self, row):
+        if isinstance(row, RowError):
+            raise row
+        serializer = ImportUserSerializer(data=row)
+        if not serializer.is_valid():
+            raise ValueError(' / '.join(f'{field}: {" ".join(str(error) for error in field_errors)}'
+                                        for field, field_errors in serializer.errors.items()))
+        data = dict(serializer.validated_data)
+        if data['phone'] in self.seen_phones:
+            raise ValueError(f'phone: 파일 안에 같은 전화번호가 있습니다. ({data["phone"]})')
+        self.seen_phones.add(data['phone'])
+
+        data['club_id'], data['team_id'] = self.lookup.resolve(row.get('club') or self.options['club'], row.get('team'))
+        return data
+
+    def hash(self, passwords):
+        if self.pool is None:
+            return [hash_password(password) for password in passwords]
+        chunksize = max(1, len(passwords) // (self.options['workers'] * 4))
+        return list(self.pool.map(hash_password, passwords, chunksize=chunksize))
+
+    def insert(self, valid, users):
+        try:
+            with transaction.atomic():
+                CustomUser.objects.bulk_create(users)
+            return len(users), []
+        except IntegrityError:
+            # 검증 후 다른 요청으로 같은 전화번호가 가입된 경우: 한 행씩 저장해서 실패한 행만 건너뜀
+            pass
+
+        count, errors = 0, []
+        for (line, data), user in zip(valid, users):
+            try:
+                with transaction.atomic():
+                    user.save(force_insert=True)
+                count += 1
+            except IntegrityError as e:
+                errors.append((line, f'저장 실패: {e}'))
+        return count, errors
@@ -0,0 +1,35 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken, BlacklistedToken
+
+
+class Command(BaseCommand):
+    help = '만료된 OutstandingToken / BlacklistedToken 행을 작은 배치로 나눠서 삭제 (테이블을 오래 잠그지 않음)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--sleep', type=float, default=0.05, help='배치 사이 대기 시간(초)')
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        deleted = 0
+        while True:
+            # 만료된 토큰 id 를 배치 크기만큼만 가져와서, 짧은 트랜잭션으로 삭제
+            ids = list(OutstandingToken.objects
+                       .filter(expires_at__lt=now)
+                       .order_by('id')
+                       .values_list('id', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+
+            with transaction.atomic():
+                BlacklistedToken.objects.filter(token_id__in=ids).delete()
+                OutstandingToken.objects.filter(id__in=ids).delete()
+            deleted += len(ids)
+
+            if options['sleep']:
+                time.sleep(options['sleep'])
+
+        self.stdout.write(f'만료된 토큰 {deleted}개 삭제')
@@ -0,0 +1,26 @@
+# Generated by Django 5.0.14 on 2026-10-18 19:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('club', '0009_club_is_deleted_id_idx'),
+        ('image_url', '0016_imageurl_content_hash'),
+        ('team', '0008_team_team_is_deleted_club_idx'),
+        ('tier', '0003_alter_tier_id'),
+        ('users', '0009_customuser_is_deleted'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['is_deleted', 'club'], name='users_is_deleted_club_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['is_deleted', 'team'], name='users_is_deleted_team_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.0.14 on 2026-10-18 19:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('club', '0010_club_club_updated_at_id_idx'),
+        ('image_url', '0017_imageurl_image_url_updated_at_id_idx'),
+        ('team', '0009_team_team_updated_at_id_idx'),
+        ('tier', '0004_tier_tier_updated_at_id_idx'),
+        ('users', '0010_customuser_users_is_deleted_club_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['updated_at', 'id'], name='users_updated_at_id_idx'),
+        ),
+    ]
@@ -4,11 +4,12 @@ from club.models import Club
 from team.models import Team
 from tier.models import Tier
 from image_url.models import ImageUrl
-from core.models import SoftDeleteModel , TimeStampedModel
+from core.models import SoftDeleteModel , SoftDeleteManager, TimeStampedModel
 from django.core.validators import MinValueValidator, MaxValueValidator
 
 # CustomUserManager 정의 (CustomUser모델을 사용하려면 필수적으로 필요한 매니저)
-class CustomUserManager(BaseUserManager):
+# SoftDeleteManager 를 같이 상속해서 삭제(탈퇴)된 유저는 조회 / 로그인 대상에서 빠진다
+class CustomUserManager(SoftDeleteManager, BaseUserManager):
     def create_user(self, phone, password=None, **extra_fields):
         if not phone:
             raise ValueError('The Phone number must be set')
@@ -65,4 +66,11 @@ class CustomUser(AbstractBaseUser, PermissionsMixin, SoftDeleteModel, TimeStampe
     
 
     class Meta:
-        db_table = 'users'
\ No newline at end of file
+        db_table = 'users'
+        indexes = [
+            # 삭제되지 않은 클럽 / 팀 소속 유저 조회용 복합 인덱스
+            models.Index(fields=['is_deleted', 'club'], name='users_is_deleted_club_idx'),
+            models.Index(fields=['is_deleted', 'team'], name='users_is_deleted_team_idx'),
+            # 변경분 동기화 키셋 스캔용 (core.sync)
+            models.Index(fields=['updated_at', 'id'], name='users_updated_at_id_idx'),
+        ]
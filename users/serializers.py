@@ -1,12 +1,16 @@
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.settings import api_settings
+from django.contrib.auth.models import update_last_login
 from django.contrib.auth import get_user_model , authenticate
+from django.db import transaction
 from rest_framework import serializers
+from rest_framework.validators import UniqueValidator
 from .models import CustomUser, Club
-from image_url.models import ImageUrl
-from image_url.utils import S3ImageUploader
-from image_url.serializers import ImageUrlSerializer
+from image_url.uploads import enqueue_upload
+from image_url.serializers import ImageUrlSerializer, VARIANT_CARD
 from club.serializers import ClubDetailSerializer
 from team.serializers import TeamDetailSerializer
+from core.serializers import EagerLoadingMixin
 
 
 User = get_user_model()
@@ -21,6 +25,8 @@ class CreateUserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ('phone', 'password', 'username', 'birth', 'gender', 'club', 'image_file', 'image_url')
+        # 기본 매니저는 탈퇴한 유저를 숨기므로 전화번호 중복은 탈퇴한 유저까지 포함해서 확인
+        extra_kwargs = {'phone': {'validators': [UniqueValidator(queryset=User.all_objects.all())]}}
         
     def get_image_url(self, obj):
         if hasattr(obj, 'image_url'):
@@ -29,31 +35,34 @@ class CreateUserSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         image_data = validated_data.pop('image_file', None)
-        user = User.objects.create_user(
-            phone=validated_data['phone'],
-            password=validated_data['password'],
-            username=validated_data['username'],
-            birth=validated_data.get('birth'),
-            gender=validated_data.get('gender'),
-            club=validated_data.get('club', None)
-        )
-        
-        if image_data:
-            uploader = S3ImageUploader()
-            file_url, extension, size = uploader.upload_file(image_data)
-            
-            # 업로드된 이미지 정보를 ImageUrl 인스턴스로 저장
-            image_instance = ImageUrl.objects.create(
-                image_url=file_url,
-                extension=extension,
-                size=size
+        # 유저 / 이미지 행은 함께 저장 (실패하면 둘 다 롤백되고 업로드도 예약되지 않음)
+        with transaction.atomic():
+            user = User.objects.create_user(
+                phone=validated_data['phone'],
+                password=validated_data['password'],
+                username=validated_data['username'],
+                birth=validated_data.get('birth'),
+                gender=validated_data.get('gender'),
+                club=validated_data.get('club', None)
             )
-            user.image_url = image_instance  # 사용자 인스턴스에 이미지 인스턴스 할당
-            user.save()  # 변경 사항 저장
+            
+            if image_data:
+                # 파일은 스풀에 저장만 하고 S3 업로드는 백그라운드에서 진행 (완료 전까지 image_url 은 pending 상태)
+                user.image_url = enqueue_upload(image_data)  # 사용자 인스턴스에 이미지 인스턴스 할당
+                user.save()  # 변경 사항 저장
             
         return user
 
 
+# 일괄 가입(import_users 명령어) 행 검증 serializer - CreateUserSerializer 와 같은 규칙으로 검증
+# 전화번호 중복은 명령어에서 배치 단위로 한 번에 확인하고, 클럽 / 팀은 이름으로 찾아서 명령어에서 채운다
+class ImportUserSerializer(CreateUserSerializer):
+
+    class Meta(CreateUserSerializer.Meta):
+        fields = ('phone', 'password', 'username', 'birth', 'gender')
+        extra_kwargs = {'phone': {'validators': []}}
+
+
 # 로그인 부분 serializer ##
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
@@ -64,7 +73,16 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         token = super().get_token(user)
 
         # Add custom claims
+        return cls.add_user_claims(token, user)
+
+    @classmethod
+    def add_user_claims(cls, token, user):
+        # 인증 시 DB 조회 없이 유저를 만들 수 있도록 필요한 정보를 클레임에 포함 (users.authentication.ClaimsUser)
+        # 액세스 토큰 리프레시에서도 DB 에서 읽은 유저로 다시 채운다 (RefreshAccessTokenView)
         token['phone'] = user.phone
+        token['is_active'] = user.is_active
+        token['club'] = user.club_id
+        token['team'] = user.team_id
         
         return token
 
@@ -74,25 +92,31 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
             'phone': attrs.get(self.username_field),
             'password': attrs.get('password'),
         }
-        
+        if 'request' in self.context:
+            authenticate_kwargs['request'] = self.context['request']
+
+        # 비밀번호 해시 검증은 여기서 한 번만 실행 (super().validate() 는 인증을 다시 하므로 호출하지 않음)
         self.user = authenticate(**authenticate_kwargs)
         if self.user is None or not self.user.is_active:
             raise serializers.ValidationError('로그인에 실패하였습니다. 전화번호와 비밀번호를 확인해 주세요.')
-        
-        # 토큰 발급
-        data = super().validate(attrs)
+
+        # 토큰 발급 (리프레시 토큰 1개 = OutstandingToken 1행)
         refresh = self.get_token(self.user)
-        data['access'] = str(refresh.access_token)
-        data['refresh'] = str(refresh)
-        
-        
+        data = {
+            'refresh': str(refresh),
+            'access': str(refresh.access_token),
+        }
+
+        if api_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, self.user)
+
         return data
 
 
 
 # 유저 상세정보 serializer
-class UserInfoSerializer(serializers.ModelSerializer):
-    image_url = ImageUrlSerializer(read_only=True)  # ImageUrl 모델에 대한 시리얼라이저를 사용
+class UserInfoSerializer(EagerLoadingMixin, serializers.ModelSerializer):
+    image_url = ImageUrlSerializer(read_only=True, variant=VARIANT_CARD)  # ImageUrl 모델에 대한 시리얼라이저를 사용
     club = ClubDetailSerializer(read_only=True)
     team = TeamDetailSerializer(read_only=True)
     
@@ -1,3 +1,327 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+import openpyxl
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, RequestFactory, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken, BlacklistedToken
+from rest_framework_simplejwt.tokens import RefreshToken, AccessToken
+from .authentication import StatelessJWTAuthentication, ClaimsUser, load_user
+from .blacklist import blacklist_index, IndexedRefreshToken
+from .loaders import load_user_profile
+from .models import CustomUser
+from .serializers import CustomTokenObtainPairSerializer, UserInfoSerializer
+from club.models import Club
+from club.tests import make_club
+from team.models import Team
 
-# Create your tests here.
+
+def make_user(phone='01012345678', password='test-password-1234', **extra_fields):
+    extra_fields.setdefault('username', '테스트유저')
+    extra_fields.setdefault('gender', 'male')
+    extra_fields.setdefault('birth', 1990)
+    return CustomUser.objects.create_user(phone=phone, password=password, **extra_fields)
+
+
+class StatelessJWTAuthenticationTest(TestCase):
+
+    def setUp(self):
+        self.club = Club.objects.create(name='클럽')
+        self.user = make_user(club=self.club)
+
+    def request(self, user):
+        access = CustomTokenObtainPairSerializer.get_token(user).access_token
+        return RequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {access}')
+
+    def authenticate(self, user):
+        return StatelessJWTAuthentication().authenticate(self.request(user))
+
+    def test_user_is_built_from_claims_without_queries(self):
+        request = self.request(self.user)
+        with self.assertNumQueries(0):
+            user, _ = StatelessJWTAuthentication().authenticate(request)
+
+        self.assertIsInstance(user, ClaimsUser)
+        self.assertEqual(user.id, self.user.pk)
+        self.assertEqual(user.phone, self.user.phone)
+        self.assertEqual(user.club_id, self.club.pk)
+        self.assertIsNone(user.team_id)
+        self.assertTrue(user.is_authenticated)
+
+    def test_inactive_claim_is_rejected(self):
+        self.user.is_active = False
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(self.user)
+
+    @override_settings(JWT_USER_CACHE_TTL=60)
+    def test_full_user_is_cached_until_saved(self):
+        user, _ = self.authenticate(self.user)
+        self.assertEqual(user.get_full_user(), self.user)
+        with self.assertNumQueries(0):
+            load_user(self.user.pk)
+
+        # 같은 프로세스에서 수정되면 캐시에서 제거
+        self.user.username = '새이름'
+        self.user.save()
+        self.assertEqual(load_user(self.user.pk).username, '새이름')
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class LoginViewTest(TestCase):
+
+    def setUp(self):
+        self.user = make_user()
+
+    def login(self, password='test-password-1234'):
+        return self.client.post(reverse('login'), {'phone': self.user.phone, 'password': password},
+                                content_type='application/json')
+
+    def test_login_issues_a_single_token_pair(self):
+        # 유저 조회 1번 + OutstandingToken INSERT 1번
+        with self.assertNumQueries(2):
+            response = self.login()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['message'], '로그인 완료')
+        self.assertEqual(OutstandingToken.objects.count(), 1)
+        # 쿠키의 리프레시 토큰과 응답의 액세스 토큰은 같은 발급에서 나온 것
+        refresh = RefreshToken(response.cookies['refresh'].value)
+        self.assertEqual(OutstandingToken.objects.get().jti, refresh['jti'])
+        self.assertEqual(AccessToken(response.json()['access'])['user_id'], str(self.user.pk))
+
+    def test_wrong_password(self):
+        response = self.login(password='wrong')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(OutstandingToken.objects.count(), 0)
+
+
+@override_settings(BLACKLIST_INDEX_SYNC_SECONDS=3600)
+class BlacklistIndexTest(TestCase):
+
+    def setUp(self):
+        blacklist_index.reset()
+        self.user = make_user()
+
+    def tearDown(self):
+        blacklist_index.reset()
+
+    def test_refresh_only_loads_the_user_once_index_is_loaded(self):
+        refresh = RefreshToken.for_user(self.user)
+        blacklist_index.is_blacklisted('warm-up')
+
+        # 블랙리스트 확인은 DB 조회 없음, 새 클레임을 위한 유저 조회 1번
+        self.client.cookies['refresh'] = str(refresh)
+        with self.assertNumQueries(1):
+            response = self.client.post(reverse('token_refresh'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('access', response.json())
+
+    def test_blacklisted_token_is_rejected(self):
+        refresh = IndexedRefreshToken.for_user(self.user)
+        refresh.blacklist()
+
+        with self.assertNumQueries(0):
+            self.assertTrue(blacklist_index.is_blacklisted(refresh['jti']))
+
+        self.client.cookies['refresh'] = str(refresh)
+        self.assertEqual(self.client.post(reverse('token_refresh')).status_code, 400)
+
+    def test_index_is_rebuilt_from_database_and_synced(self):
+        existing = RefreshToken.for_user(self.user)
+        existing.blacklist()
+        self.assertTrue(blacklist_index.is_blacklisted(existing['jti']))
+
+        # 다른 워커에서 추가된 블랙리스트는 동기화 주기가 지나면 반영
+        other = RefreshToken.for_user(self.user)
+        other.blacklist()
+        with override_settings(BLACKLIST_INDEX_SYNC_SECONDS=0):
+            self.assertTrue(blacklist_index.is_blacklisted(other['jti']))
+        self.assertFalse(blacklist_index.is_blacklisted('unknown-jti'))
+
+    def test_rows_committed_out_of_id_order_are_synced(self):
+        blacklist_index.is_blacklisted('warm-up')
+        tokens = [RefreshToken.for_user(self.user) for _ in range(2)]
+        outstanding = [OutstandingToken.objects.get(jti=token['jti']) for token in tokens]
+
+        # id 가 큰 행이 먼저 커밋되어 동기화된 뒤에, id 가 작은 행이 커밋되는 경우
+        BlacklistedToken.objects.create(id=1000, token=outstanding[1])
+        with override_settings(BLACKLIST_INDEX_SYNC_SECONDS=0):
+            self.assertTrue(blacklist_index.is_blacklisted(tokens[1]['jti']))
+            BlacklistedToken.objects.create(id=500, token=outstanding[0])
+            self.assertTrue(blacklist_index.is_blacklisted(tokens[0]['jti']))
+
+
+class RefreshAccessTokenTest(TestCase):
+
+    def setUp(self):
+        blacklist_index.reset()
+        self.club = Club.objects.create(name='클럽')
+        self.user = make_user(club=self.club)
+        self.client.cookies['refresh'] = str(CustomTokenObtainPairSerializer.get_token(self.user))
+
+    def tearDown(self):
+        blacklist_index.reset()
+
+    def refresh(self):
+        return self.client.post(reverse('token_refresh'))
+
+    def test_access_token_has_current_claims(self):
+        other = Club.objects.create(name='다른클럽')
+        self.user.club = other
+        self.user.save()
+
+        response = self.refresh()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(AccessToken(response.json()['access'])['club'], other.pk)
+
+    def test_inactive_user_is_rejected(self):
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.refresh().status_code, 400)
+
+    def test_deleted_user_is_rejected(self):
+        CustomUser.objects.filter(pk=self.user.pk).delete()
+        self.assertEqual(self.refresh().status_code, 400)
+
+
+class PruneTokensCommandTest(TestCase):
+
+    def test_only_expired_tokens_are_deleted(self):
+        user = make_user()
+        now = timezone.now()
+        for i in range(5):
+            token = OutstandingToken.objects.create(user=user, jti=f'expired-{i}', token='t', expires_at=now - timedelta(days=1))
+            BlacklistedToken.objects.create(token=token)
+        OutstandingToken.objects.create(user=user, jti='valid', token='t', expires_at=now + timedelta(days=1))
+
+        call_command('prune_tokens', batch_size=2, sleep=0, stdout=StringIO())
+
+        self.assertEqual(list(OutstandingToken.objects.values_list('jti', flat=True)), ['valid'])
+        self.assertEqual(BlacklistedToken.objects.count(), 0)
+
+
+class UserProfileCacheTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.club = make_club(members=2, teams=1, coaches=0)
+        self.user = CustomUser.objects.filter(club=self.club).first()
+
+    def get(self, pk=None):
+        return self.client.get(reverse('user-detail', args=[pk or self.user.pk]))
+
+    def test_profile_is_loaded_with_one_joined_query(self):
+        with self.assertNumQueries(1):
+            data = load_user_profile(self.user.pk)
+        self.assertEqual(data, UserInfoSerializer(CustomUser.objects.get(pk=self.user.pk)).data)
+
+    def test_club_and_team_saves_change_the_profile_version(self):
+        self.get()
+        for instance in (self.club, self.user.team):
+            instance.name = f'{instance.name}-변경'
+            instance.save()
+            # validator 1번 + 프로필 1번 (소속 클럽 / 팀 id 는 캐시)
+            with self.assertNumQueries(2):
+                data = self.get().json()
+            self.assertEqual(data['club']['name'], Club.objects.get(pk=self.club.pk).name)
+            self.assertEqual(data['team']['name'], self.user.team.name)
+            with self.assertNumQueries(0):
+                self.get()
+
+    def test_moving_to_another_team_is_reflected(self):
+        self.get()
+        other_team = Team.objects.create(name='다른팀', club=self.club)
+        self.user.team = other_team
+        self.user.save()
+        self.assertEqual(self.get().json()['team']['name'], '다른팀')
+
+    def test_missing_user_is_404(self):
+        self.assertEqual(self.get(pk=999999).status_code, 404)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class ImportUsersCommandTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.club = make_club(members=1, teams=1, coaches=0)
+        self.team = Team.objects.get(club=self.club)
+
+    def import_csv(self, lines, *args):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'members.csv')
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write('\n'.join(['phone,password,username,birth,gender,club,team', *lines]))
+        out, err = StringIO(), StringIO()
+        call_command('import_users', path, '--workers', '0', '--batch-size', '2', *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_valid_rows_are_created_and_errors_reported_per_row(self):
+        deleted = make_user(phone='01099999999')
+        deleted.delete()
+        out, err = self.import_csv([
+            f'01000000001,password-1,유저1,1990,male,{self.club.name},{self.team.name}',
+            '01000000002,password-2,유저2,1991,female,,',
+            '01000000001,password-3,중복,1990,male,,',
+            '01099999999,password-4,탈퇴한번호,1990,male,,',
+            '01000000005,password-5,나이,1800,male,,',
+            f'01000000006,password-6,없는팀,1990,male,{self.club.name},없는팀',
+            '01000000007,password-7,유저7,1992,male,,',
+        ])
+
+        self.assertIn('7행 중 3명 등록, 오류 4행', out)
+        for line in (4, 5, 6, 7):
+            self.assertIn(f'{line}행: ', err)
+        user = CustomUser.objects.get(phone='01000000001')
+        self.assertEqual((user.club_id, user.team_id, user.username), (self.club.pk, self.team.pk, '유저1'))
+        self.assertTrue(user.check_password('password-1'))
+        self.assertEqual(CustomUser.objects.filter(phone__in=['01000000002', '01000000007']).count(), 2)
+
+    def test_club_member_caches_are_invalidated(self):
+        before = self.client.get(reverse('club-detail', args=[self.club.pk])).json()
+        self.import_csv([f'01000000001,password-1,새멤버,1990,male,,{self.team.name}'], '--club', self.club.name)
+        after = self.client.get(reverse('club-detail', args=[self.club.pk])).json()
+        self.assertEqual(len(after['users']), len(before['users']) + 1)
+
+    def test_xlsx_rows_are_imported_and_numeric_phones_rejected(self):
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.append(['Phone', 'Password', 'Username', 'Birth', 'Gender', 'Club', 'Team'])
+        sheet.append(['01000000001', 'password-1', '유저1', 1990, 'male', self.club.name, self.team.name])
+        sheet.append([1000000002, 'password-2', '숫자셀', 1991, 'female', None, None])
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'members.xlsx')
+        workbook.save(path)
+
+        out, err = StringIO(), StringIO()
+        call_command('import_users', path, '--workers', '0', stdout=out, stderr=err)
+
+        self.assertIn('2행 중 1명 등록, 오류 1행', out.getvalue())
+        self.assertIn('3행: phone: 숫자 셀이라 앞자리 0 이 사라졌습니다. (1000000002)', err.getvalue())
+        user = CustomUser.objects.get(phone='01000000001')
+        self.assertEqual((user.birth, user.club_id, user.team_id), (1990, self.club.pk, self.team.pk))
+        self.assertFalse(CustomUser.all_objects.filter(username='숫자셀').exists())
+
+    def test_passwords_are_hashed_in_worker_processes(self):
+        out, _ = self.import_csv([
+            '01000000001,password-1,유저1,1990,male,,',
+            '01000000002,password-2,유저2,1991,female,,',
+            '01000000003,password-3,유저3,1992,male,,',
+        ], '--workers', '1')
+
+        self.assertIn('3행 중 3명 등록', out)
+        for i in (1, 2, 3):
+            self.assertTrue(CustomUser.objects.get(phone=f'0100000000{i}').check_password(f'password-{i}'))
+
+    def test_dry_run_writes_nothing(self):
+        out, _ = self.import_csv(['01000000001,password-1,유저1,1990,male,,'], '--dry-run')
+        self.assertIn('1명 검증', out)
+        self.assertFalse(CustomUser.all_objects.filter(phone='01000000001').exists())
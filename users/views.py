@@ -1,11 +1,13 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.request import Request
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework import status
 from rest_framework_simplejwt.views import TokenObtainPairView
-from .serializers import CreateUserSerializer, CustomTokenObtainPairSerializer, UserInfoSerializer
-from .models import CustomUser
+from .serializers import CreateUserSerializer, CustomTokenObtainPairSerializer
+from core.cache import cached_data
+from core.conditional import conditional_response
+from .loaders import user_detail_validator, user_membership, membership_tags, user_profile
+from image_url.upload_handlers import StreamingUploadMixin
 
 
 
@@ -14,7 +16,7 @@ from .models import CustomUser
 
 
 # 회원가입 view ##
-class CreateUserView(APIView):
+class CreateUserView(StreamingUploadMixin, APIView):
 
     def post(self, request, *args, **kwargs):
         serializer = CreateUserSerializer(data=request.data)  # request.data를 직접 사용
@@ -42,18 +44,25 @@ class CreateUserView(APIView):
 ## 로그인 ##
 from rest_framework import status
 from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.exceptions import TokenError, InvalidToken
 
 
 class LoginView(TokenObtainPairView):
     def post(self, request: Request, *args, **kwargs) -> Response:
-        res = super().post(request, *args, **kwargs)
-        
+        # 인증 / 토큰 발급은 serializer 에서 한 번만 실행하고, 그 결과로 바로 응답을 만든다
+        serializer = self.get_serializer(data=request.data)
+        try:
+            serializer.is_valid(raise_exception=True)
+        except TokenError as e:
+            raise InvalidToken(e.args[0])
+        tokens = serializer.validated_data
+
         response = Response({
             "message": "로그인 완료",
-            "access": str(res.data.get('access', None))
+            "access": tokens['access']
             }, status= status.HTTP_200_OK)
         
-        response.set_cookie("refresh", res.data.get('refresh', None), httponly= True)
+        response.set_cookie("refresh", tokens['refresh'], httponly= True)
         
         return response
     
@@ -75,6 +84,10 @@ class LogoutView(APIView):
 
 ## 액세스 토큰 리프레시 ##
 from rest_framework.permissions import AllowAny
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+from .blacklist import IndexedRefreshToken
+from .models import CustomUser
 
 class RefreshAccessTokenView(APIView):
     permission_classes = (AllowAny,)
@@ -86,21 +99,30 @@ class RefreshAccessTokenView(APIView):
             return Response({"error": "리프레시 토큰이 없습니다."}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            token = RefreshToken(refresh_token)
-            new_access_token = str(token.access_token)
+            # 블랙리스트 확인은 메모리 인덱스로 처리 (대부분의 경우 DB 조회 없음, users.blacklist 참고)
+            token = IndexedRefreshToken(refresh_token)
+        except Exception as e:
+            return Response({"error": "인증되지 않은 리프레시 토큰입니다."}, status=status.HTTP_400_BAD_REQUEST)
 
-            # 필요하다면 새 리프레시 토큰도 생성하여 반환할 수 있습니다. 
-            # new_refresh_token = str(token)
+        # 리프레시 토큰의 클레임은 발급 당시 값이므로 유저를 다시 읽어서 새 클레임으로 액세스 토큰을 만든다
+        # (비활성화 / 탈퇴한 유저는 거부, 클럽 / 팀 변경도 새 액세스 토큰에 반영)
+        user = CustomUser.objects.filter(pk=token[api_settings.USER_ID_CLAIM]).first()
+        if user is None or not user.is_active:
+            return Response({"error": "인증되지 않은 리프레시 토큰입니다."}, status=status.HTTP_400_BAD_REQUEST)
 
-            response = Response()
-            response.data = {
-                'access': new_access_token,
-                # 'refresh': new_refresh_token,
-            }
+        access = CustomTokenObtainPairSerializer.add_user_claims(AccessToken.for_user(user), user)
+        new_access_token = str(access)
 
-            return response
-        except Exception as e:
-            return Response({"error": "인증되지 않은 리프레시 토큰입니다."}, status=status.HTTP_400_BAD_REQUEST)
+        # 필요하다면 새 리프레시 토큰도 생성하여 반환할 수 있습니다. 
+        # new_refresh_token = str(token)
+
+        response = Response()
+        response.data = {
+            'access': new_access_token,
+            # 'refresh': new_refresh_token,
+        }
+
+        return response
         
         
         
@@ -113,6 +135,23 @@ class UserDetailView(APIView):
     """
 
     def get(self, request, pk):
-        user = CustomUser.objects.get(pk=pk)
-        serializer = UserInfoSerializer(user)
-        return Response(serializer.data, status=status.HTTP_200_OK)
\ No newline at end of file
+        # 유저 / 소속 클럽, 팀이 바뀌면 시그널로 캐시가 무효화된다 (core.signals 참고)
+        def build_validator(tag):
+            tag(f'user:{pk}')
+            # 소속 클럽 / 팀 id 는 유저 태그 버전을 읽은 뒤에 (캐시에서) 가져온다
+            membership = user_membership(pk)
+            if membership is None:
+                return None
+            tag(*membership_tags(pk, membership))
+            return user_detail_validator(pk)
+
+        # 클라이언트가 가진 데이터가 최신이면 (If-None-Match) serializer 없이 304 응답
+        validator = cached_data(f'user:{pk}:validator', build_validator)
+        return conditional_response(request, validator, lambda: self.get_detail(pk))
+
+    def get_detail(self, pk):
+        # 유저 / 클럽 / 팀 버전이 들어간 키로 캐시된 프로필 (캐시 미스면 JOIN 쿼리 한 번, users.loaders 참고)
+        data = user_profile(pk)
+        if data is None:
+            return Response({'error': '해당유저가 존재하지 않습니다.'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(data, status=status.HTTP_200_OK)
\ No newline at end of file